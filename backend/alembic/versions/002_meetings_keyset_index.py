@@ -0,0 +1,29 @@
+"""Composite index for keyset pagination of meetings
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+from app.db.pagination import normalize_sqlite_timestamps
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Meeting lists page newest first by (created_at, id); see app/db/pagination.py
+    op.create_index('ix_meetings_created_at_id', 'meetings', ['created_at', 'id'], unique=False)
+    # New rows are stored at second precision (app/db/models.py SQLITE_TIMESTAMP); bring older ones in line
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        normalize_sqlite_timestamps(bind)
+
+
+def downgrade():
+    op.drop_index('ix_meetings_created_at_id', table_name='meetings')
@@ -0,0 +1,48 @@
+"""Meeting segments and full-text search vectors
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('meeting_segments',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('meeting_id', sa.String(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('start_time', sa.Float(), nullable=False),
+        sa.Column('end_time', sa.Float(), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_meeting_segments_meeting_id'), 'meeting_segments', ['meeting_id'], unique=False)
+    
+    # Postgres full-text search (app/db/search.py keeps these up to date)
+    op.execute('ALTER TABLE meetings ADD COLUMN IF NOT EXISTS search_vector tsvector')
+    op.execute('ALTER TABLE meeting_segments ADD COLUMN IF NOT EXISTS search_vector tsvector')
+    op.execute(
+        "UPDATE meetings SET search_vector = "
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(summary, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(transcript, '')), 'C')"
+    )
+    op.execute('CREATE INDEX IF NOT EXISTS ix_meetings_search ON meetings USING GIN (search_vector)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_meeting_segments_search ON meeting_segments USING GIN (search_vector)')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_meetings_search')
+    op.execute('ALTER TABLE meetings DROP COLUMN IF EXISTS search_vector')
+    op.drop_index(op.f('ix_meeting_segments_meeting_id'), table_name='meeting_segments')
+    op.drop_table('meeting_segments')
@@ -0,0 +1,36 @@
+"""Packed per-meeting segment and word timelines
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('meeting_timelines',
+        sa.Column('meeting_id', sa.String(), nullable=False),
+        sa.Column('segment_count', sa.Integer(), nullable=False),
+        sa.Column('word_count', sa.Integer(), nullable=False),
+        sa.Column('segment_starts', sa.LargeBinary(), nullable=False),
+        sa.Column('segment_ends', sa.LargeBinary(), nullable=False),
+        sa.Column('segment_word_counts', sa.LargeBinary(), nullable=False),
+        sa.Column('word_starts', sa.LargeBinary(), nullable=False),
+        sa.Column('word_ends', sa.LargeBinary(), nullable=False),
+        sa.Column('word_probabilities', sa.LargeBinary(), nullable=False),
+        sa.Column('text', sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.PrimaryKeyConstraint('meeting_id')
+    )
+
+
+def downgrade():
+    op.drop_table('meeting_timelines')
@@ -0,0 +1,79 @@
+"""Compressed transcript and timeline text storage, plus an uncompressed transcript preview
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.db.types import compress, decompress, is_compressed
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+# Rows rewritten per round trip
+BATCH_SIZE = 200
+
+
+def _rewrite(table, key, column, convert, type_=sa.LargeBinary, target=None):
+    """
+    Replace `column` (or set `target`, a Text column) with convert(stored
+    value) for every row, one key-ordered batch at a time
+    """
+    bind = op.get_bind()
+    columns = [sa.column(key, sa.String), sa.column(column, type_)]
+    if target:
+        columns.append(sa.column(target, sa.Text))
+    t = sa.table(table, *columns)
+    update = sa.update(t).where(t.c[key] == sa.bindparam('row_key')).values(
+        {target or column: sa.bindparam('row_value')}
+    )
+    last = None
+    while True:
+        query = sa.select(t.c[key], t.c[column]).order_by(t.c[key]).limit(BATCH_SIZE)
+        if last is not None:
+            query = query.where(t.c[key] > last)
+        rows = bind.execute(query).all()
+        if not rows:
+            break
+        changed = [{'row_key': k, 'row_value': convert(v)} for k, v in rows if v is not None]
+        changed = [c for c in changed if c['row_value'] is not None]
+        if changed:
+            bind.execute(update, changed)
+        last = rows[-1][0]
+
+
+def _compressed(value):
+    # None = already compressed, leave the row alone
+    return None if is_compressed(value) else compress(decompress(value))
+
+
+def _preview(value):
+    return decompress(value).decode('utf-8')[:settings.MEETING_PREVIEW_CHARS]
+
+
+def upgrade():
+    op.add_column('meetings', sa.Column('transcript_preview', sa.Text(), nullable=True))
+    _rewrite('meetings', 'id', 'transcript', _preview, target='transcript_preview')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("ALTER TABLE meetings ALTER COLUMN transcript TYPE bytea USING convert_to(transcript, 'UTF8')")
+    # SQLite columns take blobs as they are; rows not yet rewritten are still read as plain text
+    _rewrite('meetings', 'id', 'transcript', _compressed)
+    _rewrite('meeting_timelines', 'meeting_id', 'text', _compressed)
+
+
+def downgrade():
+    _rewrite('meeting_timelines', 'meeting_id', 'text', decompress)
+    if op.get_bind().dialect.name == 'postgresql':
+        _rewrite('meetings', 'id', 'transcript', decompress)
+        op.execute("ALTER TABLE meetings ALTER COLUMN transcript TYPE text USING convert_from(transcript, 'UTF8')")
+    else:
+        _rewrite('meetings', 'id', 'transcript', lambda v: decompress(v).decode('utf-8'), sa.Text)
+    with op.batch_alter_table('meetings') as batch_op:
+        batch_op.drop_column('transcript_preview')
@@ -0,0 +1,24 @@
+"""Composite index for time-range reads of meeting segments
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Segments of one meeting by position in the recording; see app/db/segment_index.py
+    op.create_index('ix_meeting_segments_meeting_id_start_time', 'meeting_segments',
+                    ['meeting_id', 'start_time'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_meeting_segments_meeting_id_start_time', table_name='meeting_segments')
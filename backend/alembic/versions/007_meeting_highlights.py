@@ -0,0 +1,38 @@
+"""Highlights of string-keyed meetings
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 001's `highlights` references the old integer meeting ids; this table replaces it
+    op.create_table('meeting_highlights',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('meeting_id', sa.String(), nullable=False),
+        sa.Column('title', sa.String(length=500), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('start_time', sa.Float(), nullable=False),
+        sa.Column('end_time', sa.Float(), nullable=False),
+        sa.Column('transcript_text', sa.Text(), nullable=True),
+        sa.Column('tags', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+        sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_meeting_highlights_meeting_id'), 'meeting_highlights', ['meeting_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_meeting_highlights_meeting_id'), table_name='meeting_highlights')
+    op.drop_table('meeting_highlights')
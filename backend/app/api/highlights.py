@@ -0,0 +1,169 @@
+"""
+Meeting highlight routes
+A highlight is a time range of a meeting's recording; its transcript text is
+taken from the segments overlapping that range when it is created.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+import logging
+
+from app.api.transcription import pending_meeting
+from app.db.database import get_async_db
+from app.db.models import Meeting, MeetingHighlight
+from app.db.segment_index import SegmentIntervalIndex, segment_index
+from app.services.ai_service import ai_service
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Highlights accepted by one bulk creation request
+MAX_BULK_HIGHLIGHTS = 100
+
+
+class HighlightCreate(BaseModel):
+    title: str
+    start_time: float
+    end_time: float
+    description: Optional[str] = None
+    tags: Optional[List[str]] = None
+
+
+class HighlightBulkCreate(BaseModel):
+    highlights: List[HighlightCreate]
+
+
+class HighlightResponse(BaseModel):
+    id: int
+    meeting_id: str
+    title: str
+    description: Optional[str]
+    start_time: float
+    end_time: float
+    transcript_text: Optional[str]
+    tags: Optional[list]
+    created_at: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+def _highlight_text(index: Optional[SegmentIntervalIndex], start_time: float, end_time: float) -> str:
+    """Text of the segments overlapping a highlight, in order ("" for meetings without segments)"""
+    if index is None:
+        return ""
+    return " ".join(s["text"] for s in index.overlapping(start_time, end_time))
+
+
+async def _require_meeting(db: AsyncSession, meeting_id: str):
+    """404 for unknown meetings; 409 while the meeting is still in the write-behind journal"""
+    if (await db.execute(select(Meeting.id).where(Meeting.id == meeting_id))).first() is not None:
+        return
+    if await pending_meeting(meeting_id):
+        raise HTTPException(status_code=409, detail="Meeting is still being saved, try again shortly")
+    raise HTTPException(status_code=404, detail="Meeting not found")
+
+
+def _check_range(highlight: HighlightCreate):
+    if highlight.start_time < 0 or highlight.end_time < highlight.start_time:
+        raise HTTPException(status_code=400, detail="Highlight needs 0 <= start_time <= end_time")
+
+
+@router.post("/{meeting_id}/highlights", response_model=HighlightResponse, status_code=201)
+async def create_highlight(meeting_id: str, highlight_data: HighlightCreate,
+                           db: AsyncSession = Depends(get_async_db)):
+    """Create a highlight/clip for a meeting"""
+    _check_range(highlight_data)
+    await _require_meeting(db, meeting_id)
+
+    # Transcript of every segment overlapping the highlight, including ones cut by its edges
+    transcript_text = _highlight_text(
+        await segment_index(db, meeting_id), highlight_data.start_time, highlight_data.end_time
+    )
+
+    new_highlight = MeetingHighlight(
+        meeting_id=meeting_id,
+        title=highlight_data.title,
+        description=highlight_data.description,
+        start_time=highlight_data.start_time,
+        end_time=highlight_data.end_time,
+        transcript_text=transcript_text,
+        tags=highlight_data.tags
+    )
+    db.add(new_highlight)
+    await db.commit()
+    await db.refresh(new_highlight)
+
+    logger.info(f"Created highlight {new_highlight.id} for meeting {meeting_id}")
+    return new_highlight
+
+
+@router.post("/{meeting_id}/highlights/bulk", response_model=List[HighlightResponse], status_code=201)
+async def create_highlights_bulk(meeting_id: str, bulk_data: HighlightBulkCreate,
+                                 db: AsyncSession = Depends(get_async_db)):
+    """
+    Create many highlights for a meeting at once
+
+    Highlights without a description get an AI one; those are generated in
+    batched LLM calls and all highlights are saved in one transaction.
+    """
+    highlights = bulk_data.highlights
+    if len(highlights) > MAX_BULK_HIGHLIGHTS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_HIGHLIGHTS} highlights per request")
+    for h in highlights:
+        _check_range(h)
+    await _require_meeting(db, meeting_id)
+    if not highlights:
+        return []
+
+    # One interval index lookup per highlight, against segments loaded (or cached) once
+    index = await segment_index(db, meeting_id)
+    transcript_texts = [_highlight_text(index, h.start_time, h.end_time) for h in highlights]
+
+    to_describe = [i for i, h in enumerate(highlights) if not h.description and transcript_texts[i]]
+    generated = dict(zip(
+        to_describe,
+        await ai_service.generate_highlight_descriptions([transcript_texts[i] for i in to_describe])
+    ))
+
+    new_highlights = [
+        MeetingHighlight(
+            meeting_id=meeting_id,
+            title=h.title,
+            description=h.description or generated.get(i),
+            start_time=h.start_time,
+            end_time=h.end_time,
+            transcript_text=transcript_texts[i],
+            tags=h.tags
+        )
+        for i, h in enumerate(highlights)
+    ]
+
+    try:
+        db.add_all(new_highlights)
+        await db.flush()
+        highlight_ids = [h.id for h in new_highlights]
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"💥 Bulk highlight creation failed for meeting {meeting_id}: {e}")
+        raise HTTPException(status_code=500, detail="Could not save highlights")
+
+    logger.info(f"Created {len(highlight_ids)} highlights for meeting {meeting_id}")
+    # Reload in one query rather than refreshing each expired instance
+    return (await db.execute(select(MeetingHighlight).where(
+        MeetingHighlight.id.in_(highlight_ids)
+    ).order_by(MeetingHighlight.id))).scalars().all()
+
+
+@router.get("/{meeting_id}/highlights", response_model=List[HighlightResponse])
+async def get_highlights(meeting_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get a meeting's highlights in recording order"""
+    await _require_meeting(db, meeting_id)
+    return (await db.execute(select(MeetingHighlight).where(
+        MeetingHighlight.meeting_id == meeting_id
+    ).order_by(MeetingHighlight.start_time, MeetingHighlight.id))).scalars().all()
@@ -1,28 +1,35 @@
 """
 Meetings API routes
+
+Not mounted by app.main: these routes use User and Transcript models that
+app.db.models does not define yet, so this module fails to import. The
+public meeting reads (list, search, detail, timeline, transcript ranges) are
+served from app.main instead, and highlights from app.api.highlights.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 import os
 import logging
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db import models
+from app.db.pagination import InvalidCursorError, keyset_page_async
+from app.db.segment_store import store_segments
 from app.core.security import get_current_user
 from app.services.whisper_service import WhisperService
-from app.services.ai_service import AIService
+from app.services.model_pool import PoolSaturatedError
+from app.services.ai_service import ai_service
 from app.core.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 whisper_service = WhisperService()
-ai_service = AIService()
-
 
 # Test endpoint without authentication for debugging
 @router.get("/test")
@@ -66,32 +73,16 @@ class MeetingResponse(BaseModel):
         from_attributes = True
 
 
-class HighlightCreate(BaseModel):
-    title: str
-    start_time: float
-    end_time: float
-    description: Optional[str] = None
-
-
-class HighlightResponse(BaseModel):
-    id: int
-    meeting_id: int
-    title: str
-    description: Optional[str]
-    start_time: float
-    end_time: float
-    transcript_text: Optional[str]
-    tags: Optional[list]
-    
-    class Config:
-        from_attributes = True
+class MeetingPage(BaseModel):
+    meetings: List[MeetingResponse]
+    next_cursor: Optional[str] = None
 
 
 @router.post("/", response_model=MeetingResponse)
 async def create_meeting(
     meeting_data: MeetingCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new meeting"""
     
@@ -104,36 +95,40 @@ async def create_meeting(
     )
     
     db.add(new_meeting)
-    db.commit()
-    db.refresh(new_meeting)
+    await db.commit()
+    await db.refresh(new_meeting)
     
     logger.info(f"Created meeting {new_meeting.id} for user {current_user.id}")
     return new_meeting
 
 
-@router.get("/", response_model=List[MeetingResponse])
+@router.get("/", response_model=MeetingPage)
 async def get_meetings(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100
+    db: AsyncSession = Depends(get_async_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=settings.MEETING_LIST_MAX_LIMIT)
 ):
-    """Get all meetings for current user"""
+    """Get the current user's meetings, newest first; pass next_cursor back as cursor for the next page"""
     
-    meetings = db.query(models.Meeting).filter(
-        models.Meeting.user_id == current_user.id
-    ).order_by(models.Meeting.started_at.desc()).offset(skip).limit(limit).all()
+    stmt = select(models.Meeting).where(models.Meeting.user_id == current_user.id)
+    try:
+        meetings, next_cursor = await keyset_page_async(
+            db, stmt, models.Meeting.created_at, models.Meeting.id, cursor, limit, scalars=True
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    return meetings
+    return {"meetings": meetings, "next_cursor": next_cursor}
 
 
 @router.get("/public")
-async def get_public_meetings(db: Session = Depends(get_db)):
+async def get_public_meetings(db: AsyncSession = Depends(get_async_db)):
     """Get all meetings without authentication (for testing)"""
     
-    meetings = db.query(models.Meeting).order_by(
+    meetings = (await db.execute(select(models.Meeting).order_by(
         models.Meeting.started_at.desc()
-    ).limit(10).all()
+    ).limit(10))).scalars().all()
     
     return [
         {
@@ -147,18 +142,24 @@ async def get_public_meetings(db: Session = Depends(get_db)):
     ]
 
 
+@router.get("/ai-stats")
+async def ai_stats(current_user: models.User = Depends(get_current_user)):
+    """Summary cache hit rates and LLM call deduplication"""
+    return ai_service.get_stats()
+
+
 @router.get("/{meeting_id}", response_model=MeetingResponse)
 async def get_meeting(
     meeting_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific meeting"""
     
-    meeting = db.query(models.Meeting).filter(
+    meeting = (await db.execute(select(models.Meeting).where(
         models.Meeting.id == meeting_id,
         models.Meeting.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not meeting:
         raise HTTPException(
@@ -174,15 +175,15 @@ async def upload_audio(
     meeting_id: int,
     audio: UploadFile = File(...),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Upload audio file for a meeting and process transcription"""
     
     # Get meeting
-    meeting = db.query(models.Meeting).filter(
+    meeting = (await db.execute(select(models.Meeting).where(
         models.Meeting.id == meeting_id,
         models.Meeting.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not meeting:
         raise HTTPException(
@@ -199,29 +200,22 @@ async def upload_audio(
             content = await audio.read()
             f.write(content)
         
+        previous_status = meeting.status
         meeting.audio_file_path = audio_path
         meeting.status = "processing"
-        db.commit()
+        await db.commit()
         
         logger.info(f"Audio uploaded for meeting {meeting_id}, starting transcription")
         
         # Transcribe audio
         transcription_result = await whisper_service.transcribe_file(audio_path)
         
-        # Save transcript segments
-        for segment in transcription_result["segments"]:
-            transcript = models.Transcript(
-                meeting_id=meeting_id,
-                text=segment["text"],
-                start_time=segment["start"],
-                end_time=segment["end"],
-                confidence=segment.get("confidence", 0.0)
-            )
-            db.add(transcript)
+        # Save transcript segments in one bulk insert, word timestamps in the packed timeline
+        await db.run_sync(store_segments, meeting.id, transcription_result["segments"])
         
         # Generate AI summary
         full_transcript = transcription_result["text"]
-        ai_summary = await ai_service.summarize_transcript(full_transcript)
+        ai_summary = await ai_service.summarize_transcript(full_transcript, transcription_result["segments"])
         
         # Update meeting
         meeting.status = "completed"
@@ -231,7 +225,7 @@ async def upload_audio(
         meeting.action_items = ai_summary.get("action_items", [])
         meeting.ended_at = datetime.utcnow()
         
-        db.commit()
+        await db.commit()
         
         logger.info(f"Meeting {meeting_id} processed successfully")
         
@@ -241,10 +235,20 @@ async def upload_audio(
             "summary": ai_summary
         }
         
+    except PoolSaturatedError as e:
+        # Rejected before any work started; the audio is saved and can be reprocessed
+        meeting.status = previous_status
+        await db.commit()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"Error processing audio for meeting {meeting_id}: {str(e)}")
+        await db.rollback()
         meeting.status = "failed"
-        db.commit()
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to process audio: {str(e)}"
@@ -255,14 +259,14 @@ async def upload_audio(
 async def stop_meeting(
     meeting_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Stop a meeting recording"""
     
-    meeting = db.query(models.Meeting).filter(
+    meeting = (await db.execute(select(models.Meeting).where(
         models.Meeting.id == meeting_id,
         models.Meeting.user_id == current_user.id
-    ).first()
+    ))).scalar_one_or_none()
     
     if not meeting:
         raise HTTPException(
@@ -272,79 +276,6 @@ async def stop_meeting(
     
     meeting.status = "completed"
     meeting.ended_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {"message": "Meeting stopped successfully"}
-
-
-@router.post("/{meeting_id}/highlights", response_model=HighlightResponse)
-async def create_highlight(
-    meeting_id: int,
-    highlight_data: HighlightCreate,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Create a highlight/clip for a meeting"""
-    
-    meeting = db.query(models.Meeting).filter(
-        models.Meeting.id == meeting_id,
-        models.Meeting.user_id == current_user.id
-    ).first()
-    
-    if not meeting:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Meeting not found"
-        )
-    
-    # Get transcript for the highlight time range
-    transcripts = db.query(models.Transcript).filter(
-        models.Transcript.meeting_id == meeting_id,
-        models.Transcript.start_time >= highlight_data.start_time,
-        models.Transcript.end_time <= highlight_data.end_time
-    ).all()
-    
-    transcript_text = " ".join([t.text for t in transcripts])
-    
-    # Create highlight
-    new_highlight = models.Highlight(
-        meeting_id=meeting_id,
-        title=highlight_data.title,
-        description=highlight_data.description,
-        start_time=highlight_data.start_time,
-        end_time=highlight_data.end_time,
-        transcript_text=transcript_text
-    )
-    
-    db.add(new_highlight)
-    db.commit()
-    db.refresh(new_highlight)
-    
-    logger.info(f"Created highlight {new_highlight.id} for meeting {meeting_id}")
-    return new_highlight
-
-
-@router.get("/{meeting_id}/highlights", response_model=List[HighlightResponse])
-async def get_highlights(
-    meeting_id: int,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get all highlights for a meeting"""
-    
-    meeting = db.query(models.Meeting).filter(
-        models.Meeting.id == meeting_id,
-        models.Meeting.user_id == current_user.id
-    ).first()
-    
-    if not meeting:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Meeting not found"
-        )
-    
-    highlights = db.query(models.Highlight).filter(
-        models.Highlight.meeting_id == meeting_id
-    ).all()
-    
-    return highlights
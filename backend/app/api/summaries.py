@@ -0,0 +1,132 @@
+"""
+AI summary routes
+Summaries are streamed as server-sent events, so clients see text from the
+first token instead of waiting for the whole completion.
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Any, Dict, Optional
+import asyncio
+import json
+import logging
+
+from app.api.transcription import pending_meeting
+from app.db.database import AsyncSessionLocal
+from app.db.models import Meeting
+from app.db.search import search_index
+from app.services.ai_service import ai_service
+from app.services import write_behind
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Comment lines sent while the map phase runs, so proxies don't drop an idle stream
+KEEPALIVE_INTERVAL_S = 15
+
+# Summaries still being generated after their client disconnected
+_summary_tasks = set()
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def _save_summary(meeting_id: str, result: Dict[str, Any]):
+    async with AsyncSessionLocal() as db:
+        try:
+            meeting = await db.get(Meeting, meeting_id)
+            if meeting is None:
+                # Not flushed yet: put the summary on the journaled record instead
+                fields = {k: result.get(k) for k in ("summary", "key_points", "action_items")}
+                journal_queue = write_behind.meeting_write_behind
+                if journal_queue and await journal_queue.update(meeting_id, fields):
+                    logger.info(f"✅ Stored AI summary for journaled meeting {meeting_id}")
+                    return
+                # Flushed in the meantime
+                meeting = await db.get(Meeting, meeting_id)
+                if meeting is None:
+                    return
+            meeting.summary = result.get("summary")
+            meeting.key_points = result.get("key_points", [])
+            meeting.action_items = result.get("action_items", [])
+            try:
+                async with db.begin_nested():
+                    await db.run_sync(search_index.index_meeting, meeting)
+            except Exception as e:
+                logger.warning(f"⚠️ Search reindex failed for meeting {meeting_id}: {e}")
+            await db.commit()
+            logger.info(f"✅ Stored AI summary for meeting {meeting_id}")
+        except Exception as e:
+            logger.error(f"💥 Database error storing summary for {meeting_id}: {e}")
+            await db.rollback()
+
+
+async def _produce(meeting_id: str, transcript: str, queue: asyncio.Queue, budget_s: Optional[float] = None):
+    """Run the summary to completion and persist it, whether or not anyone is still listening"""
+    try:
+        async for event in ai_service.stream_summary(transcript, latency_budget_s=budget_s):
+            if event["type"] == "done":
+                await _save_summary(meeting_id, event["result"])
+            await queue.put(event)
+    except Exception as e:
+        logger.error(f"Summary stream for {meeting_id} failed: {e}")
+        await queue.put({"type": "error", "message": "Could not generate AI summary"})
+    finally:
+        await queue.put(None)
+
+
+async def _events(queue: asyncio.Queue):
+    while True:
+        try:
+            event: Optional[Dict[str, Any]] = await asyncio.wait_for(queue.get(), KEEPALIVE_INTERVAL_S)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        if event is None:
+            return
+        yield _sse(event)
+
+
+@router.get("/stats")
+async def summary_stats():
+    """Summary cache hit rates plus per-backend capabilities, throughput estimates and LLM client metrics"""
+    return ai_service.get_stats()
+
+
+@router.get("/{meeting_id}/stream")
+async def stream_summary(meeting_id: str, budget_s: Optional[float] = None):
+    """
+    Generate a meeting's AI summary as a server-sent-event stream
+
+    Events: `draft` (instant extractive summary), `token` (raw model output),
+    `summary` (summary text delta), `key_point` / `action_item` (each item once
+    complete), `progress` (window summaries done, long transcripts only), then
+    `done` with the full result (already saved on the meeting) or `error`. A
+    summary already cached for this transcript is returned as an immediate
+    `done`; if the LLM is unavailable, `done` carries the extractive draft.
+    `budget_s` (seconds) picks the backend expected to finish in time
+    (default SUMMARY_LATENCY_BUDGET_S).
+    """
+    async with AsyncSessionLocal() as db:
+        meeting = await db.get(Meeting, meeting_id)
+        transcript = meeting.transcript if meeting else None
+    if meeting is None:
+        meeting = await pending_meeting(meeting_id)
+        transcript = meeting["transcript"] if meeting else None
+
+    if meeting is None:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    if not transcript:
+        raise HTTPException(status_code=409, detail="Meeting has no transcript yet")
+
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_produce(meeting_id, transcript, queue, budget_s))
+    _summary_tasks.add(task)
+    task.add_done_callback(_summary_tasks.discard)
+
+    return StreamingResponse(
+        _events(queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,15 +2,27 @@
 Transcription API routes with Supabase integration
 """
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
+import asyncio
+import hashlib
 import logging
+import os
 import uuid
 import base64
+import binascii
+import tempfile
+import time
 from datetime import datetime
 
 from app.core.config import settings
+from app.db.segment_index import segment_index_cache
+from app.services.cache import TieredCache, content_key
+from app.services.extractive_summary import extractive_summarizer
+from app.services.job_queue import job_queue, QueueFullError, JOB_DONE
+from app.services.model_pool import PoolSaturatedError
+from app.services import write_behind
 
 # Determine which whisper backend to use
 USE_PRODUCTION_WHISPER = settings.ENVIRONMENT.lower() == "production"
@@ -30,6 +42,23 @@ else:
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Size of each read when spooling binary uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Multipart framing and form fields allowed on top of MAX_AUDIO_SIZE
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+# Uploads waiting for a background job are kept here until the job finishes
+JOB_AUDIO_DIR = os.path.join(settings.UPLOAD_DIR, "jobs")
+
+# Content-addressed transcription results, so retried uploads skip inference
+transcription_cache = TieredCache(
+    "transcriptions",
+    memory_max_bytes=settings.TRANSCRIPTION_CACHE_MEMORY_MB * 1024 * 1024,
+    disk_path=settings.TRANSCRIPTION_CACHE_PATH or None,
+    disk_max_bytes=settings.TRANSCRIPTION_CACHE_DISK_MB * 1024 * 1024
+) if settings.TRANSCRIPTION_CACHE_ENABLED else None
+
 
 class AudioRequest(BaseModel):
     audio_data: str
@@ -38,13 +67,21 @@ class AudioRequest(BaseModel):
 
 
 @router.post("/audio")
-async def transcribe_audio(request: AudioRequest, req: Request):
+async def transcribe_audio(request: AudioRequest, req: Request, response: Response):
     """Audio transcription endpoint with Supabase storage"""
     
+    audio_bytes = _decode_audio_data(request.audio_data)
     try:
         logger.info(f"Received audio transcription request: {request.format}")
         logger.info(f"Audio data size: {len(request.audio_data)} characters")
         
+        cache_key = _cache_key(hashlib.sha256(audio_bytes).hexdigest())
+        cached = _cached_transcription(cache_key)
+        cached_meeting = await _cached_meeting(cached)
+        if cached_meeting:
+            response.headers["X-Transcription-Cache"] = "hit"
+            return cached_meeting
+        
         # Generate meeting ID
         meeting_id = str(uuid.uuid4())
         
@@ -54,9 +91,14 @@ async def transcribe_audio(request: AudioRequest, req: Request):
         transcript = ""
         summary = ""
         confidence = 0.0
+        segments = None
         
-        if USE_PRODUCTION_WHISPER:
-            audio_bytes = base64.b64decode(request.audio_data)
+        if cached:
+            transcript, summary = cached["transcript"], cached["summary"]
+            confidence, estimated_duration = cached["confidence"], cached["duration"]
+            segments = cached.get("segments")
+            logger.info(f"♻️ Reusing cached transcription for {meeting_id}")
+        elif USE_PRODUCTION_WHISPER:
             whisper_result = await production_whisper.transcribe_audio(audio_bytes)
             if whisper_result.get("error"):
                 logger.warning(f"⚠️ Production Whisper reported error, using mock: {whisper_result}")
@@ -65,8 +107,14 @@ async def transcribe_audio(request: AudioRequest, req: Request):
                 transcript = whisper_result.get("text", "")
                 confidence = whisper_result.get("confidence", 0.85)
                 estimated_duration = int(whisper_result.get("audio_duration", estimated_duration))
-                summary = f"Whisper production transcription for {estimated_duration}s recording"
+                segments = whisper_result.get("segments")
+                summary = await _draft_summary(
+                    transcript, segments,
+                    f"Whisper production transcription for {estimated_duration}s recording"
+                )
                 logger.info(f"✅ Production Whisper transcribed {estimated_duration}s audio")
+                if not whisper_result.get("mock"):
+                    _remember_transcription(cache_key, transcript, summary, confidence, estimated_duration, segments)
         elif WHISPER_AVAILABLE and lightweight_whisper:
             try:
                 # Initialize Whisper if not already done
@@ -78,9 +126,13 @@ async def transcribe_audio(request: AudioRequest, req: Request):
                 transcript = whisper_result["transcript"]
                 confidence = whisper_result["confidence"]
                 estimated_duration = whisper_result["duration"]
-                summary = f"Whisper AI transcription for {estimated_duration}s recording"
+                summary = await _draft_summary(
+                    transcript, placeholder=f"Whisper AI transcription for {estimated_duration}s recording"
+                )
                 
                 logger.info(f"✅ Used Whisper for transcription: {len(transcript)} chars")
+                if lightweight_whisper.is_ready():
+                    _remember_transcription(cache_key, transcript, summary, confidence, estimated_duration)
                 
             except Exception as e:
                 logger.warning(f"⚠️ Whisper failed, using mock: {e}")
@@ -90,57 +142,706 @@ async def transcribe_audio(request: AudioRequest, req: Request):
             # Use mock transcription
             transcript, summary, confidence = _generate_mock_transcript(estimated_duration)
         
-        # Store in Database
-        from app.db.database import SessionLocal
-        from app.db.models import Meeting
-        
-        # Create meeting object
-        meeting_obj = Meeting(
-            id=meeting_id,
+        result = await _store_meeting(
+            meeting_id=meeting_id,
             title=request.title,
             transcript=transcript,
             summary=summary,
             duration=estimated_duration,
-            language="en",
-            confidence=float(confidence),  # Convert numpy float to Python float
+            confidence=confidence,
             audio_format=request.format,
-            created_at=datetime.now()
+            segments=segments
         )
-        
-        db = SessionLocal()
-        try:
-            logger.info(f"🔄 Attempting to store meeting {meeting_id} in Database...")
-            db.add(meeting_obj)
-            db.commit()
-            db.refresh(meeting_obj)
-            logger.info(f"✅ Meeting {meeting_id} stored in Database successfully")
-        except Exception as db_error:
-            logger.error(f"💥 Database error storing meeting {meeting_id}: {db_error}")
-            db.rollback()
-        finally:
-            db.close()
-        
-        # Return as dict for JSON serialization
-        result = {
-            "id": meeting_obj.id,
-            "title": meeting_obj.title,
-            "transcript": meeting_obj.transcript,
-            "summary": meeting_obj.summary,
-            "duration": meeting_obj.duration,
-            "language": meeting_obj.language,
-            "confidence": meeting_obj.confidence,
-            "audio_format": meeting_obj.audio_format,
-            "created_at": meeting_obj.created_at.isoformat()
-        }
+        _link_cached_meeting(cache_key, meeting_id)
         
         logger.info(f"Audio transcription completed successfully for {meeting_id}")
         return result
         
+    except PoolSaturatedError as e:
+        raise _busy_error(e)
     except Exception as e:
         logger.error(f"Audio transcription error: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/audio/upload")
+async def transcribe_audio_upload(
+    req: Request,
+    response: Response,
+    title: Optional[str] = "Meeting Recording",
+    format: Optional[str] = "webm"
+):
+    """
+    Binary audio transcription endpoint
+    
+    Accepts either a raw `application/octet-stream` body or a `multipart/form-data`
+    upload with an `audio_file` (or `audio`) part. The body is streamed to a temp
+    file in fixed-size chunks, so memory use does not grow with recording length.
+    """
+    
+    audio_path = None
+    try:
+        content_type = req.headers.get("content-type", "")
+        if content_type.startswith("multipart/form-data"):
+            audio_path, audio_size, digest, title, format = await _spool_multipart(req, title, format)
+        else:
+            audio_path, audio_size, digest = await _spool_stream(req, format)
+        
+        if audio_size == 0:
+            raise HTTPException(status_code=400, detail="Empty audio upload")
+        
+        logger.info(f"Received binary audio upload: {format}, {audio_size} bytes")
+        
+        cache_key = _cache_key(digest)
+        cached = _cached_transcription(cache_key)
+        cached_meeting = await _cached_meeting(cached)
+        if cached_meeting:
+            response.headers["X-Transcription-Cache"] = "hit"
+            return cached_meeting
+        
+        meeting_id = str(uuid.uuid4())
+        
+        # Same rough estimate as the JSON endpoint, which measures base64 characters
+        estimated_duration = max(5, min(300, (audio_size * 4 // 3) // 1000))
+        
+        transcript, summary, confidence, estimated_duration, segments = await _transcribe_spooled(
+            audio_path, estimated_duration, cache_key=cache_key, cached=cached
+        )
+        
+        result = await _store_meeting(
+            meeting_id=meeting_id,
+            title=title,
+            transcript=transcript,
+            summary=summary,
+            duration=estimated_duration,
+            confidence=confidence,
+            audio_format=format,
+            segments=segments
+        )
+        _link_cached_meeting(cache_key, meeting_id)
+        
+        logger.info(f"Binary audio transcription completed successfully for {meeting_id}")
+        return result
+        
+    except HTTPException:
+        raise
+    except PoolSaturatedError as e:
+        raise _busy_error(e)
+    except Exception as e:
+        logger.error(f"Binary audio transcription error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if audio_path and os.path.exists(audio_path):
+            try:
+                os.unlink(audio_path)
+            except Exception:
+                pass
+
+
+@router.post("/jobs", status_code=202)
+async def submit_transcription_job(
+    req: Request,
+    title: Optional[str] = "Meeting Recording",
+    format: Optional[str] = "webm"
+):
+    """
+    Queue audio for background transcription and return a job id immediately
+    
+    Accepts the same bodies as `/audio` (JSON with base64 `audio_data`) and
+    `/audio/upload` (raw or multipart). Poll `/jobs/{job_id}` for status.
+    """
+    
+    content_type = req.headers.get("content-type", "")
+    if content_type.startswith("application/json"):
+        try:
+            request = AudioRequest(**await req.json())
+        except (ValueError, TypeError) as e:
+            # Malformed JSON, a non-object body or missing/invalid fields (ValidationError is a ValueError)
+            raise HTTPException(status_code=400, detail=f"Invalid JSON audio request: {e}")
+        audio_bytes = _decode_audio_data(request.audio_data)
+        title, format = request.title, request.format
+        with _new_spool_file(format or "webm", JOB_AUDIO_DIR) as spool:
+            spool.write(audio_bytes)
+        audio_path, audio_size = spool.name, len(audio_bytes)
+        digest = hashlib.sha256(audio_bytes).hexdigest()
+    elif content_type.startswith("multipart/form-data"):
+        audio_path, audio_size, digest, title, format = await _spool_multipart(req, title, format, JOB_AUDIO_DIR)
+    else:
+        audio_path, audio_size, digest = await _spool_stream(req, format, JOB_AUDIO_DIR)
+    
+    if audio_size == 0:
+        os.unlink(audio_path)
+        raise HTTPException(status_code=400, detail="Empty audio upload")
+    
+    try:
+        return await enqueue_transcription(audio_path, audio_size, digest, title, format)
+    except QueueFullError as e:
+        os.unlink(audio_path)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+
+async def enqueue_transcription(audio_path: str, audio_size: int, digest: str,
+                                title: Optional[str], format: Optional[str]) -> dict:
+    """
+    Submit a spooled file (under JOB_AUDIO_DIR) as a background transcription job
+    
+    Returns:
+        The job submission response (job_id, meeting_id, status, status_url)
+    
+    Raises:
+        QueueFullError: If JOB_QUEUE_MAX_PENDING jobs are already waiting
+    """
+    meeting_id = str(uuid.uuid4())
+    job = await job_queue.submit({
+        "meeting_id": meeting_id,
+        "audio_path": audio_path,
+        "title": title,
+        "format": format,
+        "estimated_duration": max(5, min(300, (audio_size * 4 // 3) // 1000)),
+        "cache_key": _cache_key(digest)
+    })
+    
+    logger.info(f"Queued transcription job {job['id']} for meeting {meeting_id} ({audio_size} bytes)")
+    return {
+        "job_id": job["id"],
+        "meeting_id": meeting_id,
+        "status": job["status"],
+        "status_url": f"{settings.API_V1_STR}/transcription/jobs/{job['id']}"
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_transcription_job(job_id: str):
+    """Report job status (queued/running/done/failed) and progress"""
+    
+    job = await job_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    response = {
+        "job_id": job["id"],
+        "meeting_id": job["payload"]["meeting_id"],
+        "status": job["status"],
+        "progress": job["progress"],
+        "error": job["error"],
+        "created_at": datetime.fromtimestamp(job["created_at"]).isoformat(),
+        "updated_at": datetime.fromtimestamp(job["updated_at"]).isoformat()
+    }
+    
+    if job["status"] == JOB_DONE:
+        from app.db.database import AsyncSessionLocal
+        from app.db.models import Meeting
+        
+        async with AsyncSessionLocal() as db:
+            meeting = await db.get(Meeting, response["meeting_id"])
+        record = None if meeting else await pending_meeting(response["meeting_id"])
+        if meeting or record:
+            response["meeting"] = _meeting_to_dict(meeting or meeting_from_record(record))
+    
+    return response
+
+
+async def process_transcription_job(job: dict, report_progress) -> dict:
+    """Job queue handler: transcribe a spooled upload and store it in its Meeting row"""
+    payload = job["payload"]
+    audio_path = payload["audio_path"]
+    if not os.path.exists(audio_path):
+        raise RuntimeError(f"Audio for job {job['id']} is missing: {audio_path}")
+    
+    try:
+        # The job queue is already bounded, so wait for a worker instead of being rejected
+        cache_key = payload.get("cache_key")
+        transcript, summary, confidence, duration, segments = await _transcribe_spooled(
+            audio_path, payload["estimated_duration"], report_progress, admit=False,
+            cache_key=cache_key, cached=_cached_transcription(cache_key)
+        )
+        
+        await _store_meeting(
+            meeting_id=payload["meeting_id"],
+            title=payload["title"],
+            transcript=transcript,
+            summary=summary,
+            duration=duration,
+            confidence=confidence,
+            audio_format=payload["format"],
+            segments=segments
+        )
+        if cache_key:
+            _link_cached_meeting(cache_key, payload["meeting_id"])
+    except asyncio.CancelledError:
+        # Shutdown: a durable job store requeues the job on restart, so its audio is still needed
+        raise
+    except Exception:
+        # The queue marks the job failed for good, nothing will read this audio again
+        _discard_job_audio(audio_path)
+        raise
+    
+    _discard_job_audio(audio_path)
+    return {"meeting_id": payload["meeting_id"], "duration": duration}
+
+
+def _discard_job_audio(audio_path: str):
+    try:
+        os.unlink(audio_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"⚠️ Could not delete job audio {audio_path}: {e}")
+
+
+async def sweep_job_audio() -> int:
+    """
+    Delete uploads in JOB_AUDIO_DIR that no queued or running job refers to
+    (left behind by a crash or by jobs that failed before cleanup existed)
+    
+    Files modified within JOB_AUDIO_ORPHAN_AGE_S are kept, since another
+    worker process may still be spooling or submitting them.
+    """
+    if not os.path.isdir(JOB_AUDIO_DIR):
+        return 0
+    active = {os.path.abspath(p["audio_path"]) for p in await job_queue.active_payloads() if p.get("audio_path")}
+    cutoff = time.time() - settings.JOB_AUDIO_ORPHAN_AGE_S
+    removed = 0
+    for entry in os.scandir(JOB_AUDIO_DIR):
+        if not entry.is_file() or os.path.abspath(entry.path) in active:
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError as e:
+            logger.warning(f"⚠️ Could not delete orphaned job audio {entry.path}: {e}")
+    if removed:
+        logger.info(f"🧹 Deleted {removed} orphaned job uploads from {JOB_AUDIO_DIR}")
+    return removed
+
+
+@router.get("/stats")
+async def transcription_stats():
+    """Whisper service statistics, including per-worker pool utilisation, cache hit rates, write-behind backlog and segment index cache"""
+    cache_stats = transcription_cache.get_stats() if transcription_cache else None
+    journal_queue = write_behind.meeting_write_behind
+    write_behind_stats = await journal_queue.get_stats() if journal_queue else None
+    stores = {"cache": cache_stats, "write_behind": write_behind_stats,
+              "segment_index": segment_index_cache.get_stats()}
+    if USE_PRODUCTION_WHISPER:
+        return {"backend": "production", **production_whisper.get_stats(), **stores}
+    if WHISPER_AVAILABLE and lightweight_whisper:
+        return {"backend": "lightweight", "model_loaded": lightweight_whisper.is_ready(), **stores}
+    return {"backend": "mock", **stores}
+
+
+async def _transcribe_spooled(audio_path: str, estimated_duration: int,
+                              progress_callback=None, admit: bool = True,
+                              cache_key: Optional[str] = None,
+                              cached: Optional[dict] = None) -> tuple[str, str, float, int, Optional[list]]:
+    """
+    Run the configured Whisper backend over a spooled upload, falling back to mock output
+    
+    `cached` is the caller's lookup for `cache_key`; when present it is returned
+    without inference. Real (non-mock) results are cached under `cache_key`.
+    
+    Returns:
+        (transcript, summary, confidence, duration, segments); segments is None
+        when the backend has no timestamps
+    """
+    if cached:
+        logger.info(f"♻️ Reusing cached transcription for {os.path.basename(audio_path)}")
+        return (cached["transcript"], cached["summary"], cached["confidence"], cached["duration"],
+                cached.get("segments"))
+    
+    if USE_PRODUCTION_WHISPER:
+        whisper_result = await production_whisper.transcribe_file(
+            audio_path, progress_callback=progress_callback, admit=admit
+        )
+        if whisper_result.get("error"):
+            logger.warning(f"⚠️ Production Whisper reported error, using mock: {whisper_result}")
+            transcript, summary, confidence = _generate_mock_transcript(estimated_duration)
+            return transcript, summary, confidence, estimated_duration, None
+        
+        duration = int(whisper_result.get("audio_duration", estimated_duration))
+        logger.info(f"✅ Production Whisper transcribed {duration}s audio")
+        transcript = whisper_result.get("text", "")
+        segments = whisper_result.get("segments")
+        result = (
+            transcript,
+            await _draft_summary(
+                transcript, segments,
+                f"Whisper production transcription for {duration}s recording"
+            ),
+            whisper_result.get("confidence", 0.85),
+            duration,
+            segments
+        )
+        if cache_key and not whisper_result.get("mock"):
+            _remember_transcription(cache_key, *result)
+        return result
+    
+    if WHISPER_AVAILABLE and lightweight_whisper:
+        try:
+            if not lightweight_whisper.is_ready():
+                await lightweight_whisper.initialize()
+            
+            whisper_result = await lightweight_whisper.transcribe_file(audio_path)
+            duration = whisper_result["duration"]
+            logger.info(f"✅ Used Whisper for transcription: {len(whisper_result['transcript'])} chars")
+            result = (
+                whisper_result["transcript"],
+                await _draft_summary(
+                    whisper_result["transcript"], placeholder=f"Whisper AI transcription for {duration}s recording"
+                ),
+                whisper_result["confidence"],
+                duration,
+                None
+            )
+            if cache_key and lightweight_whisper.is_ready():
+                _remember_transcription(cache_key, *result)
+            return result
+        except Exception as e:
+            logger.warning(f"⚠️ Whisper failed, using mock: {e}")
+    
+    transcript, summary, confidence = _generate_mock_transcript(estimated_duration)
+    return transcript, summary, confidence, estimated_duration, None
+
+
+async def _draft_summary(transcript: str, segments: Optional[list] = None, placeholder: str = "") -> str:
+    """Extractive summary of a fresh transcript, stored until an AI summary replaces it"""
+    if not transcript.strip():
+        return placeholder
+    try:
+        draft = await asyncio.to_thread(extractive_summarizer.summarize, transcript, segments)
+    except Exception as e:
+        logger.warning(f"⚠️ Extractive summary failed, storing placeholder: {e}")
+        return placeholder
+    return draft["summary"] or placeholder
+
+
+def _busy_error(error: PoolSaturatedError) -> HTTPException:
+    """Map a saturated Whisper pool to a fast 503 the client can retry"""
+    logger.warning(f"⚠️ Rejecting transcription request: {error}")
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
+def _cache_key(digest: str, language: Optional[str] = None) -> str:
+    """Result cache key: upload content hash plus every setting that changes the output"""
+    if USE_PRODUCTION_WHISPER:
+        backend = production_whisper.cache_signature()
+    elif WHISPER_AVAILABLE and lightweight_whisper:
+        backend = "openai-whisper:tiny"
+    else:
+        backend = "mock"
+    return content_key(digest, backend, language or "auto")
+
+
+def _remember_transcription(cache_key: str, transcript: str, summary: str,
+                            confidence: float, duration: int, segments: Optional[list] = None):
+    if transcription_cache:
+        transcription_cache.set(cache_key, {
+            "transcript": transcript,
+            "summary": summary,
+            "confidence": float(confidence),
+            "duration": duration,
+            # Timestamps only; word lists would multiply the entry size
+            "segments": [{"start": s["start"], "end": s["end"], "text": s["text"]} for s in segments or []],
+            "meeting_id": None
+        })
+
+
+def _cached_transcription(cache_key: Optional[str]) -> Optional[dict]:
+    if not transcription_cache or not cache_key:
+        return None
+    return transcription_cache.get(cache_key)
+
+
+def _link_cached_meeting(cache_key: str, meeting_id: str):
+    """Point a cached result at the Meeting it was stored as, so retries return that row"""
+    if transcription_cache:
+        transcription_cache.update(cache_key, meeting_id=meeting_id)
+
+
+async def _cached_meeting(cached: Optional[dict]) -> Optional[dict]:
+    """The stored Meeting for a cached result of identical audio, if it still exists"""
+    if not cached or not cached.get("meeting_id"):
+        return None
+    
+    from app.db.database import AsyncSessionLocal
+    from app.db.models import Meeting
+    
+    async with AsyncSessionLocal() as db:
+        try:
+            meeting = await db.get(Meeting, cached["meeting_id"])
+            if meeting is None:
+                record = await pending_meeting(cached["meeting_id"])
+                meeting = meeting_from_record(record) if record else None
+            if meeting:
+                logger.info(f"♻️ Duplicate upload, returning meeting {meeting.id}")
+                return _meeting_to_dict(meeting)
+        except Exception as e:
+            logger.warning(f"⚠️ Cached meeting lookup failed: {e}")
+    return None
+
+
+def _decode_audio_data(audio_data: str) -> bytes:
+    """Bytes of a base64 `audio_data` field; 400 when it isn't valid base64"""
+    try:
+        return base64.b64decode(audio_data, validate=True)
+    except binascii.Error as e:
+        raise HTTPException(status_code=400, detail=f"audio_data is not valid base64: {e}")
+
+
+def _new_spool_file(suffix: str, directory: str = settings.TEMP_DIR):
+    """Create a temp file for an incoming upload (under TEMP_DIR by default)"""
+    os.makedirs(directory, exist_ok=True)
+    return tempfile.NamedTemporaryFile(suffix=f".{suffix}", dir=directory, delete=False)
+
+
+async def _spool_stream(req: Request, format: Optional[str],
+                        directory: str = settings.TEMP_DIR) -> tuple[str, int, str]:
+    """Stream a raw request body to disk, enforcing MAX_AUDIO_SIZE; returns (path, size, sha256)"""
+    audio_size = 0
+    digest = hashlib.sha256()
+    with _new_spool_file(format or "webm", directory) as spool:
+        try:
+            async for chunk in req.stream():
+                audio_size += len(chunk)
+                if audio_size > settings.MAX_AUDIO_SIZE:
+                    raise HTTPException(status_code=413, detail="Audio upload too large")
+                spool.write(chunk)
+                digest.update(chunk)
+        except BaseException:
+            spool.close()
+            os.unlink(spool.name)
+            raise
+    return spool.name, audio_size, digest.hexdigest()
+
+
+def _limited_body(req: Request, limit: int) -> Request:
+    """The same request, with a body that fails with 413 as soon as more than `limit` bytes arrive"""
+    received = 0
+    
+    async def receive():
+        nonlocal received
+        message = await req.receive()
+        if message["type"] == "http.request":
+            received += len(message.get("body", b""))
+            if received > limit:
+                raise HTTPException(status_code=413, detail="Audio upload too large")
+        return message
+    
+    return Request(req.scope, receive)
+
+
+async def _spool_multipart(req: Request, title: Optional[str], format: Optional[str],
+                           directory: str = settings.TEMP_DIR) -> tuple[str, int, str, Optional[str], Optional[str]]:
+    """Copy the audio part of a multipart upload to disk, enforcing MAX_AUDIO_SIZE; returns (path, size, sha256, title, format)"""
+    # Starlette spools the whole body while parsing, so bound the body itself, not just the audio part
+    limit = settings.MAX_AUDIO_SIZE + MULTIPART_OVERHEAD_BYTES
+    content_length = req.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > limit:
+        raise HTTPException(status_code=413, detail="Audio upload too large")
+    form = await _limited_body(req, limit).form()
+    try:
+        upload = form.get("audio_file") or form.get("audio")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="Missing audio_file part")
+        
+        title = form.get("title") or title
+        format = form.get("format") or format
+        
+        audio_size = 0
+        digest = hashlib.sha256()
+        with _new_spool_file(format or "webm", directory) as spool:
+            try:
+                while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+                    audio_size += len(chunk)
+                    if audio_size > settings.MAX_AUDIO_SIZE:
+                        raise HTTPException(status_code=413, detail="Audio upload too large")
+                    spool.write(chunk)
+                    digest.update(chunk)
+            except BaseException:
+                spool.close()
+                os.unlink(spool.name)
+                raise
+        return spool.name, audio_size, digest.hexdigest(), title, format
+    finally:
+        await form.close()
+
+
+async def _store_meeting(
+    meeting_id: str,
+    title: Optional[str],
+    transcript: str,
+    summary: str,
+    duration: int,
+    confidence: float,
+    audio_format: Optional[str],
+    segments: Optional[list] = None
+) -> dict:
+    """
+    Persist a transcribed meeting and return it as a dict
+
+    With WRITE_BEHIND_ENABLED the meeting is only journaled locally here and
+    the write-behind flusher stores it (segments and search index included)
+    shortly after; otherwise it is written to the database before returning.
+    Either way a failure raises, so no caller reports a meeting that was not
+    kept.
+    """
+    record = _meeting_record(meeting_id, title, transcript, summary, duration,
+                             confidence, audio_format, segments)
+    journal_queue = write_behind.meeting_write_behind
+    if journal_queue:
+        await journal_queue.submit(record)
+        logger.info(f"📝 Meeting {meeting_id} journaled for write-behind ({len(segments or [])} segments)")
+    else:
+        await write_meetings([record])
+    return _meeting_to_dict(meeting_from_record(record))
+
+
+def _meeting_record(meeting_id: str, title: Optional[str], transcript: str, summary: str, duration: int,
+                    confidence: float, audio_format: Optional[str], segments: Optional[list]) -> dict:
+    """A meeting as a JSON-ready dict, the unit the write-behind journal stores"""
+    return {
+        "id": meeting_id,
+        "title": title,
+        "transcript": transcript,
+        "summary": summary,
+        "duration": int(duration),
+        "language": "en",
+        "confidence": float(confidence),  # Convert numpy float to Python float
+        "audio_format": audio_format,
+        "created_at": datetime.now().isoformat(),
+        "segments": segments
+    }
+
+
+def _transcript_preview(transcript: Optional[str]) -> Optional[str]:
+    """Head of a transcript kept uncompressed, so the meeting list never reads the full transcript"""
+    return transcript[:settings.MEETING_PREVIEW_CHARS] if transcript is not None else None
+
+
+def meeting_from_record(record: dict):
+    """An unsaved Meeting from a meeting record"""
+    from app.db.models import Meeting
+    
+    return Meeting(
+        id=record["id"],
+        title=record["title"],
+        transcript=record["transcript"],
+        transcript_preview=_transcript_preview(record["transcript"]),
+        summary=record["summary"],
+        duration=record["duration"],
+        language=record["language"],
+        confidence=record["confidence"],
+        audio_format=record["audio_format"],
+        created_at=datetime.fromisoformat(record["created_at"]),
+        key_points=record.get("key_points"),
+        action_items=record.get("action_items")
+    )
+
+
+# Meeting columns a journaled record may carry
+RECORD_FIELDS = ("title", "transcript", "summary", "duration", "language", "confidence",
+                 "audio_format", "key_points", "action_items")
+
+
+def _update_from_record(meeting_obj, record: dict):
+    """
+    Copy the fields a record actually carries onto a stored Meeting; fields
+    it lacks or has as None (e.g. key points written to the database since)
+    keep their stored values
+    """
+    for field in RECORD_FIELDS:
+        if record.get(field) is not None:
+            setattr(meeting_obj, field, record[field])
+    if record.get("transcript") is not None:
+        meeting_obj.transcript_preview = _transcript_preview(record["transcript"])
+
+
+async def write_meetings(records: List[dict]):
+    """
+    Store meeting records, their segments and search entries in one transaction
+
+    Used by the write-behind flusher for each batch. Meetings that are already
+    stored (a crash between commit and journal cleanup, or a summary added
+    while journaled) have their fields updated and keep their segments.
+    """
+    from app.db.database import AsyncSessionLocal
+    from app.db.models import Meeting
+    from app.db.segment_store import store_segments
+    from sqlalchemy import select
+    
+    ids = [record["id"] for record in records]
+    async with AsyncSessionLocal() as db:
+        try:
+            existing = {m.id: m for m in (await db.execute(select(Meeting).where(Meeting.id.in_(ids)))).scalars()}
+            meetings = []
+            for record in records:
+                meeting_obj = existing.get(record["id"])
+                if meeting_obj is not None:
+                    _update_from_record(meeting_obj, record)
+                else:
+                    meeting_obj = meeting_from_record(record)
+                    db.add(meeting_obj)
+                meetings.append(meeting_obj)
+            await db.flush()
+            
+            segment_count = 0
+            for record, meeting_obj in zip(records, meetings):
+                segment_rows = []
+                if meeting_obj.id not in existing:
+                    # One bulk insert instead of an ORM object per segment
+                    segment_rows = await db.run_sync(store_segments, meeting_obj.id, record.get("segments"))
+                    segment_count += len(segment_rows)
+                try:
+                    # A search index failure must not lose the meeting
+                    async with db.begin_nested():
+                        await db.run_sync(_index_meeting, meeting_obj, bool(segment_rows))
+                except Exception as index_error:
+                    logger.warning(f"⚠️ Search indexing failed for meeting {meeting_obj.id}: {index_error}")
+            await db.commit()
+            logger.info(f"✅ Stored {len(records)} meetings in Database ({segment_count} segments)")
+        except Exception as db_error:
+            logger.error(f"💥 Database error storing meetings {', '.join(ids)}: {db_error}")
+            await db.rollback()
+            raise
+
+
+async def pending_meeting(meeting_id: str) -> Optional[dict]:
+    """A meeting record still waiting in the write-behind journal, so reads see it before it is flushed"""
+    journal_queue = write_behind.meeting_write_behind
+    if not journal_queue:
+        return None
+    return await journal_queue.get(meeting_id)
+
+
+def _index_meeting(db, meeting_obj, with_segments: bool):
+    """Add a stored meeting (and its segments) to the search index; runs in AsyncSession.run_sync"""
+    from app.db.search import search_index
+    
+    search_index.index_meeting(db, meeting_obj)
+    if with_segments:
+        search_index.index_segments(db, meeting_obj.id)
+
+
+def _meeting_to_dict(meeting_obj) -> dict:
+    """Return a Meeting as a dict for JSON serialization"""
+    return {
+        "id": meeting_obj.id,
+        "title": meeting_obj.title,
+        "transcript": meeting_obj.transcript,
+        "summary": meeting_obj.summary,
+        "duration": meeting_obj.duration,
+        "language": meeting_obj.language,
+        "confidence": meeting_obj.confidence,
+        "audio_format": meeting_obj.audio_format,
+        "created_at": meeting_obj.created_at.isoformat()
+    }
+
+
 def _generate_mock_transcript(estimated_duration: int) -> tuple[str, str, float]:
     """Generate mock transcript based on duration"""
     if estimated_duration < 30:
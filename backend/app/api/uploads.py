@@ -0,0 +1,134 @@
+"""
+Resumable upload API routes
+Long recordings are sent as numbered chunks that can be retried individually;
+finalizing a complete upload queues it for background transcription.
+"""
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from pydantic import BaseModel
+from typing import Optional
+import logging
+import os
+
+from app.core.config import settings
+from app.api.transcription import JOB_AUDIO_DIR, enqueue_transcription
+from app.services.job_queue import QueueFullError
+from app.services.upload_sessions import UploadSessionError, UploadSessionStore, UPLOAD_FINALIZED
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+upload_sessions = UploadSessionStore(
+    os.path.join(settings.UPLOAD_DIR, "sessions"),
+    max_size=settings.UPLOAD_SESSION_MAX_SIZE,
+    max_chunk_size=settings.UPLOAD_CHUNK_MAX_SIZE,
+    ttl_seconds=settings.UPLOAD_SESSION_TTL_HOURS * 3600,
+    finalize_timeout_s=settings.UPLOAD_FINALIZE_TIMEOUT_S
+)
+
+
+class UploadSessionRequest(BaseModel):
+    total_size: int
+    chunk_size: Optional[int] = None
+    format: Optional[str] = "webm"
+    title: Optional[str] = "Meeting Recording"
+
+
+def _session_error(error: UploadSessionError) -> HTTPException:
+    return HTTPException(status_code=error.status_code, detail=str(error))
+
+
+@router.post("", status_code=201)
+async def create_upload(request: UploadSessionRequest):
+    """Start a resumable upload; the response says how to split the file into chunks"""
+    try:
+        manifest = upload_sessions.create(
+            total_size=request.total_size,
+            chunk_size=request.chunk_size or settings.UPLOAD_DEFAULT_CHUNK_SIZE,
+            title=request.title,
+            format=request.format
+        )
+    except UploadSessionError as e:
+        raise _session_error(e)
+
+    return {
+        **upload_sessions.progress(manifest),
+        "chunk_url": f"{settings.API_V1_STR}/uploads/{manifest['id']}/chunks/{{index}}"
+    }
+
+
+@router.put("/{upload_id}/chunks/{index}")
+async def upload_chunk(
+    upload_id: str,
+    index: int,
+    req: Request,
+    offset: Optional[int] = None,
+    x_chunk_sha256: Optional[str] = Header(None)
+):
+    """
+    Store chunk `index` (raw body); re-sending a chunk replaces it
+
+    `offset` is optional and, if given, must equal `index * chunk_size`.
+    An `X-Chunk-SHA256` header is verified against the received bytes.
+    """
+    try:
+        manifest = await upload_sessions.write_chunk(upload_id, index, offset, req.stream(), x_chunk_sha256)
+    except UploadSessionError as e:
+        raise _session_error(e)
+
+    progress = upload_sessions.progress(manifest)
+    return {
+        "upload_id": upload_id,
+        "index": index,
+        "received_bytes": progress["received_bytes"],
+        "missing_chunks": len(progress["missing_chunks"]),
+        "complete": progress["complete"]
+    }
+
+
+@router.get("/{upload_id}")
+async def get_upload(upload_id: str):
+    """Which chunks have been received and which are still missing"""
+    try:
+        return upload_sessions.progress(upload_sessions.get(upload_id))
+    except UploadSessionError as e:
+        raise _session_error(e)
+
+
+@router.post("/{upload_id}/finalize", status_code=202)
+async def finalize_upload(upload_id: str):
+    """
+    Queue a complete upload for transcription
+
+    Returns the same job response as `POST /api/transcription/jobs`; calling it
+    again after a dropped response returns the original job.
+    """
+    try:
+        manifest = await upload_sessions.finalize(upload_id, JOB_AUDIO_DIR)
+    except UploadSessionError as e:
+        raise _session_error(e)
+
+    if manifest["status"] == UPLOAD_FINALIZED:
+        return manifest["result"]
+
+    try:
+        result = await enqueue_transcription(
+            manifest["audio_path"], manifest["total_size"], manifest["sha256"],
+            manifest["title"], manifest["format"]
+        )
+    except QueueFullError as e:
+        await upload_sessions.restore_audio(upload_id, manifest["audio_path"])
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+    await upload_sessions.mark_finalized(upload_id, result)
+    logger.info(f"✅ Upload {upload_id} finalized as job {result['job_id']}")
+    return result
+
+
+@router.delete("/{upload_id}", status_code=204)
+async def abort_upload(upload_id: str):
+    """Discard an upload session and its received chunks"""
+    try:
+        upload_sessions.delete(upload_id)
+    except UploadSessionError as e:
+        raise _session_error(e)
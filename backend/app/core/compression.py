@@ -0,0 +1,128 @@
+"""
+HTTP response compression
+Buffered responses larger than RESPONSE_COMPRESSION_MIN_BYTES (meeting
+details, full transcripts, timelines, meeting lists) are sent brotli- or
+gzip-encoded, whichever the client prefers, with brotli only when the brotli
+package is installed. Streamed responses (server-sent events, WebSocket
+upgrades, file downloads) and already-encoded or binary bodies pass through
+untouched, so streams are never buffered.
+"""
+
+import asyncio
+import gzip
+from typing import List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies at least this large are compressed off the event loop
+THREAD_COMPRESS_BYTES = 256 * 1024
+
+# Content types worth compressing; audio and images are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported encoding ("br" or "gzip") from an Accept-Encoding header, or None"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+    wildcard = weights.get("*", 0.0)
+    candidates = (["br"] if brotli else []) + ["gzip"]
+    best = max(candidates, key=lambda e: weights.get(e, wildcard))
+    return best if weights.get(best, wildcard) > 0 else None
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class ResponseCompressionMiddleware:
+    """ASGI middleware compressing complete (non-streamed) compressible responses"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept = next((v.decode("latin-1") for k, v in scope["headers"] if k == b"accept-encoding"), "")
+        encoding = choose_encoding(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = start_message.get("headers", [])
+            if message.get("more_body", False) or not self._should_compress(headers, len(body)):
+                # Streams and small or incompressible bodies go out as they are
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= THREAD_COMPRESS_BYTES:
+                compressed = await asyncio.to_thread(
+                    compress_body, body, encoding, self.gzip_level, self.brotli_quality
+                )
+            else:
+                compressed = compress_body(body, encoding, self.gzip_level, self.brotli_quality)
+            start_message["headers"] = self._encoded_headers(headers, encoding, len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, headers: List[Tuple[bytes, bytes]], size: int) -> bool:
+        if size < self.minimum_size:
+            return False
+        content_type = b""
+        for name, value in headers:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        content_type = content_type.decode("latin-1").lower()
+        return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+    @staticmethod
+    def _encoded_headers(headers: List[Tuple[bytes, bytes]], encoding: str, length: int) -> List[Tuple[bytes, bytes]]:
+        vary = [v for k, v in headers if k == b"vary"]
+        headers = [(k, v) for k, v in headers if k not in (b"content-length", b"vary")]
+        headers += [
+            (b"content-encoding", encoding.encode()),
+            (b"content-length", str(length).encode()),
+            (b"vary", b", ".join(vary + [b"Accept-Encoding"]))
+        ]
+        return headers
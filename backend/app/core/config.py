@@ -34,6 +34,15 @@ class Settings(BaseSettings):
         "DATABASE_URL",
         "sqlite:///./meetnote.db"  # Default to SQLite for development
     )
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")  # Empty = DATABASE_URL with asyncpg / aiosqlite
+    
+    # Database connection pool (Postgres; SQLite uses the statement timeout as its lock wait)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))  # Per engine (sync and async)
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))  # Extra connections under bursts
+    DB_POOL_TIMEOUT_S: float = float(os.getenv("DB_POOL_TIMEOUT_S", "30"))  # Wait for a free connection
+    DB_POOL_RECYCLE_S: int = int(os.getenv("DB_POOL_RECYCLE_S", "1800"))  # Replace older connections, -1 = never
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"  # Drop dead connections on checkout
+    DB_STATEMENT_TIMEOUT_MS: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # 0 = no limit
     
     # Security
     SECRET_KEY: str = os.getenv(
@@ -45,19 +54,121 @@ class Settings(BaseSettings):
     
     # OpenRouter API (for Mistral 7B summarization)
     OPENROUTER_API_KEY: str = os.getenv("OPENROUTER_API_KEY", "")
-    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
-    OPENROUTER_MODEL: str = "mistralai/mistral-7b-instruct:free"
+    OPENROUTER_BASE_URL: str = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+    OPENROUTER_MODEL: str = os.getenv("OPENROUTER_MODEL", "mistralai/mistral-7b-instruct:free")
+    
+    # Local OpenAI-compatible model server (llama.cpp / vLLM) for summaries on our own boxes; empty URL = off
+    LOCAL_LLM_BASE_URL: str = os.getenv("LOCAL_LLM_BASE_URL", "")
+    LOCAL_LLM_API_KEY: str = os.getenv("LOCAL_LLM_API_KEY", "")
+    LOCAL_LLM_MODEL: str = os.getenv("LOCAL_LLM_MODEL", "local")
+    LOCAL_LLM_MAX_CONCURRENCY: int = int(os.getenv("LOCAL_LLM_MAX_CONCURRENCY", "1"))  # Parallel slots on the server
+    LOCAL_LLM_BATCH_SIZE: int = int(os.getenv("LOCAL_LLM_BATCH_SIZE", "5"))  # Highlight excerpts per call
+    LOCAL_LLM_WINDOW_TOKENS: int = int(os.getenv("LOCAL_LLM_WINDOW_TOKENS", "3000"))  # Fits a 4k context
+    LOCAL_LLM_OVERHEAD_S: float = float(os.getenv("LOCAL_LLM_OVERHEAD_S", "0.1"))
+    LOCAL_LLM_TOKENS_PER_S: float = float(os.getenv("LOCAL_LLM_TOKENS_PER_S", "100"))  # Initial estimate, learned from calls
+    
+    # Summary backends, in preference order (openrouter, local, extractive)
+    SUMMARY_BACKENDS: str = os.getenv("SUMMARY_BACKENDS", "openrouter,local,extractive")
+    SUMMARY_LATENCY_BUDGET_S: float = float(os.getenv("SUMMARY_LATENCY_BUDGET_S", "0"))  # 0 = no budget, use preference order
+    OPENROUTER_OVERHEAD_S: float = float(os.getenv("OPENROUTER_OVERHEAD_S", "1.0"))
+    OPENROUTER_TOKENS_PER_S: float = float(os.getenv("OPENROUTER_TOKENS_PER_S", "500"))  # Initial estimate, learned from calls
+    
+    # Summarization (long transcripts are summarized in windows, then combined)
+    SUMMARY_WINDOW_TOKENS: int = int(os.getenv("SUMMARY_WINDOW_TOKENS", "6000"))  # Transcript tokens per LLM call
+    SUMMARY_MAX_CONCURRENCY: int = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))  # Window summaries in flight
+    SUMMARY_FALLBACK_ENGINE: str = os.getenv("SUMMARY_FALLBACK_ENGINE", "extractive")  # extractive or none
+    HIGHLIGHT_BATCH_SIZE: int = int(os.getenv("HIGHLIGHT_BATCH_SIZE", "10"))  # Highlight excerpts per description call
+    
+    # Summary cache (keyed on normalized transcript hash + model + prompt version)
+    SUMMARY_CACHE_ENABLED: bool = os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() == "true"
+    SUMMARY_CACHE_MEMORY_MB: int = int(os.getenv("SUMMARY_CACHE_MEMORY_MB", "8"))
+    SUMMARY_CACHE_PATH: str = os.getenv("SUMMARY_CACHE_PATH", "./summary_cache.db")  # Empty = memory only
+    SUMMARY_CACHE_DISK_MB: int = int(os.getenv("SUMMARY_CACHE_DISK_MB", "64"))
+    SUMMARY_CACHE_TTL_HOURS: float = float(os.getenv("SUMMARY_CACHE_TTL_HOURS", "720"))  # 30 days, 0 = no expiry
+    
+    # LLM client resilience (OpenRouter free tier allows ~20 requests/minute)
+    LLM_HTTP2: bool = os.getenv("LLM_HTTP2", "true").lower() == "true"  # Used when the h2 package is installed
+    LLM_TIMEOUT_S: float = float(os.getenv("LLM_TIMEOUT_S", "60"))
+    LLM_CONNECT_TIMEOUT_S: float = float(os.getenv("LLM_CONNECT_TIMEOUT_S", "5"))
+    LLM_RATE_LIMIT_PER_MIN: float = float(os.getenv("LLM_RATE_LIMIT_PER_MIN", "20"))  # 0 = unlimited
+    LLM_RATE_BURST: int = int(os.getenv("LLM_RATE_BURST", "5"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_RETRY_BACKOFF_S: float = float(os.getenv("LLM_RETRY_BACKOFF_S", "1.0"))
+    LLM_RETRY_BACKOFF_MAX_S: float = float(os.getenv("LLM_RETRY_BACKOFF_MAX_S", "20"))
+    LLM_BREAKER_THRESHOLD: int = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))  # Consecutive failures, 0 = off
+    LLM_BREAKER_RESET_S: float = float(os.getenv("LLM_BREAKER_RESET_S", "30"))
+    LLM_HEDGE_MODEL: str = os.getenv("LLM_HEDGE_MODEL", "")  # Secondary model for slow requests, empty = off
+    LLM_HEDGE_DELAY_S: float = float(os.getenv("LLM_HEDGE_DELAY_S", "10"))
     
     # Whisper Settings
     WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")  # tiny, base, small, medium, large
     WHISPER_DEVICE: str = os.getenv("WHISPER_DEVICE", "cpu")  # cpu or cuda
     WHISPER_COMPUTE_TYPE: str = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # int8, float16, float32
+    WHISPER_CPU_THREADS: int = int(os.getenv("WHISPER_CPU_THREADS", "2"))  # Threads per model worker
+    WHISPER_NUM_WORKERS: int = int(os.getenv("WHISPER_NUM_WORKERS", "0"))  # Warm model workers, 0 = size from cores/memory
+    WHISPER_MAX_QUEUE: int = int(os.getenv("WHISPER_MAX_QUEUE", "4"))  # Requests allowed to wait for a worker
     
     # Audio Settings
     SAMPLE_RATE: int = 16000
     CHUNK_DURATION: int = 5  # seconds
     MAX_AUDIO_SIZE: int = int(os.getenv("MAX_AUDIO_SIZE", "25000000"))  # 25MB
     
+    # Meeting list (metadata plus previews; full text comes from GET /api/meetings/{id})
+    MEETING_LIST_DEFAULT_LIMIT: int = int(os.getenv("MEETING_LIST_DEFAULT_LIMIT", "100"))
+    MEETING_LIST_MAX_LIMIT: int = int(os.getenv("MEETING_LIST_MAX_LIMIT", "500"))
+    MEETING_PREVIEW_CHARS: int = int(os.getenv("MEETING_PREVIEW_CHARS", "200"))  # Transcript/summary preview length
+    SEGMENT_TIMELINE_ENABLED: bool = os.getenv("SEGMENT_TIMELINE_ENABLED", "true").lower() == "true"  # Also pack segments + word timestamps into one row per meeting
+    SEGMENT_INDEX_CACHE_MEETINGS: int = int(os.getenv("SEGMENT_INDEX_CACHE_MEETINGS", "64"))  # Meetings whose segment interval index stays in memory, 0 = off
+
+    # Compressed storage of transcripts, timeline text and journaled meetings (read either way)
+    STORAGE_COMPRESSION: str = os.getenv("STORAGE_COMPRESSION", "zstd")  # zstd or none
+    STORAGE_COMPRESSION_LEVEL: int = int(os.getenv("STORAGE_COMPRESSION_LEVEL", "3"))  # zstd level, 1-19
+    STORAGE_COMPRESSION_MIN_BYTES: int = int(os.getenv("STORAGE_COMPRESSION_MIN_BYTES", "256"))  # Shorter values stored as-is
+
+    # HTTP response compression (buffered responses only; streams are sent as-is)
+    RESPONSE_COMPRESSION_ENABLED: bool = os.getenv("RESPONSE_COMPRESSION_ENABLED", "true").lower() == "true"
+    RESPONSE_COMPRESSION_MIN_BYTES: int = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+    RESPONSE_GZIP_LEVEL: int = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+    RESPONSE_BROTLI_QUALITY: int = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))  # Used when the brotli package is installed
+
+    # Transcription Jobs
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", "1"))  # Server processes (uvicorn --workers reads it too)
+    # memory or sqlite; jobs must be shared, so sqlite whenever there is more than one process
+    JOB_QUEUE_BACKEND: str = os.getenv("JOB_QUEUE_BACKEND", "sqlite" if WEB_CONCURRENCY > 1 else "memory")
+    JOB_QUEUE_DB_PATH: str = os.getenv("JOB_QUEUE_DB_PATH", "./jobs.db")
+    JOB_WORKERS: int = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_MAX_PENDING: int = int(os.getenv("JOB_QUEUE_MAX_PENDING", "100"))
+    JOB_LEASE_S: int = int(os.getenv("JOB_LEASE_S", "120"))  # A running job whose process stops renewing this long is requeued
+    JOB_RETENTION_S: int = int(os.getenv("JOB_RETENTION_S", "3600"))  # Finished jobs kept by the memory backend
+    JOB_RETENTION_MAX: int = int(os.getenv("JOB_RETENTION_MAX", "1000"))
+    JOB_AUDIO_ORPHAN_AGE_S: int = int(os.getenv("JOB_AUDIO_ORPHAN_AGE_S", "3600"))  # Startup sweep skips newer unreferenced uploads
+    
+    # Write-behind persistence of transcription results (local journal, batched into the database)
+    WRITE_BEHIND_ENABLED: bool = os.getenv("WRITE_BEHIND_ENABLED", "true").lower() == "true"  # false = write to the database inside the request
+    WRITE_BEHIND_JOURNAL_PATH: str = os.getenv("WRITE_BEHIND_JOURNAL_PATH", "./meeting_journal.db")
+    WRITE_BEHIND_BATCH_SIZE: int = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "50"))  # Meetings per transaction
+    WRITE_BEHIND_FLUSH_INTERVAL_S: float = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL_S", "1.0"))  # Idle poll for retries that came due
+    WRITE_BEHIND_RETRY_BACKOFF_S: float = float(os.getenv("WRITE_BEHIND_RETRY_BACKOFF_S", "1.0"))  # Doubles per failed attempt
+    WRITE_BEHIND_RETRY_BACKOFF_MAX_S: float = float(os.getenv("WRITE_BEHIND_RETRY_BACKOFF_MAX_S", "60"))
+    WRITE_BEHIND_DRAIN_TIMEOUT_S: float = float(os.getenv("WRITE_BEHIND_DRAIN_TIMEOUT_S", "10"))  # Flushing allowed at shutdown
+    WRITE_BEHIND_CLAIM_TIMEOUT_S: float = float(os.getenv("WRITE_BEHIND_CLAIM_TIMEOUT_S", "300"))  # Batch claims older than this are taken over by another process
+
+    # Resumable chunked uploads
+    UPLOAD_SESSION_MAX_SIZE: int = int(os.getenv("UPLOAD_SESSION_MAX_SIZE", str(2 * 1024 ** 3)))  # 2GB
+    UPLOAD_CHUNK_MAX_SIZE: int = int(os.getenv("UPLOAD_CHUNK_MAX_SIZE", str(16 * 1024 ** 2)))  # 16MB
+    UPLOAD_DEFAULT_CHUNK_SIZE: int = int(os.getenv("UPLOAD_DEFAULT_CHUNK_SIZE", str(8 * 1024 ** 2)))  # 8MB
+    UPLOAD_SESSION_TTL_HOURS: float = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+    UPLOAD_FINALIZE_TIMEOUT_S: float = float(os.getenv("UPLOAD_FINALIZE_TIMEOUT_S", "300"))  # A session finalizing this long (its process died) can be finalized again
+    
+    # Transcription result cache (keyed on upload content hash + model settings)
+    TRANSCRIPTION_CACHE_ENABLED: bool = os.getenv("TRANSCRIPTION_CACHE_ENABLED", "true").lower() == "true"
+    TRANSCRIPTION_CACHE_MEMORY_MB: int = int(os.getenv("TRANSCRIPTION_CACHE_MEMORY_MB", "32"))
+    TRANSCRIPTION_CACHE_PATH: str = os.getenv("TRANSCRIPTION_CACHE_PATH", "./transcription_cache.db")  # Empty = memory only
+    TRANSCRIPTION_CACHE_DISK_MB: int = int(os.getenv("TRANSCRIPTION_CACHE_DISK_MB", "512"))
+    
+    # Live transcription
+    STREAM_MAX_SESSIONS: int = int(os.getenv("STREAM_MAX_SESSIONS", "4"))  # Concurrent WebSocket streams
+    
     # CORS - Parse from environment variable
     CORS_ORIGINS: List[str] = [
         "http://localhost:3000",
@@ -45,6 +45,27 @@ class ProductionSettings(BaseSettings):
     WHISPER_COMPUTE_TYPE: str = os.getenv("WHISPER_COMPUTE_TYPE", "int8")  # Memory optimized
     WHISPER_BEAM_SIZE: int = 5  # Good accuracy/speed balance
     WHISPER_VAD_FILTER: bool = True  # Voice activity detection
+    WHISPER_CPU_THREADS: int = int(os.getenv("WHISPER_CPU_THREADS", "2"))  # Threads per model worker
+    WHISPER_NUM_WORKERS: int = int(os.getenv("WHISPER_NUM_WORKERS", "0"))  # Warm model workers, 0 = size from cores/memory
+    WHISPER_MAX_QUEUE: int = int(os.getenv("WHISPER_MAX_QUEUE", "4"))  # Requests allowed to wait for a worker
+    
+    # Worker backend: "thread" (model in the API process) or "process" (one model per worker process)
+    WHISPER_BACKEND: str = os.getenv("WHISPER_BACKEND", "thread")
+    WHISPER_WORKER_MAX_JOBS: int = int(os.getenv("WHISPER_WORKER_MAX_JOBS", "200"))  # Recycle after N jobs, 0 = never
+    WHISPER_WORKER_MAX_RSS_MB: int = int(os.getenv("WHISPER_WORKER_MAX_RSS_MB", "0"))  # Recycle above this RSS, 0 = never
+    WHISPER_WORKER_START_TIMEOUT: float = float(os.getenv("WHISPER_WORKER_START_TIMEOUT", "300"))  # Includes model download
+    WHISPER_WORKER_JOB_TIMEOUT: float = float(os.getenv("WHISPER_WORKER_JOB_TIMEOUT", "3600"))
+    
+    # Long-audio mode: VAD-split chunks transcribed in parallel (needs more than one worker)
+    LONG_AUDIO_ENABLED: bool = os.getenv("LONG_AUDIO_ENABLED", "true").lower() == "true"
+    LONG_AUDIO_THRESHOLD_S: float = float(os.getenv("LONG_AUDIO_THRESHOLD_S", "300"))  # 5 minutes
+    LONG_AUDIO_CHUNK_S: float = float(os.getenv("LONG_AUDIO_CHUNK_S", "60"))  # Target chunk length
+    
+    # Live streaming over WebSocket (LocalAgreement-2 over a rolling buffer)
+    STREAM_MIN_CHUNK_S: float = float(os.getenv("STREAM_MIN_CHUNK_S", "1.0"))  # New audio needed before re-transcribing
+    STREAM_BUFFER_TRIM_S: float = float(os.getenv("STREAM_BUFFER_TRIM_S", "15"))  # Drop committed audio past this length
+    STREAM_MAX_BUFFER_S: float = float(os.getenv("STREAM_MAX_BUFFER_S", "30"))  # Force-commit if nothing agrees by then
+    STREAM_BEAM_SIZE: int = int(os.getenv("STREAM_BEAM_SIZE", "1"))  # Greedy decoding for latency
     
     # Audio Settings
     SAMPLE_RATE: int = 16000
@@ -8,10 +8,11 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db import models
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -66,7 +67,7 @@ def decode_token(token: str) -> dict:
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current authenticated user from token"""
     import logging
@@ -89,7 +90,7 @@ async def get_current_user(
         
         user_id: int = int(user_id_str)
         
-        user = db.query(models.User).filter(models.User.id == user_id).first()
+        user = (await db.execute(select(models.User).where(models.User.id == user_id))).scalar_one_or_none()
         if user is None:
             logger.error(f"User {user_id} not found in database")
             raise HTTPException(
@@ -1,29 +1,98 @@
 """
 Database configuration and session management
+Request handlers use the async engine (asyncpg for Postgres, aiosqlite for
+SQLite) so queries never block the event loop; the sync engine remains for
+startup DDL, migrations and code already running in worker threads. Both
+take their pool and timeout settings from Settings.
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Sync driver URL prefixes and their async counterparts
+ASYNC_DRIVERS = {
+    "postgresql+psycopg2://": "postgresql+asyncpg://",
+    "postgresql+psycopg://": "postgresql+asyncpg://",
+    "postgresql://": "postgresql+asyncpg://",
+    "postgres://": "postgresql+asyncpg://",
+    "sqlite+pysqlite://": "sqlite+aiosqlite://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
 
-# Create session factory
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its async driver; URLs that already name one are returned unchanged"""
+    for prefix, async_prefix in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """
+    create_engine / create_async_engine keyword arguments from Settings
+
+    Postgres gets a sized QueuePool and a server-side statement_timeout.
+    SQLite keeps SQLAlchemy's default pool (one file, no server) and uses the
+    statement timeout as its busy timeout, i.e. how long a statement waits
+    for another connection's write lock.
+    """
+    timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        connect_args = {} if is_async else {"check_same_thread": False}
+        if timeout_ms > 0:
+            connect_args["timeout"] = timeout_ms / 1000
+        options["connect_args"] = connect_args
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_S,
+        pool_recycle=settings.DB_POOL_RECYCLE_S
+    )
+    if timeout_ms > 0 and url.startswith("postgres"):
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
+# Create database engines
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, is_async=True))
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay readable after commit, since handlers serialize them afterwards
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Create base class for models
 Base = declarative_base()
 
 
 def get_db():
-    """Dependency to get database session"""
+    """
+    Dependency to get a blocking database session
+
+    Mounted routes use get_async_db; only app/api/auth.py (not mounted) still
+    depends on this one.
+    """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -2,9 +2,17 @@
 Database models
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, JSON, Index, ForeignKey, LargeBinary
+from sqlalchemy.dialects.sqlite import DATETIME as SQLITE_DATETIME
 from sqlalchemy.sql import func
 from app.db.database import Base
+from app.db.types import CompressedBinary, CompressedText
+
+# SQLite keeps DateTime as text; store Python-side values in CURRENT_TIMESTAMP's
+# format so bound cursor timestamps compare exactly against server defaults
+SQLITE_TIMESTAMP = SQLITE_DATETIME(
+    storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+)
 
 class Meeting(Base):
     """Meeting model compatible with current app logic"""
@@ -12,14 +20,71 @@ class Meeting(Base):
     
     id = Column(String, primary_key=True, index=True)  # UUID
     title = Column(String, nullable=True)
-    transcript = Column(Text, nullable=True)
+    transcript = Column(CompressedText, nullable=True)  # zstd, app/db/types.py
+    transcript_preview = Column(Text, nullable=True)  # Uncompressed head of the transcript for the meeting list
     summary = Column(Text, nullable=True)
     duration = Column(Integer, default=0)
     language = Column(String, default="en")
     confidence = Column(Float, default=0.0)
     audio_format = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True).with_variant(SQLITE_TIMESTAMP, "sqlite"), server_default=func.now())
     
     # Extra fields for future compatibility
     key_points = Column(JSON, nullable=True)
     action_items = Column(JSON, nullable=True)
+    
+    __table_args__ = (
+        # Newest-first keyset pagination (app/db/pagination.py)
+        Index("ix_meetings_created_at_id", "created_at", "id"),
+    )
+
+
+class MeetingSegment(Base):
+    """One Whisper segment of a meeting's transcript, with its position in the recording"""
+    __tablename__ = "meeting_segments"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(String, ForeignKey("meetings.id"), nullable=False, index=True)
+    seq = Column(Integer, nullable=False)  # Order within the meeting
+    start_time = Column(Float, nullable=False)  # Seconds from the start of the recording
+    end_time = Column(Float, nullable=False)
+    text = Column(Text, nullable=False)
+    
+    __table_args__ = (
+        # Time-range reads within one meeting
+        Index("ix_meeting_segments_meeting_id_start_time", "meeting_id", "start_time"),
+    )
+
+
+class MeetingHighlight(Base):
+    """A clip of a meeting's recording with the transcript text it covers (app/api/highlights.py)"""
+    __tablename__ = "meeting_highlights"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    meeting_id = Column(String, ForeignKey("meetings.id"), nullable=False, index=True)
+    title = Column(String(500), nullable=False)
+    description = Column(Text, nullable=True)
+    start_time = Column(Float, nullable=False)  # Seconds from the start of the recording
+    end_time = Column(Float, nullable=False)
+    transcript_text = Column(Text, nullable=True)  # Segments overlapping [start_time, end_time] when created
+    tags = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True).with_variant(SQLITE_TIMESTAMP, "sqlite"), server_default=func.now())
+
+
+class MeetingTimeline(Base):
+    """
+    A meeting's segments and word timestamps packed column-wise into one row
+    (app/db/segment_store.py); arrays are little-endian
+    """
+    __tablename__ = "meeting_timelines"
+    
+    meeting_id = Column(String, ForeignKey("meetings.id"), primary_key=True)
+    segment_count = Column(Integer, nullable=False)
+    word_count = Column(Integer, nullable=False)
+    segment_starts = Column(LargeBinary, nullable=False)  # float32 seconds
+    segment_ends = Column(LargeBinary, nullable=False)  # float32 seconds
+    segment_word_counts = Column(LargeBinary, nullable=False)  # uint32 words per segment
+    word_starts = Column(LargeBinary, nullable=False)  # float32 seconds
+    word_ends = Column(LargeBinary, nullable=False)  # float32 seconds
+    word_probabilities = Column(LargeBinary, nullable=False)  # uint8, probability * 255
+    text = Column(CompressedBinary, nullable=False)  # UTF-8 segment texts then word texts, NUL separated (zstd)
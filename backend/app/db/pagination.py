@@ -0,0 +1,106 @@
+"""
+Keyset (cursor) pagination for meeting lists
+Pages are ordered newest first by (created_at, id) and continue strictly after
+the last row of the previous page, so a deep page is one index range scan on
+ix_meetings_created_at_id instead of an OFFSET that reads and discards every
+earlier row. The cursor is an opaque URL-safe token holding that last row's key.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Union
+
+from sqlalchemy import literal, text, tuple_
+
+
+class InvalidCursorError(ValueError):
+    """Cursor token that was not produced by encode_cursor"""
+
+
+def encode_cursor(created_at: Union[datetime, str], row_id: Any) -> str:
+    """Opaque token for the position after (created_at, row_id)"""
+    stamp = created_at.isoformat() if isinstance(created_at, datetime) else created_at
+    raw = json.dumps([stamp, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, Any]:
+    """
+    (created_at, id) from a cursor token
+
+    Raises:
+        InvalidCursorError: Malformed or tampered token
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        stamp, row_id = json.loads(raw)
+        if not isinstance(stamp, str) or not isinstance(row_id, (str, int)):
+            raise ValueError("unexpected cursor fields")
+        return datetime.fromisoformat(stamp), row_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+
+def normalize_sqlite_timestamps(conn, table: str = "meetings", column: str = "created_at") -> int:
+    """
+    Rewrite SQLite timestamps stored with fractional seconds (or a "T") in
+    SQLITE_TIMESTAMP's second-precision format; returns the rows changed
+
+    SQLite compares these as text, so "12:00:00.5" sorts after a "12:00:00"
+    cursor and rows from that second would be skipped between pages.
+    Idempotent; values strftime cannot parse are left alone.
+    """
+    normalized = f"strftime('%Y-%m-%d %H:%M:%S', {column})"
+    return conn.execute(text(f"UPDATE {table} SET {column} = {normalized} WHERE {column} != {normalized}")).rowcount
+
+
+def _keyset(query, created_col, id_col, cursor: Optional[str], limit: int):
+    """`query` (Query or select()) restricted to rows after `cursor`, newest first, one row over `limit`"""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # Row-value comparison: one range condition the composite index can seek to.
+        # Bound with the columns' own types so dialect storage formats match
+        query = query.filter(tuple_(created_col, id_col) < tuple_(
+            literal(created_at, created_col.type), literal(row_id, id_col.type)
+        ))
+    return query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def _page(rows: List[Any], created_col, id_col, limit: int) -> Tuple[List[Any], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, created_col.key), getattr(last, id_col.key))
+
+
+def keyset_page(query, created_col, id_col, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of `query`, newest first, and the cursor for the next page
+
+    Args:
+        query: SQLAlchemy query selecting rows (or entities) that expose created_col and id_col
+        created_col: Timestamp column, e.g. Meeting.created_at
+        id_col: Primary key column breaking created_at ties
+        cursor: Token from the previous page, None for the first page
+        limit: Rows per page
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+    """
+    rows = _keyset(query, created_col, id_col, cursor, limit).all()
+    return _page(rows, created_col, id_col, limit)
+
+
+async def keyset_page_async(db, stmt, created_col, id_col, cursor: Optional[str], limit: int,
+                            scalars: bool = False) -> Tuple[List[Any], Optional[str]]:
+    """
+    keyset_page for a select() run on an AsyncSession
+
+    Args:
+        scalars: `stmt` selects one ORM entity; return instances instead of rows
+    """
+    result = await db.execute(_keyset(stmt, created_col, id_col, cursor, limit))
+    rows = list(result.scalars().all() if scalars else result.all())
+    return _page(rows, created_col, id_col, limit)
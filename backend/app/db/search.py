@@ -0,0 +1,311 @@
+"""
+Full-text search over meetings
+Meetings are ranked on title, summary and transcript; matching Whisper
+segments are returned with their position in the recording. Two backends:
+SQLite FTS5 tables for development and single-node installs, and tsvector
+columns with GIN indexes on Postgres. The index is maintained by the app
+(not triggers) when a meeting or its summary is written, inside the same
+transaction.
+"""
+
+import html
+import logging
+import re
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from app.db.database import engine
+from app.db.models import Meeting
+
+logger = logging.getLogger(__name__)
+
+# Postgres text search configuration (stemming and stop words)
+TEXT_SEARCH_CONFIG = "english"
+
+# Snippet match markers; everything between them is HTML-escaped
+MARK_START = "<mark>"
+MARK_END = "</mark>"
+
+_TERM = re.compile(r"\w+", re.UNICODE)
+
+# Meetings indexed per statement when setup() backfills existing rows
+BACKFILL_BATCH_SIZE = 500
+
+
+def safe_snippet(snippet: Optional[str]) -> str:
+    """HTML-escape a snippet while keeping its <mark> highlights"""
+    if not snippet:
+        return ""
+    parts = re.split(f"({re.escape(MARK_START)}|{re.escape(MARK_END)})", snippet)
+    return "".join(p if p in (MARK_START, MARK_END) else html.escape(p) for p in parts)
+
+
+class SearchIndex:
+    """
+    Base class for the meeting search backends
+
+    Subclasses implement setup (idempotent DDL plus backfill of unindexed
+    rows), index_meeting, index_segments and the two ranked queries; search()
+    combines them into one result list.
+    """
+
+    name = "none"
+
+    def setup(self):
+        pass
+
+    def index_meeting(self, db: Session, meeting):
+        """(Re)index a meeting's title, summary and transcript; call before commit"""
+
+    def index_segments(self, db: Session, meeting_id: str):
+        """Index a meeting's stored segments; call after they are inserted, before commit"""
+
+    def search(self, db: Session, query: str, limit: int = 20,
+               segments_per_meeting: int = 3) -> List[Dict[str, Any]]:
+        """
+        Meetings matching `query`, best first
+
+        Returns:
+            [{"id", "title", "created_at", "rank", "snippet", "segments": [{"start_time",
+            "end_time", "rank", "snippet"}]}]; snippets are HTML-escaped with <mark> around matches
+        """
+        meetings = self._search_meetings(db, query, limit)
+        if not meetings:
+            return []
+
+        hits: Dict[str, List[Dict[str, Any]]] = {m["id"]: [] for m in meetings}
+        if segments_per_meeting > 0:
+            for row in self._search_segments(db, query, list(hits), segments_per_meeting):
+                hits[row["meeting_id"]].append({
+                    "start_time": row["start_time"],
+                    "end_time": row["end_time"],
+                    "rank": round(float(row["rank"]), 6),
+                    "snippet": safe_snippet(row["snippet"])
+                })
+
+        return [{
+            "id": m["id"],
+            "title": m["title"],
+            "created_at": m["created_at"].isoformat() if hasattr(m["created_at"], "isoformat") else m["created_at"],
+            "rank": round(float(m["rank"]), 6),
+            "snippet": safe_snippet(m["snippet"]),
+            "segments": hits[m["id"]]
+        } for m in meetings]
+
+    def _search_meetings(self, db: Session, query: str, limit: int) -> List[Dict[str, Any]]:
+        return []
+
+    def _search_segments(self, db: Session, query: str, meeting_ids: List[str],
+                         per_meeting: int) -> List[Dict[str, Any]]:
+        return []
+
+
+class SQLiteSearchIndex(SearchIndex):
+    """
+    FTS5: meeting_search keeps its own copy of title/summary/transcript;
+    segment_search is an external-content index over meeting_segments
+    """
+
+    name = "sqlite-fts5"
+
+    _INSERT_MEETING = (
+        "INSERT INTO meeting_search (meeting_id, title, summary, transcript) "
+        "VALUES (:id, :title, :summary, :transcript)"
+    )
+
+    def setup(self):
+        with engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS meeting_search "
+                "USING fts5(meeting_id UNINDEXED, title, summary, transcript, tokenize='porter unicode61')"
+            )
+            conn.exec_driver_sql(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS segment_search "
+                "USING fts5(text, content='meeting_segments', content_rowid='id', tokenize='porter unicode61')"
+            )
+            # Transcripts are stored compressed, so they are copied in through Python rather than in SQL
+            unindexed = conn.execute(text(
+                "SELECT id, title, summary, transcript FROM meetings "
+                "WHERE id NOT IN (SELECT meeting_id FROM meeting_search)"
+            ).columns(transcript=Meeting.__table__.c.transcript.type), execution_options={"stream_results": True})
+            meetings = 0
+            for rows in unindexed.partitions(BACKFILL_BATCH_SIZE):
+                conn.execute(text(self._INSERT_MEETING), [self._meeting_params(r) for r in rows])
+                meetings += len(rows)
+            segments = conn.exec_driver_sql(
+                # External-content rowid queries read meeting_segments; the docsize shadow table lists indexed rows
+                "INSERT INTO segment_search (rowid, text) SELECT id, text FROM meeting_segments "
+                "WHERE id > (SELECT coalesce(max(id), 0) FROM segment_search_docsize)"
+            ).rowcount
+        if meetings > 0 or segments > 0:
+            logger.info(f"🔎 Indexed {meetings} existing meetings and {segments} segments for search")
+
+    def index_meeting(self, db: Session, meeting):
+        db.execute(text("DELETE FROM meeting_search WHERE meeting_id = :id"), {"id": meeting.id})
+        db.execute(text(self._INSERT_MEETING), self._meeting_params(meeting))
+
+    @staticmethod
+    def _meeting_params(meeting) -> Dict[str, Any]:
+        return {"id": meeting.id, "title": meeting.title or "", "summary": meeting.summary or "",
+                "transcript": meeting.transcript or ""}
+
+    def index_segments(self, db: Session, meeting_id: str):
+        db.execute(
+            text("INSERT INTO segment_search (rowid, text) "
+                 "SELECT id, text FROM meeting_segments WHERE meeting_id = :id"),
+            {"id": meeting_id}
+        )
+
+    @staticmethod
+    def _match(query: str) -> Optional[str]:
+        """FTS5 query: every term required, last one as a prefix (search-as-you-type)"""
+        terms = _TERM.findall(query.lower())
+        if not terms:
+            return None
+        return " ".join(f'"{t}"' for t in terms) + "*"
+
+    def _search_meetings(self, db: Session, query: str, limit: int) -> List[Dict[str, Any]]:
+        match = self._match(query)
+        if not match:
+            return []
+        # Ordering by FTS5's rank column (rather than bm25()) lets the top-N sort happen
+        # inside FTS5, so snippet() only runs for the rows returned
+        rows = db.execute(text(
+            "SELECT m.id, m.title, m.created_at, -meeting_search.rank AS rank, "
+            f"snippet(meeting_search, -1, '{MARK_START}', '{MARK_END}', '…', 16) AS snippet "
+            "FROM meeting_search JOIN meetings m ON m.id = meeting_search.meeting_id "
+            "WHERE meeting_search MATCH :match AND meeting_search.rank MATCH 'bm25(0.0, 10.0, 4.0, 1.0)' "
+            "ORDER BY meeting_search.rank LIMIT :limit"
+        ).columns(created_at=Meeting.__table__.c.created_at.type), {"match": match, "limit": limit}).mappings().all()
+        return [dict(r) for r in rows]
+
+    def _search_segments(self, db: Session, query: str, meeting_ids: List[str],
+                         per_meeting: int) -> List[Dict[str, Any]]:
+        match = self._match(query)
+        # FTS5 functions can't be used inside a window; rank first, then number per meeting
+        rows = db.execute(text(
+            "WITH hits AS ("
+            "  SELECT s.meeting_id, s.start_time, s.end_time, -bm25(segment_search) AS rank, "
+            f"  snippet(segment_search, 0, '{MARK_START}', '{MARK_END}', '…', 12) AS snippet "
+            "  FROM segment_search JOIN meeting_segments s ON s.id = segment_search.rowid "
+            "  WHERE segment_search MATCH :match AND s.meeting_id IN :ids"
+            ") "
+            "SELECT meeting_id, start_time, end_time, rank, snippet FROM ("
+            "  SELECT *, row_number() OVER (PARTITION BY meeting_id ORDER BY rank DESC) AS n FROM hits"
+            ") WHERE n <= :per_meeting ORDER BY meeting_id, n"
+        ).bindparams(bindparam("ids", expanding=True)),
+            {"match": match, "ids": meeting_ids, "per_meeting": per_meeting}).mappings().all()
+        return [dict(r) for r in rows]
+
+
+class PostgresSearchIndex(SearchIndex):
+    """
+    tsvector columns (search_vector) on meetings and meeting_segments with GIN
+    indexes; title, summary and transcript weighted A, B and C
+    """
+
+    name = "postgres-tsvector"
+
+    _MEETING_VECTOR = (
+        f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({{title}}, '')), 'A') || "
+        f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({{summary}}, '')), 'B') || "
+        f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({{transcript}}, '')), 'C')"
+    )
+    _HEADLINE_OPTIONS = (
+        f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=24, MinWords=8, "
+        "MaxFragments=2, FragmentDelimiter=\" … \""
+    )
+    _UPDATE_MEETING = (
+        "UPDATE meetings SET search_vector = "
+        + _MEETING_VECTOR.format(title=":title", summary=":summary", transcript=":transcript")
+        + " WHERE id = :id"
+    )
+
+    def setup(self):
+        with engine.begin() as conn:
+            for table in ("meetings", "meeting_segments"):
+                conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector")
+                conn.exec_driver_sql(
+                    f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING GIN (search_vector)"
+                )
+            # Transcripts are stored compressed, so vectors are built from text passed in from Python
+            unindexed = conn.execute(text(
+                "SELECT id, title, summary, transcript FROM meetings WHERE search_vector IS NULL"
+            ).columns(transcript=Meeting.__table__.c.transcript.type), execution_options={"stream_results": True})
+            meetings = 0
+            for rows in unindexed.partitions(BACKFILL_BATCH_SIZE):
+                conn.execute(text(self._UPDATE_MEETING), [self._meeting_params(r) for r in rows])
+                meetings += len(rows)
+            segments = conn.exec_driver_sql(
+                f"UPDATE meeting_segments SET search_vector = to_tsvector('{TEXT_SEARCH_CONFIG}', text) "
+                "WHERE search_vector IS NULL"
+            ).rowcount
+        if meetings > 0 or segments > 0:
+            logger.info(f"🔎 Indexed {meetings} existing meetings and {segments} segments for search")
+
+    def index_meeting(self, db: Session, meeting):
+        db.execute(text(self._UPDATE_MEETING), self._meeting_params(meeting))
+
+    @staticmethod
+    def _meeting_params(meeting) -> Dict[str, Any]:
+        return {"id": meeting.id, "title": meeting.title, "summary": meeting.summary, "transcript": meeting.transcript}
+
+    def index_segments(self, db: Session, meeting_id: str):
+        db.execute(
+            text(f"UPDATE meeting_segments SET search_vector = to_tsvector('{TEXT_SEARCH_CONFIG}', text) "
+                 "WHERE meeting_id = :id"),
+            {"id": meeting_id}
+        )
+
+    def _search_meetings(self, db: Session, query: str, limit: int) -> List[Dict[str, Any]]:
+        # Rank in the inner query; transcripts are stored compressed, so the rows
+        # returned are headlined afterwards from their decompressed text
+        hits = db.execute(text(
+            "SELECT m.id, m.title, m.created_at, m.summary, m.transcript, hits.rank "
+            "FROM ("
+            "  SELECT id, ts_rank_cd(search_vector, q) AS rank "
+            f"  FROM meetings, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :query) q "
+            "  WHERE search_vector @@ q ORDER BY rank DESC LIMIT :limit"
+            ") hits JOIN meetings m ON m.id = hits.id ORDER BY hits.rank DESC"
+        ).columns(transcript=Meeting.__table__.c.transcript.type), {"query": query, "limit": limit}).mappings().all()
+        if not hits:
+            return []
+        snippets = db.execute(text(
+            f"SELECT ts_headline('{TEXT_SEARCH_CONFIG}', doc.body, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :query), "
+            ":options) FROM unnest(CAST(:docs AS text[])) WITH ORDINALITY AS doc(body, n) ORDER BY doc.n"
+        ), {"query": query, "options": self._HEADLINE_OPTIONS,
+            "docs": [h["transcript"] or h["summary"] or "" for h in hits]}).scalars().all()
+        return [{"id": h["id"], "title": h["title"], "created_at": h["created_at"], "rank": h["rank"], "snippet": snippet}
+                for h, snippet in zip(hits, snippets)]
+
+    def _search_segments(self, db: Session, query: str, meeting_ids: List[str],
+                         per_meeting: int) -> List[Dict[str, Any]]:
+        rows = db.execute(text(
+            "SELECT hits.meeting_id, hits.start_time, hits.end_time, hits.rank, "
+            f"ts_headline('{TEXT_SEARCH_CONFIG}', hits.text, hits.q, :options) AS snippet "
+            "FROM ("
+            "  SELECT s.meeting_id, s.start_time, s.end_time, s.text, q, ts_rank_cd(s.search_vector, q) AS rank, "
+            "  row_number() OVER (PARTITION BY s.meeting_id ORDER BY ts_rank_cd(s.search_vector, q) DESC) AS n "
+            f"  FROM meeting_segments s, websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', :query) q "
+            "  WHERE s.search_vector @@ q AND s.meeting_id IN :ids"
+            ") hits WHERE hits.n <= :per_meeting ORDER BY hits.meeting_id, hits.n"
+        ).bindparams(bindparam("ids", expanding=True)),
+            {"query": query, "ids": meeting_ids, "per_meeting": per_meeting,
+             "options": self._HEADLINE_OPTIONS.replace("MaxFragments=2", "MaxFragments=1")}).mappings().all()
+        return [dict(r) for r in rows]
+
+
+def create_search_index(bind=engine) -> SearchIndex:
+    """Search backend for the configured database"""
+    dialect = bind.dialect.name
+    if dialect == "sqlite":
+        return SQLiteSearchIndex()
+    if dialect == "postgresql":
+        return PostgresSearchIndex()
+    logger.warning(f"⚠️ No full-text search backend for {dialect}, search is disabled")
+    return SearchIndex()
+
+
+search_index = create_search_index()
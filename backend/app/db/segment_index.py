@@ -0,0 +1,115 @@
+"""
+Per-meeting interval index over transcript segments
+Answers "which segments overlap [t0, t1]" for player seeking, range reads
+and highlight text without going back to the database. Segments are kept
+sorted by start time next to a running maximum of their end times, so a
+lookup is two binary searches plus a scan of the hits. That is the same
+query an interval tree answers, and it stays exact when segments overlap.
+Indexes are built from a meeting's timeline (packed row or segment rows)
+and kept in a small per-process LRU with no invalidation. That is safe
+because a stored timeline never changes: write_meetings only stores segments
+for meetings that are not in the database yet, and a meeting without
+segments is never cached.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.segment_store import load_timeline
+
+
+class SegmentIntervalIndex:
+    """Segments of one meeting, queryable by time range"""
+
+    def __init__(self, segments: List[Dict[str, Any]]):
+        order = sorted(range(len(segments)), key=lambda i: segments[i]["start"])
+        self.segments = [segments[i] for i in order]
+        self.starts = np.array([s["start"] for s in self.segments], dtype=np.float64)
+        self.ends = np.array([s["end"] for s in self.segments], dtype=np.float64)
+        # Non-decreasing, so the first segment that can still reach t0 is a binary search away
+        self.max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def overlapping(self, t0: float, t1: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Segments overlapping [t0, t1], in start order
+
+        A segment overlaps when it starts before t1 and ends after t0, so
+        segments that only touch the window's edges are left out. With t1
+        omitted (or equal to t0), the segments playing at t0.
+        """
+        if t1 is None or t1 <= t0:
+            hi = int(np.searchsorted(self.starts, t0, side="right"))
+        else:
+            hi = int(np.searchsorted(self.starts, t1, side="left"))
+        lo = int(np.searchsorted(self.max_ends, t0, side="right"))
+        if lo >= hi:
+            return []
+        hits = np.nonzero(self.ends[lo:hi] > t0)[0] + lo
+        return [self.segments[i] for i in hits.tolist()]
+
+
+class SegmentIndexCache:
+    """LRU of SegmentIntervalIndex per meeting"""
+
+    def __init__(self, max_meetings: int):
+        self.max_meetings = max_meetings
+        self._indexes: "OrderedDict[str, SegmentIntervalIndex]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, meeting_id: str) -> Optional[SegmentIntervalIndex]:
+        index = self._indexes.get(meeting_id)
+        if index is None:
+            self.misses += 1
+            return None
+        self._indexes.move_to_end(meeting_id)
+        self.hits += 1
+        return index
+
+    def put(self, meeting_id: str, index: SegmentIntervalIndex):
+        if self.max_meetings <= 0:
+            return
+        self._indexes[meeting_id] = index
+        self._indexes.move_to_end(meeting_id)
+        while len(self._indexes) > self.max_meetings:
+            self._indexes.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "meetings": len(self._indexes),
+            "max_meetings": self.max_meetings,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+async def segment_index(db: AsyncSession, meeting_id: str) -> Optional[SegmentIntervalIndex]:
+    """
+    A meeting's interval index, from the cache or built from its stored timeline
+
+    Returns:
+        None when the meeting has no stored segments (not cached, so segments
+        stored later are picked up)
+    """
+    index = segment_index_cache.get(meeting_id)
+    if index is not None:
+        return index
+    segments = await db.run_sync(load_timeline, meeting_id)
+    if not segments:
+        return None
+    index = SegmentIntervalIndex(segments)
+    segment_index_cache.put(meeting_id, index)
+    return index
+
+
+# Global instance
+segment_index_cache = SegmentIndexCache(settings.SEGMENT_INDEX_CACHE_MEETINGS)
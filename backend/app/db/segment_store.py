@@ -0,0 +1,181 @@
+"""
+Transcript segment storage
+Whisper segments are written to meeting_segments in one round trip per
+meeting (COPY on Postgres via asyncpg or psycopg, executemany elsewhere)
+instead of one ORM object each. Optionally the whole timeline, segments plus word-level timestamps, is
+also packed column-wise into a single meeting_timelines row: little-endian
+float32 start/end arrays, per-segment word counts and one UTF-8 text blob.
+Loading a meeting's timeline is then one primary-key read and a few array
+decodes.
+"""
+
+import csv
+import io
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+from app.db.models import MeetingSegment, MeetingTimeline
+
+logger = logging.getLogger(__name__)
+
+# Separates segment and word texts in the timeline text blob; never appears in transcripts
+TEXT_SEPARATOR = "\x00"
+
+# Timestamps are stored as float32 (sub-millisecond up to ~4 hours) and read back at Whisper's precision
+TIME_DECIMALS = 2
+
+SEGMENT_COLUMNS = ("meeting_id", "seq", "start_time", "end_time", "text")
+
+# Explicitly little-endian so rows read back the same on any host
+TIME_DTYPE = np.dtype("<f4")
+COUNT_DTYPE = np.dtype("<u4")
+PROBABILITY_DTYPE = np.dtype("u1")
+
+
+def segment_rows(meeting_id: str, segments: Optional[list]) -> List[Dict[str, Any]]:
+    """meeting_segments rows for Whisper segments, skipping empty ones"""
+    return [{
+        "meeting_id": meeting_id,
+        "seq": i,
+        "start_time": float(s["start"]),
+        "end_time": float(s["end"]),
+        "text": s["text"].strip()
+    } for i, s in enumerate(segments or []) if s.get("text", "").strip()]
+
+
+def bulk_insert_segments(db: Session, rows: List[Dict[str, Any]]):
+    """Insert meeting_segments rows in the session's transaction with one statement"""
+    if not rows:
+        return
+    conn = db.connection()
+    if conn.dialect.name == "postgresql" and _copy_segments(conn, rows):
+        return
+    db.execute(insert(MeetingSegment), rows)
+
+
+def _copy_segments(conn, rows: List[Dict[str, Any]]) -> bool:
+    """COPY rows in through the raw driver connection; False when the driver has no COPY support"""
+    driver_conn = conn.connection.driver_connection
+    if hasattr(driver_conn, "copy_records_to_table"):
+        # asyncpg, reached through AsyncSession.run_sync: binary COPY, awaited on the session's greenlet
+        await_only(driver_conn.copy_records_to_table(
+            "meeting_segments", records=[tuple(row[c] for c in SEGMENT_COLUMNS) for row in rows],
+            columns=list(SEGMENT_COLUMNS)
+        ))
+        return True
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([row[c] for c in SEGMENT_COLUMNS])
+    statement = f"COPY meeting_segments ({', '.join(SEGMENT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+    with driver_conn.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(statement, io.StringIO(buffer.getvalue()))
+            return True
+        if hasattr(cursor, "copy"):  # psycopg 3
+            with cursor.copy(statement) as copy:
+                copy.write(buffer.getvalue())
+            return True
+    return False
+
+
+def _times(data: bytes) -> list:
+    """float32 seconds from a packed column, rounded to Whisper's precision"""
+    return np.frombuffer(data, dtype=TIME_DTYPE).astype(np.float64).round(TIME_DECIMALS).tolist()
+
+
+def pack_timeline(meeting_id: str, segments: Optional[list]) -> MeetingTimeline:
+    """
+    One MeetingTimeline row for a meeting's Whisper segments and their words
+
+    Args:
+        meeting_id: Meeting the timeline belongs to
+        segments: Whisper segments ({start, end, text, words: [{start, end, word, probability}]})
+
+    Returns:
+        Unsaved MeetingTimeline
+    """
+    segments = [s for s in segments or [] if s.get("text", "").strip()]
+    words = [w for s in segments for w in s.get("words") or []]
+    texts = [s["text"].strip() for s in segments] + [w["word"] for w in words]
+    probabilities = np.clip(np.rint(np.array([w.get("probability", 0.0) for w in words]) * 255), 0, 255)
+    return MeetingTimeline(
+        meeting_id=meeting_id,
+        segment_count=len(segments),
+        word_count=len(words),
+        segment_starts=np.array([s["start"] for s in segments], dtype=TIME_DTYPE).tobytes(),
+        segment_ends=np.array([s["end"] for s in segments], dtype=TIME_DTYPE).tobytes(),
+        segment_word_counts=np.array([len(s.get("words") or []) for s in segments], dtype=COUNT_DTYPE).tobytes(),
+        word_starts=np.array([w["start"] for w in words], dtype=TIME_DTYPE).tobytes(),
+        word_ends=np.array([w["end"] for w in words], dtype=TIME_DTYPE).tobytes(),
+        word_probabilities=probabilities.astype(PROBABILITY_DTYPE).tobytes(),
+        text=TEXT_SEPARATOR.join(t.replace(TEXT_SEPARATOR, "") for t in texts).encode("utf-8")
+    )
+
+
+def unpack_timeline(timeline: MeetingTimeline) -> List[Dict[str, Any]]:
+    """Whisper-shaped segments, each with its words, from a MeetingTimeline row"""
+    segment_count, word_count = timeline.segment_count, timeline.word_count
+    if not segment_count:
+        return []
+    texts = timeline.text.decode("utf-8").split(TEXT_SEPARATOR)
+    starts, ends = _times(timeline.segment_starts), _times(timeline.segment_ends)
+    word_counts = np.frombuffer(timeline.segment_word_counts, dtype=COUNT_DTYPE).tolist()
+    word_starts, word_ends = _times(timeline.word_starts), _times(timeline.word_ends)
+    probabilities = (np.frombuffer(timeline.word_probabilities, dtype=PROBABILITY_DTYPE) / 255).round(3).tolist()
+    words = [
+        {"start": start, "end": end, "word": word, "probability": probability}
+        for start, end, word, probability in zip(
+            word_starts, word_ends, texts[segment_count:segment_count + word_count], probabilities
+        )
+    ]
+
+    segments = []
+    w = 0
+    for start, end, text, n in zip(starts, ends, texts, word_counts):
+        segments.append({"start": start, "end": end, "text": text, "words": words[w:w + n]})
+        w += n
+    return segments
+
+
+def store_segments(db: Session, meeting_id: str, segments: Optional[list]) -> List[Dict[str, Any]]:
+    """
+    Persist a meeting's segments in the session's transaction (the caller commits)
+
+    Rows go into meeting_segments with one bulk statement; with
+    SEGMENT_TIMELINE_ENABLED the segments and their word timestamps are also
+    packed into the meeting's meeting_timelines row, replacing any earlier one.
+
+    Returns:
+        The meeting_segments rows written
+    """
+    rows = segment_rows(meeting_id, segments)
+    bulk_insert_segments(db, rows)
+    if settings.SEGMENT_TIMELINE_ENABLED and rows:
+        db.merge(pack_timeline(meeting_id, segments))
+    return rows
+
+
+def load_timeline(db: Session, meeting_id: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    A meeting's segments with word timestamps
+
+    Reads the packed timeline row when there is one, else falls back to the
+    meeting_segments rows (no words). None when the meeting has neither.
+    """
+    timeline = db.get(MeetingTimeline, meeting_id)
+    if timeline is not None:
+        return unpack_timeline(timeline)
+    rows = db.query(MeetingSegment).filter(
+        MeetingSegment.meeting_id == meeting_id
+    ).order_by(MeetingSegment.seq).all()
+    if not rows:
+        return None
+    return [{"start": r.start_time, "end": r.end_time, "text": r.text, "words": []} for r in rows]
@@ -0,0 +1,118 @@
+"""
+Compressed column types
+Transcripts and packed timeline text are stored as zstd frames
+(STORAGE_COMPRESSION), typically 4-8x smaller than the raw text. Values that
+don't start with the zstd frame header, i.e. rows written before compression
+or too short to be worth it, are read back unchanged, so old and new rows mix
+freely and the backfill migration (005) can run while the service is up.
+Compression happens in Python, so full-text search indexing, which reads the
+decompressed attribute, is unaffected.
+"""
+
+import io
+import threading
+from typing import Optional, Union
+
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.config import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Every zstd frame starts with these bytes; UTF-8 text never does (0xB5 can't follow '(')
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# zstandard compressor/decompressor objects must not be shared between threads
+_local = threading.local()
+
+
+def compression_enabled() -> bool:
+    return settings.STORAGE_COMPRESSION == "zstd" and zstandard is not None
+
+
+def _compressor():
+    if not hasattr(_local, "compressor"):
+        _local.compressor = zstandard.ZstdCompressor(level=settings.STORAGE_COMPRESSION_LEVEL)
+    return _local.compressor
+
+
+def _decompressor():
+    if not hasattr(_local, "decompressor"):
+        _local.decompressor = zstandard.ZstdDecompressor()
+    return _local.decompressor
+
+
+def is_compressed(data: Union[bytes, memoryview, str, None]) -> bool:
+    return isinstance(data, (bytes, memoryview)) and bytes(data[:4]) == ZSTD_MAGIC
+
+
+def compress(data: bytes) -> bytes:
+    """zstd frame for `data`, or `data` itself when compression is off or it is too short to gain"""
+    if not compression_enabled() or len(data) < settings.STORAGE_COMPRESSION_MIN_BYTES:
+        return data
+    return _compressor().compress(data)
+
+
+def decompress(data: Union[bytes, memoryview, str]) -> bytes:
+    """Original bytes of a stored value, compressed or not (legacy SQLite TEXT values come back as str)"""
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    if not is_compressed(data):
+        return bytes(data)
+    if zstandard is None:
+        raise RuntimeError("Stored value is zstd-compressed but the zstandard package is not installed")
+    return _decompressor().decompress(bytes(data))
+
+
+def text_prefix(data: Union[bytes, memoryview, str, None], chars: int) -> Optional[str]:
+    """
+    First `chars` characters of a stored text value, decompressing only
+    as much of the frame as needed (for list previews)
+    """
+    if data is None:
+        return None
+    if not is_compressed(data):
+        return decompress(data).decode("utf-8")[:chars]
+    if zstandard is None:
+        raise RuntimeError("Stored value is zstd-compressed but the zstandard package is not installed")
+    # At most 4 UTF-8 bytes per character; a character cut at the end is dropped
+    with _decompressor().stream_reader(io.BytesIO(bytes(data))) as reader:
+        head = reader.read(chars * 4)
+    return head.decode("utf-8", errors="ignore")[:chars]
+
+
+class CompressedText(TypeDecorator):
+    """Text stored as a zstd-compressed UTF-8 blob"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(value.encode("utf-8"))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress(value).decode("utf-8")
+
+
+class CompressedBinary(TypeDecorator):
+    """Bytes stored as a zstd frame"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress(bytes(value))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return decompress(value)
@@ -3,17 +3,23 @@ MeetNote Backend - FastAPI Application
 Audio transcription with Whisper AI and summarization with OpenRouter
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import json
 import logging
 from typing import List, Optional
 import os
 
+from app.core.compression import ResponseCompressionMiddleware
 from app.core.config import settings
-from app.api import transcription
-from supabase import create_client, Client
+from app.core.websocket_manager import ConnectionManager
+from app.api import transcription, uploads, summaries, highlights
+from app.services.job_queue import job_queue
+from app.services import write_behind
+from app.services.streaming import create_decoder, words_message
 
 # Configure logging
 logging.basicConfig(
@@ -24,12 +30,19 @@ logger = logging.getLogger(__name__)
 
 USE_PRODUCTION_WHISPER = settings.ENVIRONMENT.lower() == "production"
 
+# Live transcription connections
+manager = ConnectionManager()
 
-from app.db.database import SessionLocal, engine, Base
-from app.db.models import Meeting
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+from app.db.database import async_engine, engine, Base, get_async_db
+from app.db.models import Meeting, MeetingSegment
+from app.db.pagination import InvalidCursorError, keyset_page_async, normalize_sqlite_timestamps
+from app.db.search import search_index
+from app.db.segment_index import SegmentIntervalIndex, segment_index
+from app.db.segment_store import pack_timeline, unpack_timeline
+from app.db.types import text_prefix
+from sqlalchemy import LargeBinary, case, func, inspect, null, select, text, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -38,15 +51,49 @@ async def lifespan(app: FastAPI):
     logger.info("Starting MeetNote Backend...")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     
+    # Create tables
+    Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist; add indexes introduced since
+    for table in (Meeting.__table__, MeetingSegment.__table__):
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    # ... and columns (migration 005 adds and backfills this one; older rows are previewed on read)
+    if "transcript_preview" not in {c["name"] for c in inspect(engine).get_columns("meetings")}:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE meetings ADD COLUMN transcript_preview TEXT"))
+    # ... and timestamps stored with microseconds before SQLITE_TIMESTAMP (migration 002 does the same)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            normalized = normalize_sqlite_timestamps(conn)
+        if normalized:
+            logger.info(f"Normalized created_at of {normalized} meetings to second precision")
+    search_index.setup()
+    
     if USE_PRODUCTION_WHISPER:
-        logger.info("✅ Backend ready with production Whisper pipeline")
+        # Bind the server now; /api/health/ready reports when the model is warm
+        transcription.production_whisper.start_loading()
+        logger.info("⏳ Backend accepting requests, loading production Whisper model in the background")
     else:
         logger.info("✅ Backend ready with mock transcription")
     
+    # Opened here rather than at import, so importing the app never touches the journal file
+    meeting_write_behind = write_behind.init_write_behind()
+    if meeting_write_behind:
+        await meeting_write_behind.start(transcription.write_meetings)
+    await transcription.sweep_job_audio()
+    await job_queue.start(transcription.process_transcription_job)
+    
     yield
     
     # Shutdown
     logger.info("Shutting down MeetNote Backend...")
+    await job_queue.stop()
+    await summaries.ai_service.close()
+    if meeting_write_behind:
+        await meeting_write_behind.stop(settings.WRITE_BEHIND_DRAIN_TIMEOUT_S)
+    await async_engine.dispose()
+    if USE_PRODUCTION_WHISPER:
+        transcription.production_whisper.shutdown()
 
 
 # Create FastAPI app
@@ -74,6 +121,14 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        ResponseCompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_BROTLI_QUALITY
+    )
+
 
 # Health Check
 @app.get("/")
@@ -98,43 +153,291 @@ async def health_check():
     }
 
 
+@app.get("/api/health/live")
+async def liveness_check():
+    """Liveness: the process is up and serving HTTP (does not wait for the model)"""
+    return {"status": "alive"}
+
+
+@app.get("/api/health/ready")
+async def readiness_check():
+    """Readiness: 200 once the Whisper model is warm, 503 while loading or after a failed load"""
+    if not USE_PRODUCTION_WHISPER:
+        return {"status": "ready", "whisper": "mock"}
+    
+    service = transcription.production_whisper
+    status = service.load_status()
+    return JSONResponse(
+        status_code=200 if status == "ready" else 503,
+        content={
+            "status": status,
+            "whisper": "production",
+            "model": settings.WHISPER_MODEL,
+            "error": service.load_error
+        }
+    )
+
+
 # Include routers
 app.include_router(transcription.router, prefix="/api/transcription", tags=["Transcription"])
+app.include_router(uploads.router, prefix="/api/uploads", tags=["Uploads"])
+app.include_router(summaries.router, prefix="/api/summaries", tags=["Summaries"])
+app.include_router(highlights.router, prefix="/api/meetings", tags=["Highlights"])
+
+# Columns the meeting list returns; transcript and summary bodies are only previewed
+MEETING_LIST_COLUMNS = (
+    Meeting.id, Meeting.title, Meeting.duration, Meeting.language,
+    Meeting.confidence, Meeting.audio_format, Meeting.created_at
+)
+
+
+def meeting_detail(m: Meeting) -> dict:
+    """Full meeting record, including transcript and summary"""
+    return {
+        "id": m.id,
+        "title": m.title,
+        "transcript": m.transcript,
+        "summary": m.summary,
+        "key_points": m.key_points or [],
+        "action_items": m.action_items or [],
+        "duration": m.duration,
+        "language": m.language,
+        "confidence": m.confidence,
+        "audio_format": m.audio_format,
+        "created_at": m.created_at.isoformat() if m.created_at else None
+    }
+
 
 @app.get("/api/meetings")
-async def get_meetings():
-    """Get all meetings from Database"""
-    db = SessionLocal()
+async def get_meetings(view: str = Query("list", pattern="^(list|full)$"),
+                       limit: int = Query(settings.MEETING_LIST_DEFAULT_LIMIT, ge=1, le=settings.MEETING_LIST_MAX_LIMIT),
+                       cursor: Optional[str] = None,
+                       db: AsyncSession = Depends(get_async_db)):
+    """
+    List meetings, newest first, one keyset page at a time
+    
+    `view=list` (default) selects metadata columns plus the first
+    MEETING_PREVIEW_CHARS of the transcript and summary, so the payload does
+    not grow with transcript length; full text comes from
+    GET /api/meetings/{id}. `view=full` returns complete records for older clients.
+    
+    Pass `next_cursor` from the response as `cursor` for the next page; every
+    page costs the same index seek however deep it is. `total` is only counted
+    on the first page.
+    """
     try:
-        meetings = db.query(Meeting).order_by(Meeting.created_at.desc()).all()
+        total = (await db.execute(select(func.count(Meeting.id)))).scalar() if cursor is None else None
+        if view == "full":
+            meetings, next_cursor = await keyset_page_async(
+                db, select(Meeting), Meeting.created_at, Meeting.id, cursor, limit, scalars=True
+            )
+            return {"meetings": [meeting_detail(m) for m in meetings], "total": total, "next_cursor": next_cursor}
+        
+        preview = settings.MEETING_PREVIEW_CHARS
+        stmt = select(
+            *MEETING_LIST_COLUMNS,
+            func.substr(Meeting.transcript_preview, 1, preview).label("transcript_preview"),
+            # Rows stored before transcript_preview existed: their compressed transcript, decompressed
+            # only as far as the preview below (NULL, so not transferred, for every other row)
+            case(
+                (Meeting.transcript_preview.is_(None), type_coerce(Meeting.transcript, LargeBinary)),
+                else_=null()
+            ).label("transcript_stored"),
+            func.substr(Meeting.summary, 1, preview).label("summary_preview")
+        )
+        rows, next_cursor = await keyset_page_async(db, stmt, Meeting.created_at, Meeting.id, cursor, limit)
         
-        # Convert to dicts for JSON serialization
         meetings_list = [{
-            "id": m.id,
-            "title": m.title,
-            "transcript": m.transcript,
-            "summary": m.summary,
-            "duration": m.duration,
-            "language": m.language,
-            "confidence": m.confidence,
-            "audio_format": m.audio_format,
-            "created_at": m.created_at.isoformat()
-        } for m in meetings]
+            "id": r.id,
+            "title": r.title,
+            "transcript_preview": r.transcript_preview if r.transcript_stored is None else text_prefix(r.transcript_stored, preview),
+            "summary_preview": r.summary_preview,
+            "duration": r.duration,
+            "language": r.language,
+            "confidence": r.confidence,
+            "audio_format": r.audio_format,
+            "created_at": r.created_at.isoformat() if r.created_at else None
+        } for r in rows]
         
-        return {"meetings": meetings_list, "total": len(meetings_list)}
+        return {"meetings": meetings_list, "total": total, "next_cursor": next_cursor}
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch meetings: {e}")
-        return {"meetings": [], "total": 0}
-    finally:
-        db.close()
+        return {"meetings": [], "total": 0, "next_cursor": None}
 
 
-# WebSocket endpoint for real-time transcription (disabled for lightweight deployment)
-# @app.websocket("/ws/{client_id}")
-# async def websocket_endpoint(websocket: WebSocket, client_id: str):
-#     """WebSocket connection for real-time audio streaming and transcription"""
-#     # Disabled for lightweight deployment - use HTTP endpoints instead
-#     pass
+@app.get("/api/meetings/search")
+async def search_meetings(q: str = Query(..., min_length=1, max_length=500),
+                          limit: int = Query(20, ge=1, le=100),
+                          segments: int = Query(3, ge=0, le=20),
+                          db: AsyncSession = Depends(get_async_db)):
+    """
+    Full-text search over meeting titles, summaries and transcripts
+    
+    Results are ranked best first with a highlighted snippet (HTML-escaped,
+    matches wrapped in <mark>) and up to `segments` matching transcript
+    segments per meeting, each with its start/end time in the recording.
+    """
+    try:
+        results = await db.run_sync(search_index.search, q, limit, segments)
+        return {"query": q, "backend": search_index.name, "results": results}
+    except Exception as e:
+        logger.error(f"Meeting search failed: {e}")
+        raise HTTPException(status_code=500, detail="Search failed")
+
+
+@app.get("/api/meetings/{meeting_id}")
+async def get_meeting(meeting_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get one meeting with its full transcript, summary, key points and action items"""
+    meeting = await db.get(Meeting, meeting_id)
+    if not meeting:
+        # Transcribed moments ago and not yet flushed from the write-behind journal
+        record = await transcription.pending_meeting(meeting_id)
+        if not record:
+            raise HTTPException(status_code=404, detail="Meeting not found")
+        meeting = transcription.meeting_from_record(record)
+    return meeting_detail(meeting)
+
+
+@app.get("/api/meetings/{meeting_id}/timeline")
+async def get_meeting_timeline(meeting_id: str, db: AsyncSession = Depends(get_async_db)):
+    """
+    A meeting's transcript segments in order, each with start/end times and
+    its word-level timestamps (empty for meetings stored without words)
+    """
+    index = await meeting_segment_index(db, meeting_id)
+    return {"meeting_id": meeting_id, "segments": index.segments}
+
+
+@app.get("/api/meetings/{meeting_id}/transcript")
+async def get_meeting_transcript_range(meeting_id: str,
+                                       from_s: float = Query(0.0, alias="from", ge=0),
+                                       to_s: Optional[float] = Query(None, alias="to", ge=0),
+                                       db: AsyncSession = Depends(get_async_db)):
+    """
+    Transcript segments overlapping [from, to] seconds, with their word
+    timestamps, from the meeting's in-memory interval index
+
+    Segments that only touch the window's edges are left out; without `to`,
+    the segments playing at `from`.
+    """
+    if to_s is not None and to_s < from_s:
+        raise HTTPException(status_code=400, detail="'to' must not be before 'from'")
+    index = await meeting_segment_index(db, meeting_id)
+    return {"meeting_id": meeting_id, "from": from_s, "to": to_s, "segments": index.overlapping(from_s, to_s)}
+
+
+async def meeting_segment_index(db: AsyncSession, meeting_id: str) -> SegmentIntervalIndex:
+    """A meeting's segment interval index (empty for meetings without segments); 404 for unknown meetings"""
+    index = await segment_index(db, meeting_id)
+    if index is not None:
+        return index
+    if (await db.execute(select(Meeting.id).where(Meeting.id == meeting_id))).first() is not None:
+        return SegmentIntervalIndex([])
+    # Transcribed moments ago and not yet flushed from the write-behind journal
+    record = await transcription.pending_meeting(meeting_id)
+    if not record:
+        raise HTTPException(status_code=404, detail="Meeting not found")
+    return SegmentIntervalIndex(unpack_timeline(pack_timeline(meeting_id, record.get("segments"))))
+
+
+# WebSocket endpoint for real-time transcription
+@app.websocket("/ws/{client_id}")
+async def websocket_endpoint(websocket: WebSocket, client_id: str,
+                             format: str = "pcm_s16le", sample_rate: int = 16000,
+                             language: Optional[str] = None):
+    """
+    WebSocket connection for real-time audio streaming and transcription
+    
+    Clients send binary audio frames (`format`: pcm_s16le, pcm_f32le, webm or
+    ogg) and a text `{"type": "stop"}` when done. The server answers with
+    `partial` messages for the unstable tail, `final` messages for committed
+    words, and a closing `done` with the full transcript.
+    """
+    if not USE_PRODUCTION_WHISPER or not transcription.production_whisper.model_loaded:
+        loading = USE_PRODUCTION_WHISPER and transcription.production_whisper.load_status() == "loading"
+        await websocket.accept()
+        await websocket.send_json({
+            "type": "error",
+            "message": "Whisper model is still loading, try again shortly" if loading
+            else "Real-time transcription requires the production Whisper pipeline"
+        })
+        # 1013 (try again later) while warming up, 1011 when it will not become available
+        await websocket.close(code=1013 if loading else 1011)
+        return
+    if manager.get_connection_count() >= settings.STREAM_MAX_SESSIONS:
+        await websocket.accept()
+        await websocket.send_json({"type": "error", "message": "Too many live sessions, try again later"})
+        await websocket.close(code=1013)
+        return
+    
+    service = transcription.production_whisper
+    try:
+        decoder = create_decoder(format, sample_rate, settings.SAMPLE_RATE)
+    except ValueError as e:
+        await websocket.accept()
+        await websocket.send_json({"type": "error", "message": str(e)})
+        await websocket.close(code=1003)
+        return
+    
+    session = service.create_stream_session(language)
+    await manager.connect(websocket, client_id)
+    await manager.send_personal_message(
+        {"type": "ready", "format": format, "sample_rate": settings.SAMPLE_RATE}, client_id
+    )
+    
+    async def send_update(update):
+        if update["committed"]:
+            await manager.send_personal_message(words_message("final", update["committed"]), client_id)
+        await manager.send_personal_message(words_message("partial", update["partial"]), client_id)
+    
+    stopping = False
+    idle = True
+    
+    async def transcribe_loop():
+        nonlocal idle
+        while not stopping:
+            idle = True
+            await session.wait_for_audio()
+            idle = False
+            await send_update(await session.process())
+    
+    processor = asyncio.create_task(transcribe_loop())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes"):
+                session.append(await decoder.feed(message["bytes"]))
+            elif message.get("text") and json.loads(message["text"]).get("type") == "stop":
+                # Let a pass in progress deliver its messages, then flush the rest
+                stopping = True
+                if idle:
+                    processor.cancel()
+                await asyncio.gather(processor, return_exceptions=True)
+                session.append(await decoder.close())
+                final_words = await session.finish()
+                if final_words:
+                    await manager.send_personal_message(words_message("final", final_words), client_id)
+                await manager.send_personal_message({
+                    "type": "done",
+                    "text": session.text(),
+                    "duration": round(session.duration, 2),
+                    "language": session.language
+                }, client_id)
+                break
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Live transcription error for {client_id}: {e}")
+        await manager.send_personal_message({"type": "error", "message": str(e)}, client_id)
+    finally:
+        processor.cancel()
+        await decoder.close()
+        manager.disconnect(client_id)
+        logger.info(f"🎙️ Live session {client_id}: {session.duration:.1f}s audio, {session.iterations} passes")
 
 
 # Error handlers
@@ -142,7 +445,8 @@ async def get_meetings():
 async def http_exception_handler(request, exc):
     return JSONResponse(
         status_code=exc.status_code,
-        content={"detail": exc.detail}
+        content={"detail": exc.detail},
+        headers=exc.headers  # e.g. Retry-After on 503s
     )
 
 
@@ -1,112 +1,464 @@
 """
 AI Service for meeting summarization using OpenRouter (Mistral 7B)
+
+Transcripts that fit in one window are summarized with a single call. Longer
+ones are map-reduced: the transcript is cut into token-budgeted windows along
+segment boundaries, the windows are summarized concurrently, and the partial
+summaries are combined (recursively, if they are themselves too long).
+
+Results are cached on the normalized transcript, model and prompt version, so
+re-processing the same transcript costs no tokens.
 """
 
-import httpx
+import asyncio
+import json
 import logging
-from typing import List, Dict, Any, Optional
+import unicodedata
+from typing import List, Dict, Any, Optional, Tuple, Callable, Awaitable, AsyncIterator
 
 from app.core.config import settings
+from app.services.cache import TieredCache, content_key
+from app.services.extractive_summary import extractive_summarizer
+from app.services.llm_backends import (
+    BACKEND_EXTRACTIVE, BACKEND_LLM, CHARS_PER_TOKEN, SummaryBackend, build_backends, estimate_tokens
+)
+from app.services.summary_stream import SummaryStreamParser
 
 logger = logging.getLogger(__name__)
 
+# Bump when a prompt below changes, so cached results from the old prompt are not reused
+SUMMARY_PROMPT_VERSION = "1"
+HIGHLIGHT_PROMPT_VERSION = "1"
+
+DEFAULT_HIGHLIGHT_DESCRIPTION = "Highlight from meeting"
+
+# On-box engines used without an API key, when the LLM fails, and as a draft while it runs
+FALLBACK_ENGINES = {"extractive": extractive_summarizer, "none": None}
+
+SUMMARY_PROMPT = """You are an AI assistant specialized in analyzing meeting transcripts. Analyze the following meeting transcript and provide:
+
+1. A concise summary (2-3 sentences)
+2. Key points discussed (bullet points)
+3. Action items and decisions (if any)
+
+Format your response as JSON with keys: summary, key_points (array), action_items (array)
+
+Transcript:
+{transcript}
+
+Response:"""
+
+WINDOW_PROMPT = """You are an AI assistant specialized in analyzing meeting transcripts. The following is part {part} of {total} of a longer meeting transcript{span}. Summarize only this part:
+
+1. What was discussed (2-4 sentences)
+2. Key points discussed (bullet points)
+3. Action items and decisions made in this part (if any)
+
+Format your response as JSON with keys: summary, key_points (array), action_items (array)
+
+Transcript part:
+{transcript}
+
+Response:"""
+
+REDUCE_PROMPT = """You are an AI assistant specialized in analyzing meeting transcripts. A long meeting was summarized in consecutive parts. Combine the part summaries below into one summary of the whole meeting:
+
+1. A concise summary (2-3 sentences)
+2. Key points discussed (bullet points, merge duplicates)
+3. Action items and decisions (keep every distinct one)
+
+Format your response as JSON with keys: summary, key_points (array), action_items (array)
+
+Part summaries:
+{parts}
+
+Response:"""
+
+HIGHLIGHT_BATCH_PROMPT = """Summarize each numbered meeting excerpt below in one concise sentence.
+
+{excerpts}
+
+Respond with only a JSON object mapping each excerpt number to its sentence, for example {{"1": "...", "2": "..."}}."""
+
+
+def normalize_transcript(text: str) -> str:
+    """Canonical form for cache keys: NFC, whitespace collapsed"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    seconds = int(seconds or 0)
+    return f"{seconds // 3600:d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def split_transcript(transcript: str, segments: Optional[List[Dict[str, Any]]],
+                     window_tokens: int) -> List[Tuple[Optional[float], Optional[float], str]]:
+    """
+    Cut a transcript into windows of at most `window_tokens` estimated tokens
+
+    Windows follow segment boundaries when segments (with start/end times) are
+    given; a single segment longer than the budget, or a transcript without
+    segments, is split on word boundaries.
+
+    Returns:
+        List of (start, end, text); start/end are None without segments
+    """
+    pieces = [(s.get("start"), s.get("end"), s["text"].strip()) for s in segments or [] if s.get("text")]
+    if not pieces:
+        pieces = [(None, None, transcript.strip())]
+
+    max_chars = window_tokens * CHARS_PER_TOKEN
+    windows = []
+    current: List[Tuple[Optional[float], Optional[float], str]] = []
+    current_chars = 0
+
+    def close_window():
+        nonlocal current, current_chars
+        if current:
+            windows.append((current[0][0], current[-1][1], " ".join(p[2] for p in current)))
+        current, current_chars = [], 0
+
+    for start, end, text in pieces:
+        while len(text) > max_chars:
+            # Oversized piece: fill the open window, then cut at the last space
+            cut = text.rfind(" ", 0, max_chars - current_chars)
+            if cut <= 0:
+                if current:
+                    close_window()
+                    continue
+                cut = max_chars
+            current.append((start, end, text[:cut]))
+            close_window()
+            text = text[cut:].strip()
+        if current and current_chars + len(text) + 1 > max_chars:
+            close_window()
+        if text:
+            current.append((start, end, text))
+            current_chars += len(text) + 1
+    close_window()
+    return windows
+
 
 class AIService:
-    """Service for AI-powered meeting analysis using OpenRouter"""
+    """Service for AI-powered meeting analysis over pluggable summary backends (see llm_backends)"""
     
     def __init__(self):
-        self.api_key = settings.OPENROUTER_API_KEY
-        self.base_url = settings.OPENROUTER_BASE_URL
-        self.model = settings.OPENROUTER_MODEL
-        self.client = httpx.AsyncClient(timeout=60.0)
+        self.backends: Dict[str, SummaryBackend] = build_backends(settings)
+        self.latency_budget_s = settings.SUMMARY_LATENCY_BUDGET_S
+        self.fallback_engine = FALLBACK_ENGINES.get(settings.SUMMARY_FALLBACK_ENGINE, extractive_summarizer)
+        self.cache = TieredCache(
+            "summaries",
+            memory_max_bytes=settings.SUMMARY_CACHE_MEMORY_MB * 1024 * 1024,
+            disk_path=settings.SUMMARY_CACHE_PATH or None,
+            disk_max_bytes=settings.SUMMARY_CACHE_DISK_MB * 1024 * 1024,
+            ttl_seconds=settings.SUMMARY_CACHE_TTL_HOURS * 3600
+        ) if settings.SUMMARY_CACHE_ENABLED else None
+        # Cache key -> task, so concurrent requests for the same result share one LLM call
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+    
+    def plan(self, transcript: str, latency_budget_s: Optional[float] = None) -> List[SummaryBackend]:
+        """
+        Available backends to try for a transcript, best first
+        
+        Without a latency budget this is SUMMARY_BACKENDS order. With one,
+        backends expected to finish within it keep that order and the rest
+        follow, fastest first.
+        """
+        budget = self.latency_budget_s if latency_budget_s is None else latency_budget_s
+        candidates = [b for b in self.backends.values() if b.available()]
+        if budget and budget > 0:
+            tokens = estimate_tokens(transcript)
+            fitting = [b for b in candidates if b.estimate_s(tokens) <= budget]
+            slower = sorted((b for b in candidates if b not in fitting), key=lambda b: b.estimate_s(tokens))
+            candidates = fitting + slower
+        return candidates
+    
+    def _llm_backend(self) -> Optional[SummaryBackend]:
+        """Preferred available LLM backend, for calls too small to plan (highlights)"""
+        return next((b for b in self.plan("", 0) if b.kind == BACKEND_LLM), None)
+    
+    def _summary_key(self, backend: SummaryBackend, transcript: str) -> str:
+        return content_key(
+            "summary", SUMMARY_PROMPT_VERSION, backend.model, backend.window_tokens,
+            normalize_transcript(transcript)
+        )
     
-    async def summarize_transcript(self, transcript: str) -> Dict[str, Any]:
+    async def summarize_transcript(self, transcript: str,
+                                   segments: Optional[List[Dict[str, Any]]] = None,
+                                   latency_budget_s: Optional[float] = None) -> Dict[str, Any]:
         """
         Generate a summary of the meeting transcript
         
+        Backends are tried in plan() order; an LLM backend that fails hands
+        over to the next one, so a local model server or the extractive
+        summarizer takes over during a provider outage.
+        
         Args:
             transcript: Full meeting transcript
+            segments: Transcript segments with start/end times; used to split
+                long transcripts on segment boundaries
+            latency_budget_s: Seconds the caller is willing to wait
+                (default SUMMARY_LATENCY_BUDGET_S)
         
         Returns:
-            Dictionary with summary, key points, and action items
+            Dictionary with summary, key points, action items and the `engine` that produced them
         """
-        if not self.api_key:
-            logger.warning("OpenRouter API key not configured, skipping AI summarization")
-            return {
-                "summary": "AI summarization not configured",
-                "key_points": [],
-                "action_items": []
-            }
+        plan = self.plan(transcript, latency_budget_s)
+        if not any(b.kind == BACKEND_LLM for b in plan):
+            logger.warning("No LLM backend configured or available, skipping AI summarization")
         
+        for backend in plan:
+            if backend.kind == BACKEND_EXTRACTIVE:
+                draft = await self._draft(transcript, segments, backend.engine)
+                if draft is not None:
+                    return draft
+                continue
+            try:
+                return await self._cached(
+                    self._summary_key(backend, transcript),
+                    lambda backend=backend: self._summarize(transcript, segments, backend)
+                )
+            except Exception as e:
+                logger.error(f"AI summarization error ({backend.name}): {str(e)}")
+        
+        placeholder = "Could not generate AI summary" if plan else "AI summarization not configured"
+        return await self._fallback(transcript, segments, placeholder)
+    
+    async def _fallback(self, transcript: str, segments: Optional[List[Dict[str, Any]]],
+                        placeholder: str) -> Dict[str, Any]:
+        """The on-box engine's summary (tagged with its `engine`), or the placeholder without one"""
+        draft = await self._draft(transcript, segments)
+        if draft is not None:
+            return draft
+        return {
+            "summary": placeholder,
+            "key_points": [],
+            "action_items": []
+        }
+    
+    async def _draft(self, transcript: str, segments: Optional[List[Dict[str, Any]]],
+                     engine=None) -> Optional[Dict[str, Any]]:
+        """Summary from an on-box engine (default SUMMARY_FALLBACK_ENGINE), None without one or on failure"""
+        engine = engine if engine is not None else self.fallback_engine
+        if engine is None or not transcript.strip():
+            return None
         try:
-            prompt = f"""You are an AI assistant specialized in analyzing meeting transcripts. Analyze the following meeting transcript and provide:
-
-1. A concise summary (2-3 sentences)
-2. Key points discussed (bullet points)
-3. Action items and decisions (if any)
-
-Format your response as JSON with keys: summary, key_points (array), action_items (array)
-
-Transcript:
-{transcript}
-
-Response:"""
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "https://meetnoteapp.netlify.app",
-                "X-Title": "MeetNote"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.7,
-                "max_tokens": 1000
-            }
-            
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json=payload,
-                headers=headers
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract AI response
-            ai_response = data["choices"][0]["message"]["content"]
-            
-            # Try to parse JSON response
-            import json
+            result = await asyncio.to_thread(engine.summarize, transcript, segments)
+        except Exception as e:
+            logger.error(f"Fallback summary error: {str(e)}")
+            return None
+        if not result["summary"]:
+            return None
+        return {**result, "engine": engine.name}
+    
+    async def _summarize(self, transcript: str, segments: Optional[List[Dict[str, Any]]],
+                         backend: SummaryBackend) -> Dict[str, Any]:
+        prompt = await self._final_prompt(transcript, segments, backend)
+        result = await self._summarize_prompt(prompt, backend)
+        logger.info(f"Successfully generated meeting summary with {backend.name}")
+        return {**result, "engine": backend.name}
+    
+    async def _final_prompt(self, transcript: str, segments: Optional[List[Dict[str, Any]]],
+                            backend: SummaryBackend,
+                            progress: Optional[Callable[[int, int], Awaitable[None]]] = None) -> str:
+        """
+        The prompt whose answer is the meeting summary
+        
+        For a transcript that fits one window that is the summary prompt itself;
+        otherwise the windows are summarized (map) and the result is the prompt
+        combining them (reduce).
+        
+        Args:
+            progress: Awaited with (windows done, total windows) during the map phase
+        """
+        windows = split_transcript(transcript, segments, backend.window_tokens)
+        if len(windows) <= 1:
+            return SUMMARY_PROMPT.format(transcript=transcript)
+        
+        logger.info(f"📚 Transcript too long for one call, summarizing {len(windows)} windows")
+        done = 0
+        
+        async def summarize_window(i: int, start: Optional[float], end: Optional[float], text: str):
+            nonlocal done
+            partial = await self._summarize_prompt(WINDOW_PROMPT.format(
+                part=i + 1,
+                total=len(windows),
+                span=f" ({_format_time(start)}-{_format_time(end)})" if start is not None else "",
+                transcript=text
+            ), backend)
+            done += 1
+            if progress:
+                await progress(done, len(windows))
+            return partial
+        
+        partials = await asyncio.gather(*[
+            summarize_window(i, start, end, text) for i, (start, end, text) in enumerate(windows)
+        ])
+        return await self._reduce_prompt(list(partials), backend)
+    
+    async def _cached(self, key: str, produce: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached result for `key`, or produce, cache and return it
+        
+        Concurrent callers with the same key wait for the same call. Failures
+        are not cached.
+        """
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info("♻️ Reusing cached AI result")
+                return cached
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._produce_and_cache(key, produce))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        # Shielded so a disconnecting caller does not waste a call others (or the cache) will use
+        return await asyncio.shield(task)
+    
+    async def _produce_and_cache(self, key: str, produce: Callable[[], Awaitable[Any]]) -> Any:
+        result = await produce()
+        if self.cache:
+            self.cache.set(key, result)
+        return result
+    
+    def _forget(self, key: str, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled():
+            # Mark the exception retrieved even if every waiter went away
+            task.exception()
+    
+    async def _reduce_prompt(self, partials: List[Dict[str, Any]], backend: SummaryBackend) -> str:
+        """Prompt combining window summaries; groups that don't fit one call are combined first"""
+        rendered = [self._render_partial(i + 1, p) for i, p in enumerate(partials)]
+        groups = [[]]
+        group_tokens = 0
+        for part in rendered:
+            tokens = estimate_tokens(part)
+            if groups[-1] and group_tokens + tokens > backend.window_tokens:
+                groups.append([])
+                group_tokens = 0
+            groups[-1].append(part)
+            group_tokens += tokens
+        
+        if len(groups) == 1 or len(groups) == len(partials):
+            # Everything fits, or no grouping can shrink the input further
+            return REDUCE_PROMPT.format(parts="\n\n".join(rendered))
+        
+        combined = await asyncio.gather(*[
+            self._summarize_prompt(REDUCE_PROMPT.format(parts="\n\n".join(group)), backend)
+            for group in groups
+        ])
+        return await self._reduce_prompt(list(combined), backend)
+    
+    def _render_partial(self, index: int, partial: Dict[str, Any]) -> str:
+        lines = [f"Part {index}: {partial.get('summary', '')}"]
+        lines += [f"- Key point: {point}" for point in partial.get("key_points") or []]
+        lines += [f"- Action item: {item}" for item in partial.get("action_items") or []]
+        return "\n".join(lines)
+    
+    async def _summarize_prompt(self, prompt: str, backend: SummaryBackend) -> Dict[str, Any]:
+        """Run a summary prompt and parse the JSON (or bullet text) it returns"""
+        ai_response = await backend.llm.chat(prompt, max_tokens=1000)
+        try:
+            # Look for JSON in the response
+            json_start = ai_response.find("{")
+            json_end = ai_response.rfind("}") + 1
+            if json_start != -1 and json_end > json_start:
+                parsed = json.loads(ai_response[json_start:json_end])
+                if isinstance(parsed, dict):
+                    return parsed
+            # Fallback if no JSON object found
+            return self._parse_text_response(ai_response)
+        except json.JSONDecodeError:
+            return self._parse_text_response(ai_response)
+    
+    async def stream_summary(self, transcript: str,
+                             segments: Optional[List[Dict[str, Any]]] = None,
+                             latency_budget_s: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Summarize with the final completion streamed
+        
+        Yields events: "draft" (on-box extractive summary, first), "progress"
+        (map phase of long transcripts), "token" (raw completion text),
+        "summary" / "key_point" / "action_item" (parsed incrementally, see
+        SummaryStreamParser), then exactly one "done" with the full result, or
+        "error". The first backend of plan() is used; when it is the
+        extractive one, no LLM backend is available, or the LLM fails, "done"
+        carries the draft instead (its result has `"engine": "extractive"`).
+        Results are shared with the summary cache.
+        """
+        backend = next(iter(self.plan(transcript, latency_budget_s)), None)
+        if backend is None or backend.kind == BACKEND_EXTRACTIVE:
+            draft = await self._draft(transcript, segments, getattr(backend, "engine", None))
+            if draft is None:
+                yield {"type": "error", "message": "AI summarization not configured"}
+            else:
+                yield {"type": "done", "result": draft, "cached": False}
+            return
+        
+        key = self._summary_key(backend, transcript)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is None and key in self._inflight:
+            # Someone is already producing this summary; wait for theirs
+            self.coalesced += 1
             try:
-                # Look for JSON in the response
-                json_start = ai_response.find("{")
-                json_end = ai_response.rfind("}") + 1
-                if json_start != -1 and json_end > json_start:
-                    result = json.loads(ai_response[json_start:json_end])
-                else:
-                    # Fallback if no JSON found
-                    result = self._parse_text_response(ai_response)
-            except json.JSONDecodeError:
-                result = self._parse_text_response(ai_response)
+                cached = await asyncio.shield(self._inflight[key])
+            except Exception:
+                cached = None
+        if cached is not None:
+            yield {"type": "done", "result": cached, "cached": True}
+            return
+        
+        draft = await self._draft(transcript, segments)
+        if draft is not None:
+            yield {"type": "draft", "result": draft}
+        
+        progress_events: asyncio.Queue = asyncio.Queue()
+        
+        async def progress(done: int, total: int):
+            await progress_events.put({"type": "progress", "windows_done": done, "windows": total})
+        
+        try:
+            prompt_task = asyncio.ensure_future(self._final_prompt(transcript, segments, backend, progress))
+            try:
+                while not prompt_task.done() or not progress_events.empty():
+                    getter = asyncio.ensure_future(progress_events.get())
+                    await asyncio.wait({getter, prompt_task}, return_when=asyncio.FIRST_COMPLETED)
+                    if getter.done():
+                        yield getter.result()
+                    else:
+                        getter.cancel()
+                prompt = prompt_task.result()
+            finally:
+                prompt_task.cancel()
             
-            logger.info("Successfully generated meeting summary")
-            return result
+            parser = SummaryStreamParser()
+            async for delta in backend.llm.stream_chat(prompt, max_tokens=1000):
+                yield {"type": "token", "text": delta}
+                for event in parser.feed(delta):
+                    yield event
             
+            result = parser.result()
+            if not isinstance(result, dict):
+                result = self._parse_text_response(parser.text)
+            result = {**result, "engine": backend.name}
         except Exception as e:
-            logger.error(f"AI summarization error: {str(e)}")
-            return {
-                "summary": "Could not generate AI summary",
-                "key_points": [],
-                "action_items": []
-            }
+            logger.error(f"AI summary stream error ({backend.name}): {str(e)}")
+            if draft is None:
+                yield {"type": "error", "message": "Could not generate AI summary"}
+            else:
+                yield {"type": "done", "result": draft, "cached": False}
+            return
+        
+        if self.cache:
+            self.cache.set(key, result)
+        logger.info(f"Successfully streamed meeting summary with {backend.name}")
+        yield {"type": "done", "result": result, "cached": False}
     
     def _parse_text_response(self, response: str) -> Dict[str, Any]:
         """Parse text response if JSON parsing fails"""
@@ -144,39 +496,137 @@ Response:"""
             "action_items": action_items if action_items else []
         }
     
+    def _highlight_key(self, backend: SummaryBackend, transcript_segment: str) -> str:
+        return content_key(
+            "highlight", HIGHLIGHT_PROMPT_VERSION, backend.model, normalize_transcript(transcript_segment)
+        )
+    
     async def generate_highlight_description(self, transcript_segment: str) -> str:
         """Generate a description for a highlight clip"""
-        if not self.api_key:
-            return "Highlight from meeting"
+        backend = self._llm_backend()
+        if backend is None:
+            return DEFAULT_HIGHLIGHT_DESCRIPTION
         
         try:
             prompt = f"Summarize this meeting excerpt in one concise sentence:\n\n{transcript_segment}"
-            
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": 0.7,
-                "max_tokens": 100
-            }
-            
-            response = await self.client.post(
-                f"{self.base_url}/chat/completions",
-                json=payload,
-                headers=headers
+            return await self._cached(
+                self._highlight_key(backend, transcript_segment), lambda: self._describe(prompt, backend)
             )
             
-            data = response.json()
-            return data["choices"][0]["message"]["content"].strip()
-            
         except Exception as e:
             logger.error(f"Highlight description error: {str(e)}")
-            return "Highlight from meeting"
+            return DEFAULT_HIGHLIGHT_DESCRIPTION
+    
+    async def generate_highlight_descriptions(self, transcript_segments: List[str]) -> List[str]:
+        """
+        Descriptions for many highlight clips, in the same order
+        
+        Cached and repeated excerpts are resolved first; the rest are packed
+        into numbered batch prompts of up to the backend's batch size (and one
+        window of tokens), which run concurrently within the LLM client's
+        limits. Descriptions share the cache with generate_highlight_description.
+        """
+        backend = self._llm_backend()
+        if backend is None:
+            return [DEFAULT_HIGHLIGHT_DESCRIPTION] * len(transcript_segments)
+        
+        keys = [self._highlight_key(backend, segment) for segment in transcript_segments]
+        descriptions: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+        for key, segment in zip(keys, transcript_segments):
+            if key in descriptions or key in pending:
+                continue
+            cached = self.cache.get(key) if self.cache else None
+            if cached is not None:
+                descriptions[key] = cached
+            else:
+                pending[key] = segment
+        
+        if pending:
+            batches = self._highlight_batches(list(pending.items()), backend)
+            logger.info(f"📝 Describing {len(pending)} highlights in {len(batches)} batch call(s)")
+            for described in await asyncio.gather(*[self._describe_batch(batch, backend) for batch in batches]):
+                descriptions.update(described)
+        
+        return [descriptions.get(key, DEFAULT_HIGHLIGHT_DESCRIPTION) for key in keys]
+    
+    def _highlight_batches(self, items: List[Tuple[str, str]],
+                           backend: SummaryBackend) -> List[List[Tuple[str, str]]]:
+        """Group (key, excerpt) pairs by the backend's batch size and window token budget"""
+        batches: List[List[Tuple[str, str]]] = []
+        current: List[Tuple[str, str]] = []
+        tokens = 0
+        for key, segment in items:
+            size = estimate_tokens(segment)
+            if current and (len(current) >= backend.batch_size or tokens + size > backend.window_tokens):
+                batches.append(current)
+                current, tokens = [], 0
+            current.append((key, segment))
+            tokens += size
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _describe_batch(self, batch: List[Tuple[str, str]], backend: SummaryBackend) -> Dict[str, str]:
+        """One LLM call for a batch; excerpts missing from its reply get a call of their own"""
+        if len(batch) == 1:
+            key, segment = batch[0]
+            return {key: await self.generate_highlight_description(segment)}
+        
+        excerpts = "\n\n".join(f"[{i + 1}] {segment}" for i, (_, segment) in enumerate(batch))
+        try:
+            reply = await backend.llm.chat(HIGHLIGHT_BATCH_PROMPT.format(excerpts=excerpts), max_tokens=60 * len(batch))
+        except Exception as e:
+            logger.error(f"Highlight batch description error: {str(e)}")
+            return {}
+        
+        parsed = self._parse_batch_reply(reply)
+        described: Dict[str, str] = {}
+        missing: List[Tuple[str, str]] = []
+        for i, (key, segment) in enumerate(batch):
+            text = parsed.get(str(i + 1))
+            if isinstance(text, str) and text.strip():
+                described[key] = text.strip()
+                if self.cache:
+                    self.cache.set(key, described[key])
+            else:
+                missing.append((key, segment))
+        
+        if missing:
+            logger.warning(f"⚠️ Batch reply covered {len(batch) - len(missing)}/{len(batch)} highlights, describing the rest one by one")
+            singles = await asyncio.gather(*[self.generate_highlight_description(segment) for _, segment in missing])
+            described.update({key: text for (key, _), text in zip(missing, singles)})
+        return described
+    
+    def _parse_batch_reply(self, reply: str) -> Dict[str, Any]:
+        json_start = reply.find("{")
+        json_end = reply.rfind("}") + 1
+        if json_start == -1 or json_end <= json_start:
+            return {}
+        try:
+            parsed = json.loads(reply[json_start:json_end])
+        except json.JSONDecodeError:
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    
+    async def _describe(self, prompt: str, backend: SummaryBackend) -> str:
+        return (await backend.llm.chat(prompt, max_tokens=100)).strip()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Summary cache hit/miss counters, in-flight deduplication and per-backend metrics"""
+        return {
+            "backends": {name: backend.get_stats() for name, backend in self.backends.items()},
+            "latency_budget_s": self.latency_budget_s or None,
+            "cache": self.cache.get_stats() if self.cache else None,
+            "in_flight": len(self._inflight),
+            "coalesced_requests": self.coalesced
+        }
     
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close backend HTTP clients"""
+        for backend in self.backends.values():
+            await backend.close()
+
+
+# Shared instance: one set of backend clients, concurrency limits and summary cache for all routes
+ai_service = AIService()
@@ -0,0 +1,99 @@
+"""
+In-memory audio decoding
+Pipes encoded audio through ffmpeg straight into a float32 NumPy buffer,
+so uploads never round-trip through temporary files before reaching Whisper.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+
+class AudioDecodeError(Exception):
+    """Raised when audio cannot be decoded"""
+
+
+def ffmpeg_available() -> bool:
+    """Check whether the ffmpeg binary is on PATH"""
+    return shutil.which(FFMPEG_BINARY) is not None
+
+
+def decode_audio(source: Union[bytes, str], sample_rate: int = 16000) -> np.ndarray:
+    """
+    Decode audio to a mono float32 array at `sample_rate`
+
+    Args:
+        source: Encoded audio bytes, or a path to an audio file
+        sample_rate: Target sample rate
+
+    Returns:
+        1-D float32 array
+    """
+    if ffmpeg_available():
+        try:
+            return _decode_with_ffmpeg(source, sample_rate)
+        except AudioDecodeError as e:
+            # Containers that need seeking (e.g. mp4 with a trailing moov atom)
+            # cannot be demuxed from a pipe; retry through librosa below
+            logger.warning(f"ffmpeg pipe decode failed, falling back to librosa: {e}")
+
+    return _decode_with_librosa(source, sample_rate)
+
+
+def _decode_with_ffmpeg(source: Union[bytes, str], sample_rate: int) -> np.ndarray:
+    """Decode via `ffmpeg ... -f f32le pipe:1`, reading from stdin or a file path"""
+    from_pipe = isinstance(source, (bytes, bytearray, memoryview))
+    command = [FFMPEG_BINARY, "-hide_banner", "-loglevel", "error"]
+    if not from_pipe:
+        command.append("-nostdin")
+    command += [
+        "-i", "pipe:0" if from_pipe else source,
+        "-f", "f32le",
+        "-acodec", "pcm_f32le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "pipe:1"
+    ]
+
+    process = subprocess.run(
+        command,
+        input=source if from_pipe else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    if process.returncode != 0:
+        raise AudioDecodeError(process.stderr.decode(errors="replace").strip()[-500:])
+
+    # Wraps the stdout buffer without copying it
+    return np.frombuffer(process.stdout, dtype=np.float32)
+
+
+def _decode_with_librosa(source: Union[bytes, str], sample_rate: int) -> np.ndarray:
+    """Fallback decode through librosa, which needs a file path for compressed formats"""
+    import librosa
+
+    temp_path: Optional[str] = None
+    try:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # .webm extension so librosa/audioread picks the right demuxer
+            with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as temp_file:
+                temp_path = temp_file.name
+                temp_file.write(source)
+            source = temp_path
+
+        audio_array, _ = librosa.load(source, sr=sample_rate, mono=True, dtype=np.float32)
+        return audio_array
+    except Exception as e:
+        raise AudioDecodeError(str(e)) from e
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.unlink(temp_path)
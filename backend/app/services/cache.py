@@ -0,0 +1,230 @@
+"""
+Two-tier result cache
+A byte-bounded in-memory LRU in front of an optional SQLite file that survives
+restarts, with an optional time-to-live. Values are JSON-serialisable; keys are
+opaque strings (typically content hashes).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(*parts: Any) -> str:
+    """Stable sha256 key over the given parts"""
+    return hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+
+
+class TieredCache:
+    """
+    Memory LRU + SQLite disk tier
+
+    Reads check memory first, then disk (promoting disk hits into memory).
+    Writes go to both tiers. Each tier evicts least-recently-used entries
+    once its byte budget is exceeded. With `ttl_seconds`, entries older than
+    that (since they were set) are treated as misses and removed.
+    """
+
+    def __init__(self, name: str, memory_max_bytes: int,
+                 disk_path: Optional[str] = None, disk_max_bytes: int = 0,
+                 ttl_seconds: float = 0):
+        self.name = name
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (raw JSON, time it was set)
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    stored_at REAL NOT NULL DEFAULT 0
+                )"""
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")]
+            if "stored_at" not in columns:
+                # Files created before TTL support; their age is unknown, so start the clock at last access
+                self._conn.execute("ALTER TABLE cache_entries ADD COLUMN stored_at REAL NOT NULL DEFAULT 0")
+                self._conn.execute("UPDATE cache_entries SET stored_at = accessed_at")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed ON cache_entries (accessed_at)"
+            )
+            self._disk_bytes = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()[0]
+            self.purge_expired()
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - stored_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value, stored_at FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row and not self._expired(row[1]):
+                    self._conn.execute(
+                        "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                    )
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return json.loads(row[0])
+                entry = row
+            elif entry is not None and not self._expired(entry[1]):
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(entry[0])
+
+            if entry is not None:
+                self._delete(key)
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: Any):
+        raw = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self.sets += 1
+            now = time.time()
+            self._remember(key, raw, now)
+            if self._conn is not None:
+                self._store(key, raw, now)
+
+    def update(self, key: str, **fields) -> bool:
+        """Merge fields into an existing dict entry without counting a lookup or resetting its TTL; False if absent"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                entry = self._conn.execute(
+                    "SELECT value, stored_at FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+            if entry is None or self._expired(entry[1]):
+                return False
+            value = json.loads(entry[0])
+            value.update(fields)
+            raw = json.dumps(value, separators=(",", ":"))
+            self._remember(key, raw, entry[1])
+            if self._conn is not None:
+                self._store(key, raw, entry[1])
+            return True
+
+    def delete(self, key: str):
+        with self._lock:
+            self._delete(key)
+
+    def _delete(self, key: str):
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry[0])
+        if self._conn is not None:
+            row = self._conn.execute("SELECT size FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._disk_bytes -= row[0]
+
+    def purge_expired(self) -> int:
+        """Remove every expired entry from both tiers"""
+        if not self.ttl_seconds:
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            expired = [k for k, (_, stored_at) in self._memory.items() if stored_at < cutoff]
+            for key in expired:
+                self._memory_bytes -= len(self._memory.pop(key)[0])
+            removed = len(expired)
+            if self._conn is not None:
+                # Memory entries are also on disk, so the disk count is the total
+                removed, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE stored_at < ?", (cutoff,)
+                ).fetchone()
+                if removed:
+                    self._conn.execute("DELETE FROM cache_entries WHERE stored_at < ?", (cutoff,))
+                    self._disk_bytes -= size
+            self.expirations += removed
+        if removed:
+            logger.info(f"🧹 Expired {removed} {self.name} cache entries")
+        return removed
+
+    def _remember(self, key: str, raw: str, stored_at: float):
+        """Insert into the memory LRU, evicting from the cold end"""
+        if len(raw) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous[0])
+        self._memory[key] = (raw, stored_at)
+        self._memory_bytes += len(raw)
+        while self._memory_bytes > self.memory_max_bytes:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def _store(self, key: str, raw: str, stored_at: float):
+        row = self._conn.execute("SELECT size FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        if row:
+            self._disk_bytes -= row[0]
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, size, accessed_at, stored_at) VALUES (?, ?, ?, ?, ?)",
+            (key, raw, len(raw), time.time(), stored_at)
+        )
+        self._disk_bytes += len(raw)
+
+        if self.disk_max_bytes and self._disk_bytes > self.disk_max_bytes:
+            # Evict down to 90% so we don't trim on every write
+            target = int(self.disk_max_bytes * 0.9)
+            for old_key, size in self._conn.execute(
+                "SELECT key, size FROM cache_entries ORDER BY accessed_at"
+            ).fetchall():
+                if self._disk_bytes <= target:
+                    break
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (old_key,))
+                self._disk_bytes -= size
+                self.evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "name": self.name,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "sets": self.sets,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "ttl_seconds": self.ttl_seconds or None
+        }
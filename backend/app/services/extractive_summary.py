@@ -0,0 +1,229 @@
+"""
+Local extractive summarizer
+Picks the most central transcript sentences with TextRank over TF-IDF
+sentence vectors and detects action items from modal and imperative
+phrasing. Everything after tokenization is NumPy, so an hour of transcript
+takes a fraction of a second on CPU with no network call. Used when no LLM
+is configured or reachable, and as the first draft while an LLM summary is
+being generated.
+"""
+
+import logging
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Above this many sentences the n x n similarity graph gets expensive;
+# sentences are scored by similarity to the transcript centroid instead
+MAX_TEXTRANK_SENTENCES = 3000
+
+# Budget for the dense sentence x term TF-IDF matrix (float32 cells, so 64MB);
+# above it only the terms found in the most sentences are kept
+MAX_TFIDF_CELLS = 16_000_000
+MIN_VOCABULARY = 256
+
+# Sentences more similar than this to one already picked are skipped
+REDUNDANCY_THRESHOLD = 0.6
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are aren't as at be because been before being
+below between both but by can can't could couldn't did didn't do does doesn't doing don't down during each
+few for from further get got had hadn't has hasn't have haven't having he he'd he'll he's her here here's
+hers herself him himself his how how's i i'd i'll i'm i've if in into is isn't it it's its itself just
+let's like me more most mustn't my myself no nor not now of off on once only or other ought our ours
+ourselves out over own really right same shan't she she'd she'll she's should shouldn't so some such than
+that that's the their theirs them themselves then there there's these they they'd they'll they're they've
+this those through to too um uh under until up very was wasn't we we'd we'll we're we've were weren't what
+what's when when's where where's which while who who's whom why why's will with won't would wouldn't yeah
+yes you you'd you'll you're you've your yours yourself yourselves okay ok gonna kind sort thing things
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# "We'll send...", "Sarah needs to...", "you should..." (not "it will rain")
+_COMMITMENT = re.compile(
+    r"\b(?!(?:It|This|That|There|What|Which|Who)\b)(?:I|[Ww]e|[Yy]ou|[Tt]hey|[Hh]e|[Ss]he|[A-Z][a-z]+)"
+    r"(?:'ll|\s+will|\s+needs? to|\s+should|\s+must|\s+ha(?:ve|s) to|\s+(?:am|is|are) going to|\s+can you)"
+    r"\s+(?!be\b|not\b|never\b)[a-z]+"
+)
+_MARKER = re.compile(
+    r"\b(?:action items?|follow[ -]up|to-?do|next steps?|let's|let us|please|make sure|take care of|assign(?:ed)? to)\b",
+    re.I
+)
+_DEADLINE = re.compile(
+    r"\b(?:by|before|until|due)\s+(?:the\s+)?(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday|"
+    r"tomorrow|tonight|today|eod|end of (?:the )?(?:day|week|month|sprint|quarter)|next (?:week|month|sprint))\b",
+    re.I
+)
+IMPERATIVE_VERBS = frozenset("""
+ask book call check circulate confirm contact create document draft email file finalize finish fix follow
+investigate look organize plan prepare reach remind review schedule send set share ship submit sync test
+update write
+""".split())
+
+
+def split_sentences(transcript: str, segments: Optional[List[Dict[str, Any]]] = None,
+                    max_words: int = 40) -> List[str]:
+    """
+    Sentences from Whisper segments (or the plain transcript)
+
+    Segments are joined before splitting, since Whisper segments often break
+    mid-sentence. Unpunctuated runs are cut every `max_words` words.
+    """
+    text = " ".join(s.get("text", "").strip() for s in segments) if segments else transcript
+    sentences = []
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        words = sentence.split()
+        for i in range(0, len(words), max_words):
+            sentences.append(" ".join(words[i:i + max_words]))
+    return [s for s in sentences if s]
+
+
+class ExtractiveSummarizer:
+    """
+    On-box summarization engine returning the same shape as AIService:
+    {"summary", "key_points", "action_items"}
+
+    Args:
+        summary_sentences: Top sentences joined (in transcript order) as the summary
+        key_points: Next-best distinct sentences listed as key points
+        action_items: Most likely action-item sentences
+        min_words: Shorter sentences ("Okay.", "Sounds good.") are never picked
+    """
+
+    name = "extractive"
+
+    def __init__(self, summary_sentences: int = 3, key_points: int = 5,
+                 action_items: int = 5, min_words: int = 5):
+        self.summary_sentences = summary_sentences
+        self.key_points = key_points
+        self.action_items = action_items
+        self.min_words = min_words
+
+    def summarize(self, transcript: str,
+                  segments: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        sentences = split_sentences(transcript, segments)
+        if not sentences:
+            return {"summary": "", "key_points": [], "action_items": []}
+
+        tokens = [[w for w in _WORD.findall(s.lower()) if w not in STOPWORDS] for s in sentences]
+        vectors = self._tfidf(tokens)
+        eligible = np.array([len(s.split()) >= self.min_words for s in sentences])
+        if not eligible.any():
+            eligible[:] = True
+        scores = self._rank(vectors)
+        scores[~eligible] = -1.0
+
+        ranked = np.argsort(-scores, kind="stable")
+        picked = self._pick_distinct(ranked[scores[ranked] >= 0], vectors, self.summary_sentences + self.key_points)
+        summary_ids = sorted(picked[:self.summary_sentences])
+        point_ids = sorted(picked[self.summary_sentences:])
+
+        result = {
+            "summary": " ".join(sentences[i] for i in summary_ids),
+            "key_points": [sentences[i] for i in point_ids],
+            "action_items": self._action_items(sentences, vectors, scores)
+        }
+        logger.info(f"📄 Extractive summary of {len(sentences)} sentences in {time.perf_counter() - start:.3f}s")
+        return result
+
+    def _tfidf(self, tokens: List[List[str]]) -> np.ndarray:
+        """L2-normalized TF-IDF rows, one per sentence, over at most MAX_TFIDF_CELLS / n terms"""
+        vocabulary: Dict[str, int] = {}
+        rows, cols = [], []
+        for i, words in enumerate(tokens):
+            for word in words:
+                rows.append(i)
+                cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+        n, terms = len(tokens), max(len(vocabulary), 1)
+        # Distinct (sentence, term) pairs and how often each occurs
+        pairs, occurrences = np.unique(np.array(rows, dtype=np.int64) * terms + np.array(cols, dtype=np.int64),
+                                       return_counts=True)
+        sentence, term = pairs // terms, pairs % terms
+        df = np.bincount(term, minlength=terms)
+        limit = max(MIN_VOCABULARY, MAX_TFIDF_CELLS // n)
+        if terms > limit:
+            # A 10-hour transcript can have 20k distinct words; words in few
+            # sentences barely move similarities, so they go first
+            kept = np.argsort(-df, kind="stable")[:limit]
+            column = np.full(terms, -1, dtype=np.int64)
+            column[kept] = np.arange(limit)
+            mask = column[term] >= 0
+            sentence, term, occurrences = sentence[mask], column[term[mask]], occurrences[mask]
+            df, terms = df[kept], limit
+
+        counts = np.zeros((n, terms), dtype=np.float32)
+        counts[sentence, term] = occurrences
+        idf = np.log((1.0 + n) / (1.0 + df)).astype(np.float32) + 1.0
+        # In place: the matrix is the largest allocation here
+        counts /= np.maximum(counts.sum(axis=1, keepdims=True), 1.0)
+        counts *= idf
+        counts /= np.maximum(np.sqrt(np.einsum("ij,ij->i", counts, counts))[:, None], 1e-9)
+        return counts
+
+    def _rank(self, vectors: np.ndarray, damping: float = 0.85,
+              iterations: int = 50, tolerance: float = 1e-6) -> np.ndarray:
+        """TextRank (PageRank over cosine similarity); centroid similarity for very long transcripts"""
+        n = vectors.shape[0]
+        if n > MAX_TEXTRANK_SENTENCES:
+            centroid = vectors.mean(axis=0)
+            return vectors @ centroid
+
+        similarity = vectors @ vectors.T
+        np.fill_diagonal(similarity, 0.0)
+        out_weight = similarity.sum(axis=1, keepdims=True)
+        # Sentences with no shared words link to everything equally
+        transition = np.where(out_weight > 0, similarity / np.maximum(out_weight, 1e-9), 1.0 / n)
+        scores = np.full(n, 1.0 / n, dtype=np.float32)
+        for _ in range(iterations):
+            updated = (1 - damping) / n + damping * (transition.T @ scores)
+            if np.abs(updated - scores).sum() < tolerance:
+                return updated
+            scores = updated
+        return scores
+
+    def _action_items(self, sentences: List[str], vectors: np.ndarray, scores: np.ndarray) -> List[str]:
+        """Sentences phrased as commitments, requests or assignments, in transcript order"""
+        weights = np.zeros(len(sentences), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            first = _WORD.match(sentence.lower())
+            weight = 0.0
+            if _COMMITMENT.search(sentence):
+                weight += 2.0
+            if _MARKER.search(sentence):
+                weight += 1.5
+            if first and first.group(0) in IMPERATIVE_VERBS:
+                weight += 1.5
+            if weight and _DEADLINE.search(sentence):
+                weight += 1.0
+            weights[i] = weight
+
+        candidates = np.flatnonzero(weights)
+        if not len(candidates):
+            return []
+        # Ties broken by centrality, so on-topic commitments win
+        centrality = np.maximum(scores[candidates], 0)
+        order = candidates[np.lexsort((-centrality, -weights[candidates]))]
+        chosen = self._pick_distinct(order, vectors, self.action_items)
+        return [sentences[i] for i in sorted(chosen)]
+
+    def _pick_distinct(self, order: np.ndarray, vectors: np.ndarray, count: int) -> List[int]:
+        """First `count` sentences of `order`, skipping near-duplicates of ones already chosen"""
+        chosen: List[int] = []
+        for i in order:
+            if len(chosen) >= count:
+                break
+            if chosen and float((vectors[chosen] @ vectors[i]).max()) > REDUNDANCY_THRESHOLD:
+                continue
+            chosen.append(int(i))
+        return chosen
+
+
+extractive_summarizer = ExtractiveSummarizer()
@@ -0,0 +1,429 @@
+"""
+Background transcription job queue
+Submitting a job returns immediately; a bounded pool of worker tasks drains the queue.
+Jobs live either in memory or in a SQLite file that survives restarts and can
+be shared by several server processes: a running job is leased to the
+process that claimed it, and only jobs whose lease has lapsed (their process
+died) are requeued.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Handler signature: (job, report_progress) -> result dict
+JobHandler = Callable[[Dict[str, Any], Callable[[float], None]], Awaitable[Dict[str, Any]]]
+
+
+class QueueFullError(Exception):
+    """Raised when the number of pending jobs reaches JOB_QUEUE_MAX_PENDING"""
+
+
+def _new_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    now = time.time()
+    return {
+        "id": str(uuid.uuid4()),
+        "status": JOB_QUEUED,
+        "progress": 0.0,
+        "payload": payload,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now
+    }
+
+
+class InMemoryJobStore:
+    """
+    Job store backed by a dict; jobs are lost on restart
+
+    Finished (done or failed) jobs stay readable for `retention_s` seconds,
+    and at most `max_finished` of them are kept.
+    """
+
+    def __init__(self, retention_s: float = 3600, max_finished: int = 1000):
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.pending: asyncio.Queue = asyncio.Queue()
+        self.retention_s = retention_s
+        self.max_finished = max_finished
+        # Finished job ids, oldest first
+        self._finished: "OrderedDict[str, float]" = OrderedDict()
+
+    def _evict_finished(self):
+        cutoff = time.time() - self.retention_s
+        while self._finished:
+            job_id, finished_at = next(iter(self._finished.items()))
+            if finished_at >= cutoff and len(self._finished) <= self.max_finished:
+                break
+            self._finished.popitem(last=False)
+            self.jobs.pop(job_id, None)
+
+    async def add(self, job: Dict[str, Any], max_pending: Optional[int] = None) -> bool:
+        # No await between the check and the insert, so concurrent submits can't overshoot
+        if max_pending is not None and self.pending.qsize() >= max_pending:
+            return False
+        self._evict_finished()
+        self.jobs[job["id"]] = job
+        self.pending.put_nowait(job["id"])
+        return True
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        try:
+            job_id = self.pending.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+        job = self.jobs[job_id]
+        job["status"] = JOB_RUNNING
+        job["updated_at"] = time.time()
+        return dict(job)
+
+    async def update(self, job_id: str, **fields):
+        job = self.jobs.get(job_id)
+        if job:
+            job.update(fields, updated_at=time.time())
+            if job["status"] in (JOB_DONE, JOB_FAILED):
+                self._finished[job_id] = job["updated_at"]
+                self._evict_finished()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return dict(job) if job else None
+
+    async def count_pending(self) -> int:
+        return self.pending.qsize()
+
+    async def active_payloads(self) -> List[Dict[str, Any]]:
+        return [job["payload"] for job in self.jobs.values() if job["status"] in (JOB_QUEUED, JOB_RUNNING)]
+
+    async def renew(self, job_id: str, owner: str) -> bool:
+        return True
+
+    async def release(self, job_id: str, owner: str):
+        pass
+
+    async def recover(self) -> int:
+        return 0
+
+
+class SQLiteJobStore:
+    """
+    Durable job store; queued and interrupted jobs are picked up again after a restart
+
+    Safe to share between processes: claiming is one conditional UPDATE, and
+    a claimed job carries its claimant (`owner`) and a lease the claimant
+    keeps renewing while it runs.
+    """
+
+    def __init__(self, db_path: str, lease_s: float = 120):
+        self.db_path = db_path
+        self.lease_s = lease_s
+        # Unique per process; each claim appends its own suffix so the claimed row can be read back
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS transcription_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_transcription_jobs_status_created "
+            "ON transcription_jobs (status, created_at)"
+        )
+        # Job files created before leases existed
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(transcription_jobs)")}
+        for name, type_ in (("owner", "TEXT"), ("lease_expires_at", "REAL")):
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE transcription_jobs ADD COLUMN {name} {type_}")
+
+    def _row_to_job(self, row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job.pop("lease_expires_at", None)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _add_sync(self, job: Dict[str, Any], max_pending: Optional[int]) -> bool:
+        with self._lock:
+            # The bound check and the insert share one write transaction, so other processes can't interleave
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if max_pending is not None and self._conn.execute(
+                    "SELECT COUNT(*) FROM transcription_jobs WHERE status = ?", (JOB_QUEUED,)
+                ).fetchone()[0] >= max_pending:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.execute(
+                    "INSERT INTO transcription_jobs (id, status, progress, payload, result, error, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, NULL, NULL, ?, ?)",
+                    (job["id"], job["status"], job["progress"], json.dumps(job["payload"]),
+                     job["created_at"], job["updated_at"])
+                )
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _claim_sync(self) -> Optional[Dict[str, Any]]:
+        owner = f"{self.owner}:{uuid.uuid4().hex[:8]}"
+        now = time.time()
+        with self._lock:
+            # One statement: of several processes racing for the oldest job, exactly one matches status = queued
+            claimed = self._conn.execute(
+                "UPDATE transcription_jobs SET status = ?, owner = ?, lease_expires_at = ?, updated_at = ? "
+                "WHERE id = (SELECT id FROM transcription_jobs WHERE status = ? ORDER BY created_at LIMIT 1) "
+                "AND status = ?",
+                (JOB_RUNNING, owner, now + self.lease_s, now, JOB_QUEUED, JOB_QUEUED)
+            ).rowcount
+            if not claimed:
+                return None
+            row = self._conn.execute("SELECT * FROM transcription_jobs WHERE owner = ?", (owner,)).fetchone()
+        return self._row_to_job(row)
+
+    def _release_sync(self, job_id: str, owner: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE transcription_jobs SET status = ?, progress = 0, owner = NULL, lease_expires_at = NULL, "
+                "updated_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (JOB_QUEUED, time.time(), job_id, owner, JOB_RUNNING)
+            )
+
+    def _renew_sync(self, job_id: str, owner: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE transcription_jobs SET lease_expires_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (time.time() + self.lease_s, job_id, owner, JOB_RUNNING)
+            ).rowcount == 1
+
+    def _update_sync(self, job_id: str, fields: Dict[str, Any]):
+        fields = dict(fields, updated_at=time.time())
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"]) if fields["result"] is not None else None
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE transcription_jobs SET {columns} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+
+    def _get_sync(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM transcription_jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def _count_pending_sync(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM transcription_jobs WHERE status = ?", (JOB_QUEUED,)
+            ).fetchone()[0]
+
+    def _active_payloads_sync(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM transcription_jobs WHERE status IN (?, ?)", (JOB_QUEUED, JOB_RUNNING)
+            ).fetchall()
+        return [json.loads(row["payload"]) for row in rows]
+
+    def _recover_sync(self) -> int:
+        now = time.time()
+        with self._lock:
+            # Jobs from before leases existed have none and count as lapsed
+            cursor = self._conn.execute(
+                "UPDATE transcription_jobs SET status = ?, progress = 0, owner = NULL, lease_expires_at = NULL, "
+                "updated_at = ? WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)",
+                (JOB_QUEUED, now, JOB_RUNNING, now)
+            )
+            return cursor.rowcount
+
+    async def add(self, job: Dict[str, Any], max_pending: Optional[int] = None) -> bool:
+        """Insert a job unless `max_pending` jobs are already queued; False when full"""
+        return await asyncio.to_thread(self._add_sync, job, max_pending)
+
+    async def claim(self) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._claim_sync)
+
+    async def update(self, job_id: str, **fields):
+        await asyncio.to_thread(self._update_sync, job_id, fields)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get_sync, job_id)
+
+    async def count_pending(self) -> int:
+        return await asyncio.to_thread(self._count_pending_sync)
+
+    async def active_payloads(self) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._active_payloads_sync)
+
+    async def renew(self, job_id: str, owner: str) -> bool:
+        """Extend a running job's lease; False if this process no longer holds it"""
+        return await asyncio.to_thread(self._renew_sync, job_id, owner)
+
+    async def release(self, job_id: str, owner: str):
+        """Requeue a job this process is giving up (shutdown), without waiting for its lease to lapse"""
+        await asyncio.to_thread(self._release_sync, job_id, owner)
+
+    async def recover(self) -> int:
+        """Requeue running jobs whose lease lapsed, i.e. whose process stopped or died"""
+        return await asyncio.to_thread(self._recover_sync)
+
+
+class TranscriptionJobQueue:
+    """Bounded pool of asyncio workers draining a job store"""
+
+    def __init__(self, store, workers: int, max_pending: int, poll_interval: float = 1.0,
+                 lease_s: float = 120):
+        self.store = store
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.poll_interval = poll_interval
+        self.lease_s = lease_s
+        self.handler: Optional[JobHandler] = None
+        self._tasks = []
+        self._wakeup = asyncio.Event()
+        # Live progress for running jobs, written from executor threads
+        self._progress: Dict[str, float] = {}
+        # Running jobs of this process -> claim owner, for lease renewal
+        self._owned: Dict[str, Optional[str]] = {}
+
+    async def start(self, handler: JobHandler):
+        """Start the worker tasks"""
+        if self._tasks:
+            return
+        self.handler = handler
+        recovered = await self.store.recover()
+        if recovered:
+            logger.info(f"Requeued {recovered} interrupted transcription jobs")
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"transcription-worker-{i}")
+            for i in range(self.workers)
+        ] + [asyncio.create_task(self._keep_leases(), name="transcription-leases")]
+        logger.info(f"✅ Started {self.workers} transcription job workers ({type(self.store).__name__})")
+
+    async def stop(self):
+        """Cancel the worker tasks; a durable store requeues their running jobs right away"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job_id, owner in list(self._owned.items()):
+            await self.store.release(job_id, owner)
+        self._owned.clear()
+
+    async def _keep_leases(self):
+        """Renew this process's leases and requeue jobs whose process stopped renewing theirs"""
+        while True:
+            await asyncio.sleep(self.lease_s / 3)
+            try:
+                for job_id, owner in list(self._owned.items()):
+                    if not await self.store.renew(job_id, owner):
+                        logger.warning(f"⚠️ Lost the lease on transcription job {job_id}")
+                recovered = await self.store.recover()
+                if recovered:
+                    logger.info(f"Requeued {recovered} transcription jobs whose worker stopped")
+                    self._wakeup.set()
+            except Exception as e:
+                logger.error(f"💥 Transcription job lease upkeep failed: {e}")
+
+    async def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Enqueue a job and return it without waiting for it to run"""
+        job = _new_job(payload)
+        if not await self.store.add(job, self.max_pending):
+            raise QueueFullError(f"{self.max_pending} transcription jobs already pending")
+        self._wakeup.set()
+        return job
+
+    async def active_payloads(self) -> List[Dict[str, Any]]:
+        """Payloads of queued and running jobs"""
+        return await self.store.active_payloads()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job, including live progress if it is running"""
+        job = await self.store.get(job_id)
+        if job and job["status"] == JOB_RUNNING and job_id in self._progress:
+            job["progress"] = self._progress[job_id]
+        return job
+
+    def _progress_reporter(self, job_id: str) -> Callable[[float], None]:
+        def report(fraction: float):
+            self._progress[job_id] = round(min(max(fraction, 0.0), 1.0), 3)
+        return report
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self.store.claim()
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id = job["id"]
+            self._owned[job_id] = job.get("owner")
+            self._progress[job_id] = 0.0
+            logger.info(f"Worker {index} running transcription job {job_id}")
+            try:
+                result = await self.handler(job, self._progress_reporter(job_id))
+                await self.store.update(job_id, status=JOB_DONE, progress=1.0, result=result)
+                logger.info(f"✅ Transcription job {job_id} done")
+            except asyncio.CancelledError:
+                # Left in _owned so stop() releases it
+                self._progress.pop(job_id, None)
+                raise
+            except Exception as e:
+                logger.error(f"💥 Transcription job {job_id} failed: {e}")
+                await self.store.update(job_id, status=JOB_FAILED, error=str(e))
+            self._owned.pop(job_id, None)
+            self._progress.pop(job_id, None)
+
+
+def _create_store():
+    if settings.JOB_QUEUE_BACKEND.lower() == "sqlite":
+        return SQLiteJobStore(settings.JOB_QUEUE_DB_PATH, settings.JOB_LEASE_S)
+    if settings.WEB_CONCURRENCY > 1:
+        # Each process would hold its own jobs, and status polls landing on another process would 404
+        raise RuntimeError(
+            f"JOB_QUEUE_BACKEND=memory cannot be used with WEB_CONCURRENCY={settings.WEB_CONCURRENCY}; "
+            "use JOB_QUEUE_BACKEND=sqlite"
+        )
+    return InMemoryJobStore(settings.JOB_RETENTION_S, settings.JOB_RETENTION_MAX)
+
+
+# Global instance
+job_queue = TranscriptionJobQueue(
+    _create_store(),
+    workers=settings.JOB_WORKERS,
+    max_pending=settings.JOB_QUEUE_MAX_PENDING,
+    lease_s=settings.JOB_LEASE_S
+)
@@ -0,0 +1,229 @@
+"""
+Summary backends
+Interchangeable ways of producing meeting summaries: a hosted
+OpenAI-compatible API (OpenRouter), a local OpenAI-compatible model server
+(llama.cpp / vLLM style) on our own boxes, and the on-box extractive
+summarizer. Each backend reports its concurrency, batching and context
+limits and estimates how long a transcript will take, so AIService can pick
+one per request by transcript length and latency budget.
+"""
+
+import logging
+import math
+from collections import deque
+from typing import Any, Dict, Optional
+
+from app.services.extractive_summary import extractive_summarizer
+from app.services.llm_client import LLMClient, BREAKER_OPEN
+
+logger = logging.getLogger(__name__)
+
+BACKEND_LLM = "llm"
+BACKEND_EXTRACTIVE = "extractive"
+
+# Rough token estimate for English text; only used to size windows and estimate latency
+CHARS_PER_TOKEN = 4
+
+# Output tokens assumed per summary call when estimating latency
+SUMMARY_OUTPUT_TOKENS = 300
+
+# Recent (prompt tokens, seconds) observations the call-time fit uses
+OBSERVATION_WINDOW = 50
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class SummaryBackend:
+    """
+    Base class: capabilities plus a latency estimate
+
+    Attributes:
+        name: Backend name used in settings, stats and results
+        kind: BACKEND_LLM or BACKEND_EXTRACTIVE
+        model: Model identifier (part of summary cache keys)
+        max_concurrency: Calls the backend serves in parallel
+        batch_size: Highlight excerpts packed into one call
+        window_tokens: Transcript tokens per summary call
+    """
+
+    kind = BACKEND_LLM
+
+    def __init__(self, name: str, model: str, max_concurrency: int, batch_size: int, window_tokens: int):
+        self.name = name
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.batch_size = max(1, batch_size)
+        self.window_tokens = window_tokens
+
+    def available(self) -> bool:
+        return True
+
+    def estimate_s(self, transcript_tokens: int) -> float:
+        """Expected seconds to summarize a transcript of `transcript_tokens`"""
+        raise NotImplementedError
+
+    def observe(self, tokens: int, seconds: float):
+        """Record a finished call (prompt tokens, seconds excluding queueing) to refine estimate_s"""
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "model": self.model,
+            "available": self.available(),
+            "max_concurrency": self.max_concurrency,
+            "batch_size": self.batch_size,
+            "window_tokens": self.window_tokens
+        }
+
+    async def close(self):
+        pass
+
+
+class LLMBackend(SummaryBackend):
+    """
+    An OpenAI-compatible chat completions endpoint behind an LLMClient
+
+    A call is estimated as `overhead_s + (prompt + output tokens) / tokens_per_s`
+    until a few calls of different sizes have been observed; then as a
+    least-squares line (seconds = a + b * prompt tokens) over recent calls.
+    Map-reduce transcripts cost ceil(windows / max_concurrency) rounds of
+    window calls plus the reduce call.
+
+    Args:
+        requires_key: Unavailable without an API key (hosted providers)
+        client_options: Passed to LLMClient (retries, rate limit, breaker, hedging...)
+    """
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str,
+                 max_concurrency: int, batch_size: int, window_tokens: int,
+                 overhead_s: float, tokens_per_s: float, requires_key: bool = True,
+                 **client_options):
+        super().__init__(name, model, max_concurrency, batch_size, window_tokens)
+        self.base_url = base_url
+        self.api_key = api_key
+        self.requires_key = requires_key
+        self.overhead_s = overhead_s
+        self.tokens_per_s = tokens_per_s
+        self.observed_calls = 0
+        self._observations = deque(maxlen=OBSERVATION_WINDOW)
+        self._fit: Optional[tuple] = None
+        self.llm = LLMClient(base_url, api_key, model, max_concurrency=self.max_concurrency, **client_options)
+        self.llm.on_latency = lambda prompt, seconds: self.observe(estimate_tokens(prompt), seconds)
+
+    def available(self) -> bool:
+        if not self.base_url or (self.requires_key and not self.api_key):
+            return False
+        # An open breaker means the provider is down; skip it until a probe is due
+        return self.llm.breaker.state != BREAKER_OPEN or self.llm.breaker.retry_in() <= 0
+
+    def _call_s(self, prompt_tokens: int) -> float:
+        if self._fit:
+            intercept, slope = self._fit
+            return intercept + slope * prompt_tokens
+        return self.overhead_s + (prompt_tokens + SUMMARY_OUTPUT_TOKENS) / self.tokens_per_s
+
+    def estimate_s(self, transcript_tokens: int) -> float:
+        windows = max(1, math.ceil(transcript_tokens / self.window_tokens))
+        if windows == 1:
+            return self._call_s(transcript_tokens)
+        rounds = math.ceil(windows / self.max_concurrency)
+        return rounds * self._call_s(transcript_tokens // windows) + self._call_s(windows * SUMMARY_OUTPUT_TOKENS)
+
+    def observe(self, tokens: int, seconds: float):
+        self.observed_calls += 1
+        self._observations.append((tokens, seconds))
+        if len(self._observations) < 3:
+            return
+        n = len(self._observations)
+        mean_x = sum(x for x, _ in self._observations) / n
+        mean_y = sum(y for _, y in self._observations) / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in self._observations)
+        if var_x < 1e-9:
+            return
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in self._observations) / var_x
+        if slope > 0:
+            self._fit = (max(mean_y - slope * mean_x, 0.0), slope)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **super().get_stats(),
+            "base_url": self.base_url,
+            "observed_calls": self.observed_calls,
+            "call_s_fit": {"intercept_s": round(self._fit[0], 3), "s_per_1k_tokens": round(self._fit[1] * 1000, 3)}
+                          if self._fit else None,
+            "llm": self.llm.get_stats()
+        }
+
+    async def close(self):
+        await self.llm.close()
+
+
+class ExtractiveBackend(SummaryBackend):
+    """The on-box extractive summarizer: always available, milliseconds per hour of audio"""
+
+    kind = BACKEND_EXTRACTIVE
+
+    # ~25ms for a one-hour (~12k token) transcript, see benchmarks/bench_extractive.py
+    SECONDS_PER_TOKEN = 2.5e-6
+
+    def __init__(self, engine=extractive_summarizer):
+        super().__init__(BACKEND_EXTRACTIVE, "extractive", max_concurrency=1, batch_size=1, window_tokens=10 ** 9)
+        self.engine = engine
+
+    def estimate_s(self, transcript_tokens: int) -> float:
+        return transcript_tokens * self.SECONDS_PER_TOKEN
+
+
+def build_backends(settings) -> Dict[str, SummaryBackend]:
+    """Configured backends in SUMMARY_BACKENDS preference order; unknown names are skipped"""
+    resilience = {
+        "http2": settings.LLM_HTTP2,
+        "timeout_s": settings.LLM_TIMEOUT_S,
+        "connect_timeout_s": settings.LLM_CONNECT_TIMEOUT_S,
+        "max_retries": settings.LLM_MAX_RETRIES,
+        "backoff_s": settings.LLM_RETRY_BACKOFF_S,
+        "backoff_max_s": settings.LLM_RETRY_BACKOFF_MAX_S,
+        "breaker_threshold": settings.LLM_BREAKER_THRESHOLD,
+        "breaker_reset_s": settings.LLM_BREAKER_RESET_S
+    }
+    factories = {
+        "openrouter": lambda: LLMBackend(
+            "openrouter", settings.OPENROUTER_BASE_URL, settings.OPENROUTER_API_KEY, settings.OPENROUTER_MODEL,
+            max_concurrency=settings.SUMMARY_MAX_CONCURRENCY,
+            batch_size=settings.HIGHLIGHT_BATCH_SIZE,
+            window_tokens=settings.SUMMARY_WINDOW_TOKENS,
+            overhead_s=settings.OPENROUTER_OVERHEAD_S,
+            tokens_per_s=settings.OPENROUTER_TOKENS_PER_S,
+            rate_per_s=settings.LLM_RATE_LIMIT_PER_MIN / 60,
+            rate_burst=settings.LLM_RATE_BURST,
+            hedge_model=settings.LLM_HEDGE_MODEL,
+            hedge_delay_s=settings.LLM_HEDGE_DELAY_S,
+            extra_headers={"HTTP-Referer": "https://meetnoteapp.netlify.app", "X-Title": "MeetNote"},
+            **resilience
+        ),
+        "local": lambda: LLMBackend(
+            "local", settings.LOCAL_LLM_BASE_URL, settings.LOCAL_LLM_API_KEY, settings.LOCAL_LLM_MODEL,
+            max_concurrency=settings.LOCAL_LLM_MAX_CONCURRENCY,
+            batch_size=settings.LOCAL_LLM_BATCH_SIZE,
+            window_tokens=settings.LOCAL_LLM_WINDOW_TOKENS,
+            overhead_s=settings.LOCAL_LLM_OVERHEAD_S,
+            tokens_per_s=settings.LOCAL_LLM_TOKENS_PER_S,
+            requires_key=False,
+            **resilience
+        ),
+        BACKEND_EXTRACTIVE: ExtractiveBackend
+    }
+
+    backends: Dict[str, SummaryBackend] = {}
+    for name in settings.SUMMARY_BACKENDS.split(","):
+        name = name.strip().lower()
+        if not name or name in backends:
+            continue
+        factory: Optional[Any] = factories.get(name)
+        if factory is None:
+            logger.warning(f"⚠️ Unknown summary backend '{name}' in SUMMARY_BACKENDS, skipping")
+            continue
+        backends[name] = factory()
+    return backends
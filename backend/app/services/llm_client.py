@@ -0,0 +1,470 @@
+"""
+Resilient client for OpenAI-compatible chat completion APIs
+One pooled (HTTP/2 when available) connection set per provider, with a
+concurrency limit, token-bucket rate limiting, jittered retries on 429/5xx
+and network errors, a circuit breaker that fails fast while the provider is
+down, and optional hedged requests to a secondary model.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class LLMError(Exception):
+    """A chat completion failed; `retryable` errors are provider trouble, the rest are request errors"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMError):
+    """Raised without calling the provider while the circuit breaker is open"""
+
+    def __init__(self, retry_in: float):
+        super().__init__(f"LLM provider circuit open, retrying in {retry_in:.0f}s")
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    """Requests per second with bursts up to `capacity`; waiters are served in order"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited_s = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+                self.waited_s += wait
+                await asyncio.sleep(wait)
+
+    def defer(self, seconds: float):
+        """Hold back every caller for `seconds` (the provider told us to slow down)"""
+        if self.rate <= 0:
+            return
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive provider failures
+
+    While open, calls fail immediately. After `reset_timeout_s` one probe call
+    is let through (half-open); its success closes the breaker, its failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_s: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.opens = 0
+        self._probe_in_flight = False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout_s - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.failure_threshold <= 0 or self.state == BREAKER_CLOSED:
+            return True
+        if self.state == BREAKER_OPEN:
+            if self.retry_in() > 0:
+                return False
+            self.state = BREAKER_HALF_OPEN
+            self._probe_in_flight = False
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def release(self):
+        """A call let through by allow() ended without an outcome (cancelled)"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        if self.failure_threshold <= 0:
+            return
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == BREAKER_HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != BREAKER_OPEN:
+                self.opens += 1
+                logger.warning(f"⚡ LLM circuit breaker opened after {self.failures} failures")
+            self.state = BREAKER_OPEN
+            self.opened_at = time.monotonic()
+
+
+class LLMClient:
+    """
+    Chat completions against one OpenAI-compatible base URL
+
+    Args:
+        max_concurrency: Requests in flight at once (also sizes the connection pool)
+        rate_per_s: Token-bucket refill rate; 0 disables rate limiting
+        rate_burst: Requests allowed back to back before the rate applies
+        max_retries: Retries after the first attempt for 429, 5xx and network errors
+        backoff_s / backoff_max_s: Full-jitter exponential backoff bounds
+        breaker_threshold: Consecutive failures that open the breaker; 0 disables it
+        hedge_model: Secondary model raced against slow requests; empty disables hedging
+        hedge_delay_s: How long a request may run before it is hedged
+    """
+
+    def __init__(self, base_url: str, api_key: str, model: str,
+                 max_concurrency: int = 4, http2: bool = True,
+                 timeout_s: float = 60.0, connect_timeout_s: float = 5.0,
+                 rate_per_s: float = 0.0, rate_burst: int = 1,
+                 max_retries: int = 3, backoff_s: float = 1.0, backoff_max_s: float = 20.0,
+                 breaker_threshold: int = 5, breaker_reset_s: float = 30.0,
+                 hedge_model: str = "", hedge_delay_s: float = 10.0,
+                 extra_headers: Optional[Dict[str, str]] = None):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.hedge_model = hedge_model if hedge_model != model else ""
+        self.hedge_delay_s = hedge_delay_s
+        self.extra_headers = extra_headers or {}
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            timeout=httpx.Timeout(timeout_s, connect=connect_timeout_s, pool=timeout_s),
+            limits=httpx.Limits(
+                max_connections=max_concurrency * 2,
+                max_keepalive_connections=max_concurrency
+            )
+        )
+        self.bucket = TokenBucket(rate_per_s, rate_burst)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset_s)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.short_circuited = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.in_flight = 0
+        self._latencies = deque(maxlen=500)
+        # Called with (prompt, seconds) after each successful attempt; the time excludes queueing
+        self.on_latency: Optional[Callable[[str, float], None]] = None
+
+    def _request(self, model: str, prompt: str, max_tokens: int,
+                 temperature: float, stream: bool = False) -> Dict[str, Any]:
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if stream:
+            payload["stream"] = True
+        headers = {"Content-Type": "application/json", **self.extra_headers}
+        if self.api_key:
+            # Local model servers usually run without one
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return {"url": f"{self.base_url}/chat/completions", "json": payload, "headers": headers}
+
+    def _http_error(self, response: httpx.Response) -> LLMError:
+        try:
+            message = response.json().get("error", {}).get("message") or response.text
+        except (ValueError, AttributeError):
+            message = response.text
+        status = response.status_code
+        retry_after = None
+        if status == 429:
+            self.rate_limited += 1
+            try:
+                retry_after = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                retry_after = None
+            if retry_after:
+                self.bucket.defer(min(retry_after, self.backoff_max_s))
+        return LLMError(
+            f"LLM provider returned {status}: {message[:200]}", status_code=status,
+            retryable=status == 429 or status >= 500, retry_after=retry_after
+        )
+
+    async def _backoff(self, attempt: int, error: LLMError):
+        delay = error.retry_after or random.uniform(0, self.backoff_s * 2 ** attempt)
+        self.retries += 1
+        await asyncio.sleep(min(delay, self.backoff_max_s))
+
+    def _admit(self):
+        """Per-attempt breaker check, so queued requests and retries also fail fast once it opens"""
+        if not self.breaker.allow():
+            self.short_circuited += 1
+            raise CircuitOpenError(self.breaker.retry_in())
+
+    def _settle(self, error: Optional[LLMError]):
+        """Feed one attempt's outcome to the breaker"""
+        if error is None or not error.retryable:
+            # A request error still means the provider answered
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+
+    async def _send(self, model: str, prompt: str, max_tokens: int, temperature: float) -> str:
+        try:
+            response = await self.client.post(**self._request(model, prompt, max_tokens, temperature))
+        except httpx.TimeoutException as e:
+            raise LLMError(f"LLM request timed out ({type(e).__name__})", retryable=True)
+        except httpx.LocalProtocolError as e:
+            raise LLMError(f"Invalid LLM request: {e}")
+        except httpx.TransportError as e:
+            raise LLMError(f"LLM connection failed: {e}", retryable=True)
+        if response.status_code >= 400:
+            raise self._http_error(response)
+        try:
+            return response.json()["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise LLMError("LLM provider returned an unexpected response", retryable=True)
+
+    async def _attempt(self, model: str, prompt: str, max_tokens: int, temperature: float,
+                       sent: Optional[asyncio.Event] = None) -> str:
+        async with self._semaphore:
+            await self.bucket.acquire()
+            self._admit()
+            if sent is not None:
+                sent.set()
+            self.requests += 1
+            self.in_flight += 1
+            start = time.monotonic()
+            try:
+                content = await self._send(model, prompt, max_tokens, temperature)
+            except LLMError as e:
+                self._settle(e)
+                raise
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            finally:
+                self.in_flight -= 1
+        self._settle(None)
+        elapsed = time.monotonic() - start
+        self._latencies.append(elapsed)
+        if self.on_latency:
+            self.on_latency(prompt, elapsed)
+        return content
+
+    async def _with_retries(self, model: str, prompt: str, max_tokens: int, temperature: float,
+                            sent: Optional[asyncio.Event] = None) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._attempt(model, prompt, max_tokens, temperature, sent)
+            except LLMError as e:
+                if not e.retryable or attempt == self.max_retries:
+                    raise
+                logger.info(f"🔁 LLM request failed ({e}), retry {attempt + 1}/{self.max_retries}")
+                await self._backoff(attempt, e)
+
+    async def _hedged(self, prompt: str, max_tokens: int, temperature: float) -> str:
+        """Race the secondary model against a primary request that is taking too long"""
+        sent = asyncio.Event()
+        primary = asyncio.ensure_future(self._with_retries(self.model, prompt, max_tokens, temperature, sent))
+        # The hedge delay counts from when the primary is actually sent, not from when it started queueing
+        sent_wait = asyncio.ensure_future(sent.wait())
+        await asyncio.wait({primary, sent_wait}, return_when=asyncio.FIRST_COMPLETED)
+        sent_wait.cancel()
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_delay_s)
+        if done:
+            return primary.result()
+
+        self.hedges += 1
+        backup = asyncio.ensure_future(self._with_retries(self.hedge_model, prompt, max_tokens, temperature))
+        pending = {primary, backup}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.hedge_wins += 1
+                        return task.result()
+            raise primary.exception()
+        finally:
+            for task in (primary, backup):
+                task.cancel()
+
+    async def chat(self, prompt: str, max_tokens: int, temperature: float = 0.7) -> str:
+        """
+        One chat completion, returning the message content
+
+        Raises:
+            CircuitOpenError: While the breaker is open (no request is made)
+            LLMError: When the request failed after retries
+        """
+        try:
+            if self.hedge_model:
+                content = await self._hedged(prompt, max_tokens, temperature)
+            else:
+                content = await self._with_retries(self.model, prompt, max_tokens, temperature)
+        except LLMError:
+            self.failures += 1
+            raise
+        self.successes += 1
+        return content
+
+    async def stream_chat(self, prompt: str, max_tokens: int, temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        Chat completion with `stream: true`, yielding content deltas
+
+        Connecting is retried like `chat`; once text has been yielded, errors
+        are raised to the caller instead. Streams are never hedged.
+        """
+        started = False
+        try:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    async for delta in self._stream_attempt(prompt, max_tokens, temperature):
+                        started = True
+                        yield delta
+                    self.successes += 1
+                    return
+                except LLMError as e:
+                    if started or not e.retryable or attempt == self.max_retries:
+                        raise
+                    logger.info(f"🔁 LLM stream failed ({e}), retry {attempt + 1}/{self.max_retries}")
+                    await self._backoff(attempt, e)
+        except LLMError:
+            self.failures += 1
+            raise
+
+    async def _stream_lines(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        request = self._request(self.model, prompt, max_tokens, temperature, stream=True)
+        try:
+            async with self.client.stream("POST", **request) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                    raise self._http_error(response)
+                async for line in response.aiter_lines():
+                    yield line
+        except httpx.TimeoutException as e:
+            raise LLMError(f"LLM request timed out ({type(e).__name__})", retryable=True)
+        except httpx.LocalProtocolError as e:
+            raise LLMError(f"Invalid LLM request: {e}")
+        except httpx.TransportError as e:
+            raise LLMError(f"LLM connection failed: {e}", retryable=True)
+
+    async def _stream_attempt(self, prompt: str, max_tokens: int, temperature: float) -> AsyncIterator[str]:
+        async with self._semaphore:
+            await self.bucket.acquire()
+            self._admit()
+            self.requests += 1
+            self.in_flight += 1
+            start = time.monotonic()
+            first = True
+            outcome = None  # None until finished; then the error, or False for success
+            try:
+                async for line in self._stream_lines(prompt, max_tokens, temperature):
+                    # Server-sent events: "data: {...}" lines, comments and blank separators
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    if chunk.get("error"):
+                        raise LLMError(chunk["error"].get("message", "LLM stream error"), retryable=True)
+                    choices = chunk.get("choices") or [{}]
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if delta:
+                        if first:
+                            # Time to first token
+                            self._latencies.append(time.monotonic() - start)
+                            first = False
+                        yield delta
+                outcome = False
+                if self.on_latency:
+                    self.on_latency(prompt, time.monotonic() - start)
+            except LLMError as e:
+                outcome = e
+                raise
+            finally:
+                self.in_flight -= 1
+                if outcome is None:
+                    # Closed early by the consumer: don't leave a half-open probe claimed
+                    self.breaker.release()
+                else:
+                    self._settle(outcome or None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "model": self.model,
+            "hedge_model": self.hedge_model or None,
+            "http2": self.http2,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "rate_limit_wait_s": round(self.bucket.waited_s, 2),
+            "breaker_state": self.breaker.state,
+            "breaker_opens": self.breaker.opens,
+            "short_circuited": self.short_circuited,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency_p50_s": percentile(0.5),
+            "latency_p95_s": percentile(0.95)
+        }
+
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,78 @@
+"""
+Long-audio chunking helpers
+Splits decoded audio at silence boundaries with the Silero VAD bundled in
+faster-whisper, and stitches per-chunk transcripts back into one timeline.
+"""
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def plan_chunks(audio: np.ndarray, sample_rate: int, target_chunk_s: float,
+                min_silence_duration_ms: int = 500) -> List[Tuple[int, int]]:
+    """
+    Group speech regions into chunks of roughly `target_chunk_s` seconds
+
+    Chunk boundaries always fall inside a silence gap between speech regions,
+    so no word is cut in half. Leading and trailing silence is dropped; the
+    per-chunk `vad_filter` pass removes what remains inside each chunk.
+
+    Returns:
+        List of (start_sample, end_sample) pairs in order
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    speech = get_speech_timestamps(
+        audio,
+        VadOptions(
+            min_silence_duration_ms=min_silence_duration_ms,
+            # Longer speech runs are split at their quietest point
+            max_speech_duration_s=target_chunk_s
+        )
+    )
+    if not speech:
+        return []
+
+    target_samples = int(target_chunk_s * sample_rate)
+    chunks = []
+    chunk_start, chunk_end = speech[0]["start"], speech[0]["end"]
+
+    for region in speech[1:]:
+        if region["end"] - chunk_start > target_samples:
+            # Cut in the middle of the silence gap
+            cut = (chunk_end + region["start"]) // 2
+            chunks.append((chunk_start, cut))
+            chunk_start = cut
+        chunk_end = region["end"]
+
+    chunks.append((chunk_start, min(chunk_end, len(audio))))
+    return chunks
+
+
+def offset_segments(segments: List[Dict[str, Any]], offset_s: float) -> List[Dict[str, Any]]:
+    """Shift chunk-relative segment and word timestamps onto the recording timeline"""
+    for segment in segments:
+        segment["start"] = round(segment["start"] + offset_s, 2)
+        segment["end"] = round(segment["end"] + offset_s, 2)
+        for word in segment.get("words", []):
+            word["start"] = round(word["start"] + offset_s, 2)
+            word["end"] = round(word["end"] + offset_s, 2)
+    return segments
+
+
+def stitch_chunks(chunk_segments: List[List[Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], str]:
+    """
+    Merge per-chunk segment lists (already offset, in chunk order) into one timeline
+
+    Returns:
+        (segments, full_text)
+    """
+    segments = [segment for chunk in chunk_segments for segment in chunk]
+    # Chunks never overlap, but keep the ordering explicit in case padding does
+    segments.sort(key=lambda s: (s["start"], s["end"]))
+    full_text = " ".join(s["text"] for s in segments if s["text"])
+    return segments, full_text
@@ -0,0 +1,188 @@
+"""
+Whisper model worker pool with admission control
+Caps concurrent inference at the number of warm model workers, bounds how many
+requests may wait for one, and rejects the rest immediately.
+"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Approximate resident memory per int8 CPU model worker, including runtime buffers
+MODEL_MEMORY_MB = {
+    "tiny": 150,
+    "base": 250,
+    "small": 600,
+    "medium": 1500,
+    "large": 3200,
+}
+
+
+class PoolSaturatedError(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+    def __init__(self, message: str, retry_after: int = 10):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ModelWarmingUpError(PoolSaturatedError):
+    """Raised for interactive requests that arrive before the model has finished loading"""
+
+    def __init__(self, message: str, retry_after: int = 15):
+        super().__init__(message, retry_after)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (respects container CPU affinity)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def available_memory_mb() -> Optional[int]:
+    """Memory available to this process: cgroup limit if set, else MemAvailable"""
+    try:
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open("/sys/fs/cgroup/memory.current") as f:
+                used = int(f.read().strip())
+            return max(0, int(limit) - used) // (1024 * 1024)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def default_pool_size(model_name: str, cpu_threads: int) -> int:
+    """Size the pool so workers neither oversubscribe the CPU nor exhaust memory"""
+    by_cpu = max(1, available_cpus() // max(1, cpu_threads))
+
+    memory_mb = available_memory_mb()
+    model_mb = MODEL_MEMORY_MB.get(model_name.split(".")[0].split("-")[0], MODEL_MEMORY_MB["base"])
+    # Leave headroom for decoded audio and the API process itself
+    by_memory = max(1, int(memory_mb * 0.7) // model_mb) if memory_mb else by_cpu
+
+    return min(by_cpu, by_memory)
+
+
+class ModelWorker:
+    """One warm model slot and its utilisation counters"""
+
+    def __init__(self, index: int, model: Any):
+        self.index = index
+        self.model = model
+        self.jobs = 0
+        self.busy_seconds = 0.0
+        self.busy_since: Optional[float] = None
+        self.started_at = time.time()
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        busy = self.busy_seconds + (now - self.busy_since if self.busy_since else 0.0)
+        uptime = max(now - self.started_at, 1e-9)
+        return {
+            "worker": self.index,
+            "busy": self.busy_since is not None,
+            "jobs": self.jobs,
+            "busy_seconds": round(busy, 2),
+            "utilisation": round(busy / uptime, 3)
+        }
+
+
+class ModelPool:
+    """
+    Fixed set of warm model workers shared by all requests
+
+    `admit()` is the request-level gate: at most `size + max_queue` requests may
+    be inside it at once, anything beyond that gets PoolSaturatedError. Inside,
+    `checkout()` blocks a thread until a worker is free, so inference never runs
+    on more workers than exist.
+    """
+
+    def __init__(self, models: List[Any], max_queue: int, name: str = "whisper"):
+        self.name = name
+        self.workers = self._create_workers(models)
+        self.size = len(self.workers)
+        self.max_queue = max_queue
+        self._free: "queue.Queue[ModelWorker]" = queue.Queue()
+        for worker in self.workers:
+            self._free.put(worker)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.admitted = 0
+        self.rejected = 0
+        # Request threads: every admitted request gets one, so none waits on the executor itself
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.size + max_queue,
+            thread_name_prefix=f"{name}-pool"
+        )
+
+    def _create_workers(self, models: List[Any]) -> List[ModelWorker]:
+        return [ModelWorker(i, model) for i, model in enumerate(models)]
+
+    @property
+    def capacity(self) -> int:
+        return self.size + self.max_queue
+
+    @asynccontextmanager
+    async def admit(self):
+        """Admit a request or fail fast if the wait queue is full"""
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            raise PoolSaturatedError(
+                f"{self.name} pool saturated: {self.size} workers busy, {self.max_queue} requests waiting"
+            )
+        self.in_flight += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """Block the calling thread until a worker is free and hold it for the block"""
+        worker = self._free.get(timeout=timeout)
+        with self._lock:
+            worker.busy_since = time.time()
+        try:
+            yield worker
+        finally:
+            with self._lock:
+                worker.busy_seconds += time.time() - worker.busy_since
+                worker.busy_since = None
+                worker.jobs += 1
+            self._free.put(worker)
+
+    def get_stats(self) -> Dict[str, Any]:
+        workers = [worker.get_stats() for worker in self.workers]
+        busy = sum(1 for w in workers if w["busy"])
+        return {
+            "size": self.size,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "waiting": max(0, self.in_flight - busy),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "utilisation": round(sum(w["utilisation"] for w in workers) / max(1, self.size), 3),
+            "workers": workers
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
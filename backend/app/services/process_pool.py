@@ -0,0 +1,267 @@
+"""
+Process-based Whisper worker pool
+Runs ProductionWhisperService in dedicated worker processes so inference and the
+Python-side segment handling never hold the API process's GIL, and a crashed or
+leaking worker cannot take the API down. Audio is handed over through shared
+memory; workers are recycled after a number of jobs or above an RSS ceiling.
+
+This module must not import app settings at import time: worker processes
+adjust their environment before loading the service.
+"""
+
+import logging
+import multiprocessing
+import os
+import time
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.model_pool import ModelPool, ModelWorker
+
+logger = logging.getLogger(__name__)
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _pack_segments(segments: List[Dict[str, Any]]) -> List[Tuple]:
+    """Segment dicts -> plain tuples, which pickle far smaller than dicts"""
+    return [
+        (
+            s["start"], s["end"], s["text"], s["confidence"],
+            tuple((w["start"], w["end"], w["word"], w["probability"]) for w in s["words"])
+        )
+        for s in segments
+    ]
+
+
+def _unpack_segments(packed: List[Tuple]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "start": start,
+            "end": end,
+            "text": text,
+            "confidence": confidence,
+            "words": [
+                {"start": w[0], "end": w[1], "word": w[2], "probability": w[3]}
+                for w in words
+            ]
+        }
+        for start, end, text, confidence, words in packed
+    ]
+
+
+def _worker_main(conn):
+    """Worker process entry point: load the model once, then serve jobs until told to stop"""
+    # One model worker per process; parallelism comes from the number of processes
+    os.environ["WHISPER_BACKEND"] = "thread"
+    os.environ["WHISPER_NUM_WORKERS"] = "1"
+    os.environ["LONG_AUDIO_ENABLED"] = "false"
+
+    try:
+        from app.services.production_whisper import whisper_service
+        whisper_service.load()
+        if not whisper_service.model_loaded:
+            conn.send(("error", "Whisper model failed to load in worker"))
+            return
+    except Exception as e:
+        conn.send(("error", f"Worker startup failed: {e}"))
+        return
+
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message[0] == "stop":
+            return
+
+        _, shm_name, n_samples, language, options = message
+        # Spawned workers share the parent's resource tracker, which unregisters
+        # the block when the parent unlinks it
+        shm = SharedMemory(name=shm_name)
+        audio = None
+        try:
+            audio = np.ndarray((n_samples,), dtype=np.float32, buffer=shm.buf)
+            segments, full_text, info = whisper_service._transcribe_array(
+                audio, language, lambda fraction: conn.send(("progress", fraction)), options
+            )
+            audio = None
+            conn.send(("result", _pack_segments(segments), full_text, info, _rss_mb()))
+        except Exception as e:
+            conn.send(("error", str(e)))
+        finally:
+            audio = None
+            shm.close()
+
+
+class ProcessWorker(ModelWorker):
+    """Pool slot backed by a worker process"""
+
+    def __init__(self, index: int, pool: "ProcessModelPool"):
+        super().__init__(index, model=None)
+        self.pool = pool
+        self.process = None
+        self.conn = None
+        self.pid: Optional[int] = None
+        self.rss_mb = 0.0
+        self.process_jobs = 0
+        self.recycles = 0
+        self.crashes = 0
+
+    def launch(self):
+        """Spawn the worker process without waiting for its model to load"""
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn,),
+            name=f"whisper-worker-{self.index}",
+            daemon=True
+        )
+        self.conn = parent_conn
+        self.process.start()
+        child_conn.close()
+        self.process_jobs = 0
+
+    def wait_ready(self):
+        """Block until the worker has loaded its model"""
+        if not self.conn.poll(self.pool.start_timeout):
+            self.stop()
+            raise RuntimeError(f"Whisper worker {self.index} did not start within {self.pool.start_timeout}s")
+        message = self.conn.recv()
+        if message[0] != "ready":
+            self.stop()
+            raise RuntimeError(message[1])
+        self.pid = message[1]
+        logger.info(f"✅ Whisper worker {self.index} ready (pid {self.pid})")
+
+    def restart(self):
+        self.stop()
+        self.launch()
+        self.wait_ready()
+
+    def stop(self):
+        if self.process is None:
+            return
+        try:
+            if self.process.is_alive():
+                self.conn.send(("stop",))
+                self.process.join(timeout=5)
+        except (OSError, BrokenPipeError):
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+        self.pid = None
+
+    def transcribe(self, audio_array: np.ndarray,
+                   language: Optional[str] = None,
+                   progress_callback: Optional[Callable[[float], None]] = None,
+                   options: Optional[Dict[str, Any]] = None):
+        """Run one transcription in the worker; returns (segments, text, info)"""
+        if self.process is None or not self.process.is_alive():
+            self.crashes += 1
+            self.restart()
+
+        audio_array = np.ascontiguousarray(audio_array, dtype=np.float32)
+        shm = SharedMemory(create=True, size=max(audio_array.nbytes, 1))
+        try:
+            view = np.ndarray(audio_array.shape, dtype=np.float32, buffer=shm.buf)
+            view[:] = audio_array
+            del view
+
+            self.conn.send(("transcribe", shm.name, len(audio_array), language, options))
+            while True:
+                if not self.conn.poll(self.pool.job_timeout):
+                    raise TimeoutError(f"no response within {self.pool.job_timeout}s")
+                message = self.conn.recv()
+                if message[0] == "progress":
+                    if progress_callback:
+                        progress_callback(message[1])
+                elif message[0] == "result":
+                    _, packed, full_text, info, self.rss_mb = message
+                    break
+                else:
+                    raise RuntimeError(f"Whisper worker {self.index}: {message[1]}")
+        except (EOFError, OSError, TimeoutError) as e:
+            e = str(e) or type(e).__name__
+            self.crashes += 1
+            logger.error(f"💥 Whisper worker {self.index} failed ({e}), restarting")
+            self.restart()
+            raise RuntimeError(f"Whisper worker {self.index} failed: {e}")
+        finally:
+            shm.close()
+            shm.unlink()
+
+        self.process_jobs += 1
+        self._recycle_if_needed()
+        return _unpack_segments(packed), full_text, info
+
+    def _recycle_if_needed(self):
+        reason = None
+        if self.pool.max_jobs_per_worker and self.process_jobs >= self.pool.max_jobs_per_worker:
+            reason = f"{self.process_jobs} jobs"
+        elif self.pool.max_rss_mb and self.rss_mb > self.pool.max_rss_mb:
+            reason = f"RSS {self.rss_mb:.0f}MB > {self.pool.max_rss_mb}MB"
+        if reason:
+            logger.info(f"♻️ Recycling Whisper worker {self.index} after {reason}")
+            self.recycles += 1
+            self.restart()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(
+            pid=self.pid,
+            alive=bool(self.process and self.process.is_alive()),
+            rss_mb=round(self.rss_mb, 1),
+            jobs_since_recycle=self.process_jobs,
+            recycles=self.recycles,
+            crashes=self.crashes
+        )
+        return stats
+
+
+class ProcessModelPool(ModelPool):
+    """ModelPool whose workers are processes; admission and checkout work the same way"""
+
+    def __init__(self, size: int, max_queue: int, max_jobs_per_worker: int = 0,
+                 max_rss_mb: int = 0, start_timeout: float = 300.0, job_timeout: float = 3600.0):
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_mb = max_rss_mb
+        self.start_timeout = start_timeout
+        self.job_timeout = job_timeout
+        super().__init__(list(range(size)), max_queue, name="whisper-process")
+
+    def _create_workers(self, slots: List[Any]) -> List[ModelWorker]:
+        return [ProcessWorker(i, self) for i in slots]
+
+    def start(self):
+        """Launch every worker, then wait for all of them to load their models"""
+        start_time = time.time()
+        for worker in self.workers:
+            worker.launch()
+        for worker in self.workers:
+            worker.wait_ready()
+        logger.info(f"✅ {self.size} Whisper worker processes ready in {time.time() - start_time:.1f}s")
+
+    def shutdown(self):
+        super().shutdown()
+        for worker in self.workers:
+            worker.stop()
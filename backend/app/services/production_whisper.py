@@ -4,26 +4,28 @@ Full faster-whisper implementation with 1GB RAM support
 """
 
 import asyncio
+import importlib.util
 import logging
-import tempfile
 import os
+import threading
 import time
-from typing import Optional, Dict, Any, List
-from pathlib import Path
-import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Callable, Union
 
-try:
-    from faster_whisper import WhisperModel
-    WHISPER_AVAILABLE = True
-except ImportError:
-    WHISPER_AVAILABLE = False
+# faster-whisper (CTranslate2, PyAV, huggingface_hub) is imported when the model
+# loads, not here, so importing the API does not pay for it
+WHISPER_AVAILABLE = importlib.util.find_spec("faster_whisper") is not None
+if not WHISPER_AVAILABLE:
     logging.warning("faster-whisper not available, using mock transcription")
 
-import librosa
 import numpy as np
-import soundfile as sf
 
 from app.core.production_config import settings
+from app.services.audio_decode import decode_audio
+from app.services.long_audio import plan_chunks, offset_segments, stitch_chunks
+from app.services.model_pool import ModelPool, ModelWarmingUpError, default_pool_size
+from app.services.process_pool import ProcessModelPool
+from app.services.streaming import StreamingSession
 
 logger = logging.getLogger(__name__)
 
@@ -35,40 +37,131 @@ class ProductionWhisperService:
         self.model_loaded = False
         self.total_transcription_time = 0
         self.total_audio_duration = 0
+        self.chunked_transcriptions = 0
+        self.pool: Optional[ModelPool] = None
+        self.process_backend = settings.WHISPER_BACKEND.lower() == "process"
+        self._chunk_executor: Optional[ThreadPoolExecutor] = None
+        # The model is loaded by load()/start_loading(), never at import time
+        self.loading = False
+        self.load_error: Optional[str] = None
+        self._load_started = False
+        self._load_finished = threading.Event()
+    
+    def load(self):
+        """Load the model on the calling thread (worker processes and scripts)"""
+        self._load_started = True
+        self.loading = True
+        try:
+            if WHISPER_AVAILABLE:
+                self._load_model()
+            else:
+                logger.warning("Whisper not available - using mock transcription")
+        finally:
+            self.loading = False
+            self._load_finished.set()
+    
+    def start_loading(self):
+        """Load the model on a background thread so the server can take requests meanwhile"""
+        if self._load_started:
+            return
+        self._load_started = True
+        self.loading = True
+        threading.Thread(target=self.load, name="whisper-loader", daemon=True).start()
+    
+    def load_status(self) -> str:
+        """not_started, loading, ready, failed (model error) or mock (faster-whisper missing)"""
+        if not self._load_started:
+            return "not_started"
+        if not self._load_finished.is_set():
+            return "loading"
+        if self.model_loaded:
+            return "ready"
+        return "failed" if WHISPER_AVAILABLE else "mock"
+    
+    async def _wait_for_model(self, admit: bool):
+        """
+        Make sure loading has finished before a transcription
         
-        if WHISPER_AVAILABLE:
-            self._load_model()
-        else:
-            logger.warning("Whisper not available - using mock transcription")
+        Admitted (interactive) requests fail fast with ModelWarmingUpError;
+        queued work (admit=False) waits for the load to complete.
+        """
+        if self._load_finished.is_set():
+            return
+        self.start_loading()
+        if admit:
+            raise ModelWarmingUpError("Whisper model is still loading")
+        await asyncio.to_thread(self._load_finished.wait)
     
     def _load_model(self):
         """Load Whisper model with production optimizations"""
         try:
+            from faster_whisper import WhisperModel
+            
             logger.info(f"Loading Whisper model: {settings.WHISPER_MODEL}")
             start_time = time.time()
             
+            pool_size = settings.WHISPER_NUM_WORKERS or default_pool_size(
+                settings.WHISPER_MODEL, settings.WHISPER_CPU_THREADS
+            )
+            self._chunk_executor = ThreadPoolExecutor(
+                max_workers=pool_size,
+                thread_name_prefix="whisper-chunk"
+            )
+            
+            if self.process_backend:
+                # Each worker process loads its own single-worker model
+                self.pool = ProcessModelPool(
+                    pool_size,
+                    max_queue=settings.WHISPER_MAX_QUEUE,
+                    max_jobs_per_worker=settings.WHISPER_WORKER_MAX_JOBS,
+                    max_rss_mb=settings.WHISPER_WORKER_MAX_RSS_MB,
+                    start_timeout=settings.WHISPER_WORKER_START_TIMEOUT,
+                    job_timeout=settings.WHISPER_WORKER_JOB_TIMEOUT
+                )
+                self.pool.start()
+                self.model_loaded = True
+                logger.info(f"✅ Whisper process pool loaded in {time.time() - start_time:.2f}s")
+                return
+            
             # Production model configuration
             self.model = WhisperModel(
                 settings.WHISPER_MODEL,
                 device=settings.WHISPER_DEVICE,
                 compute_type=settings.WHISPER_COMPUTE_TYPE,
-                cpu_threads=2,  # Optimize for DO's 1 vCPU
-                num_workers=1,  # Single worker for memory efficiency
+                cpu_threads=settings.WHISPER_CPU_THREADS,  # Threads per worker (2 suits DO's 1 vCPU)
+                num_workers=pool_size,  # CTranslate2 replicas sharing one copy of the weights
                 download_root="/tmp/whisper_models"  # Use /tmp for DO
             )
             
+            # Every pool slot maps to one CTranslate2 worker of the shared model
+            self.pool = ModelPool([self.model] * pool_size, max_queue=settings.WHISPER_MAX_QUEUE)
+            self._warm_up()
+            
             load_time = time.time() - start_time
             self.model_loaded = True
+            self.load_error = None
             
             logger.info(f"✅ Whisper model loaded in {load_time:.2f}s")
             logger.info(f"Model: {settings.WHISPER_MODEL}")
             logger.info(f"Device: {settings.WHISPER_DEVICE}")
             logger.info(f"Compute: {settings.WHISPER_COMPUTE_TYPE}")
+            logger.info(f"Workers: {pool_size} x {settings.WHISPER_CPU_THREADS} threads, queue {settings.WHISPER_MAX_QUEUE}")
             
         except Exception as e:
             logger.error(f"Failed to load Whisper model: {e}")
             self.model_loaded = False
             self.model = None
+            self.load_error = str(e)
+    
+    def _warm_up(self):
+        """Run one short inference so the first request does not pay for lazy initialisation"""
+        try:
+            segments, _ = self.model.transcribe(
+                np.zeros(settings.SAMPLE_RATE, dtype=np.float32), language="en", beam_size=1
+            )
+            list(segments)
+        except Exception as e:
+            logger.warning(f"Whisper warm-up failed: {e}")
     
     async def transcribe_audio(self, audio_data: bytes, language: str = None) -> Dict[str, Any]:
         """
@@ -80,18 +173,65 @@ class ProductionWhisperService:
         
         Returns:
             Dict with transcription results
+        
+        Raises:
+            PoolSaturatedError: If the wait queue is full (ModelWarmingUpError while loading)
         """
+        await self._wait_for_model(admit=True)
         if not self.model_loaded or not WHISPER_AVAILABLE:
             return self._mock_transcription(len(audio_data))
         
+        return await self._transcribe_in_pool(audio_data, language)
+    
+    async def transcribe_file(self, audio_path: str, language: str = None,
+                              progress_callback: Optional[Callable[[float], None]] = None,
+                              admit: bool = True) -> Dict[str, Any]:
+        """
+        Transcribe an audio file already spooled to disk
+        
+        Args:
+            audio_path: Path to the uploaded audio file
+            language: Optional language hint (e.g., 'en', 'es')
+            progress_callback: Optional callable receiving the fraction of audio processed
+            admit: Apply pool admission control; callers with their own bounded
+                queue (the job workers) pass False and simply wait for a worker
+        
+        Returns:
+            Dict with transcription results
+        
+        Raises:
+            PoolSaturatedError: If admit is True and the wait queue is full
+                (ModelWarmingUpError while the model is still loading)
+        """
+        await self._wait_for_model(admit)
+        if not self.model_loaded or not WHISPER_AVAILABLE:
+            return self._mock_transcription(os.path.getsize(audio_path))
+        
+        return await self._transcribe_in_pool(None, language, audio_path, progress_callback, admit)
+    
+    async def _transcribe_in_pool(self, audio_data: Optional[bytes], language: str = None,
+                                  audio_path: Optional[str] = None,
+                                  progress_callback: Optional[Callable[[float], None]] = None,
+                                  admit: bool = True) -> Dict[str, Any]:
+        """Run _transcribe_sync on the pool's executor, behind admission control"""
+        if admit:
+            async with self.pool.admit():
+                return await self._run_transcription(audio_data, language, audio_path, progress_callback)
+        return await self._run_transcription(audio_data, language, audio_path, progress_callback)
+    
+    async def _run_transcription(self, audio_data: Optional[bytes], language: str = None,
+                                 audio_path: Optional[str] = None,
+                                 progress_callback: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
         try:
             # Process audio in a thread to avoid blocking
             loop = asyncio.get_event_loop()
             result = await loop.run_in_executor(
-                None, 
+                self.pool.executor,
                 self._transcribe_sync,
                 audio_data,
-                language
+                language,
+                audio_path,
+                progress_callback
             )
             return result
             
@@ -106,116 +246,185 @@ class ProductionWhisperService:
                 "error": True
             }
     
-    def _transcribe_sync(self, audio_data: bytes, language: str = None) -> Dict[str, Any]:
+    def _transcribe_sync(self, audio_data: Optional[bytes], language: str = None,
+                         audio_path: Optional[str] = None,
+                         progress_callback: Optional[Callable[[float], None]] = None) -> Dict[str, Any]:
         """Synchronous transcription processing"""
         start_time = time.time()
         
         try:
-            # Create temporary file for audio processing
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = temp_file.name
-                
-                # Convert audio data to proper format
-                audio_array = self._process_audio_data(audio_data)
-                
-                # Save as WAV file for Whisper
-                sf.write(temp_path, audio_array, settings.SAMPLE_RATE)
-                
-                # Transcribe with Whisper
-                segments, info = self.model.transcribe(
-                    temp_path,
-                    language=language,
-                    beam_size=settings.WHISPER_BEAM_SIZE,
-                    vad_filter=settings.WHISPER_VAD_FILTER,
-                    vad_parameters=dict(
-                        min_silence_duration_ms=500,
-                        max_speech_duration_s=30
-                    ),
-                    word_timestamps=True,
-                    temperature=0.0  # Deterministic output
+            # Decode straight into a float32 buffer; faster-whisper accepts arrays directly
+            audio_array = self._process_audio_data(audio_path if audio_path is not None else audio_data)
+            
+            audio_duration = len(audio_array) / settings.SAMPLE_RATE
+            
+            if self._use_long_audio_mode(audio_duration):
+                segments_list, full_text, info = self._transcribe_chunked(
+                    audio_array, language, progress_callback
                 )
-                
-                # Process segments
-                segments_list = []
-                full_text = ""
-                
-                for segment in segments:
-                    segment_dict = {
-                        "start": round(segment.start, 2),
-                        "end": round(segment.end, 2),
-                        "text": segment.text.strip(),
-                        "confidence": round(segment.avg_logprob, 3),
-                        "words": []
-                    }
-                    
-                    # Add word-level timestamps if available
-                    if hasattr(segment, 'words') and segment.words:
-                        for word in segment.words:
-                            segment_dict["words"].append({
-                                "start": round(word.start, 2),
-                                "end": round(word.end, 2),
-                                "word": word.word,
-                                "probability": round(word.probability, 3)
-                            })
-                    
-                    segments_list.append(segment_dict)
-                    full_text += segment.text
-                
-                # Calculate metrics
-                processing_time = time.time() - start_time
-                audio_duration = len(audio_array) / settings.SAMPLE_RATE
-                
-                # Update stats
-                self.total_transcription_time += processing_time
-                self.total_audio_duration += audio_duration
-                
-                # Clean up temp file
-                os.unlink(temp_path)
-                
-                result = {
-                    "text": full_text.strip(),
-                    "segments": segments_list,
-                    "language": info.language,
-                    "language_probability": round(info.language_probability, 3),
-                    "confidence": np.mean([s["confidence"] for s in segments_list]) if segments_list else 0.0,
-                    "processing_time": round(processing_time, 2),
-                    "audio_duration": round(audio_duration, 2),
-                    "real_time_factor": round(processing_time / audio_duration if audio_duration > 0 else 0, 2),
-                    "model": settings.WHISPER_MODEL,
-                    "error": False
-                }
-                
-                logger.info(f"Transcribed {audio_duration:.1f}s audio in {processing_time:.1f}s (RTF: {result['real_time_factor']:.2f})")
-                
-                return result
+            else:
+                segments_list, full_text, info = self._transcribe_array(
+                    audio_array, language, progress_callback
+                )
+            
+            # Calculate metrics
+            processing_time = time.time() - start_time
+            
+            # Update stats
+            self.total_transcription_time += processing_time
+            self.total_audio_duration += audio_duration
+            
+            result = {
+                "text": full_text.strip(),
+                "segments": segments_list,
+                "language": info["language"],
+                "language_probability": round(info["language_probability"], 3),
+                "confidence": np.mean([s["confidence"] for s in segments_list]) if segments_list else 0.0,
+                "processing_time": round(processing_time, 2),
+                "audio_duration": round(audio_duration, 2),
+                "real_time_factor": round(processing_time / audio_duration if audio_duration > 0 else 0, 2),
+                "model": settings.WHISPER_MODEL,
+                "error": False
+            }
+            
+            logger.info(f"Transcribed {audio_duration:.1f}s audio in {processing_time:.1f}s (RTF: {result['real_time_factor']:.2f})")
+            
+            return result
                 
         except Exception as e:
             logger.error(f"Sync transcription error: {e}")
             raise e
     
-    def _process_audio_data(self, audio_data: bytes) -> np.ndarray:
-        """Convert audio bytes to numpy array at correct sample rate"""
-        import tempfile
-        import os
+    def _use_long_audio_mode(self, audio_duration: float) -> bool:
+        """Chunked mode needs several model workers and a recording long enough to split"""
+        return (
+            settings.LONG_AUDIO_ENABLED
+            and self.pool.size > 1
+            and audio_duration >= settings.LONG_AUDIO_THRESHOLD_S
+        )
+    
+    def _transcribe_array(self, audio_array: np.ndarray, language: str = None,
+                          progress_callback: Optional[Callable[[float], None]] = None,
+                          options: Optional[Dict[str, Any]] = None):
+        """Single-pass transcription of a decoded array on one pool worker; returns (segments, text, info)"""
+        with self.pool.checkout() as worker:
+            if self.process_backend:
+                return worker.transcribe(audio_array, language, progress_callback, options)
+            return self._transcribe_with_model(worker.model, audio_array, language, progress_callback, options)
+    
+    def _transcribe_with_model(self, model, audio_array: np.ndarray, language: str = None,
+                               progress_callback: Optional[Callable[[float], None]] = None,
+                               options: Optional[Dict[str, Any]] = None):
+        transcribe_options = dict(
+            language=language,
+            beam_size=settings.WHISPER_BEAM_SIZE,
+            vad_filter=settings.WHISPER_VAD_FILTER,
+            vad_parameters=dict(
+                min_silence_duration_ms=500,
+                max_speech_duration_s=30
+            ),
+            word_timestamps=True,
+            temperature=0.0  # Deterministic output
+        )
+        if options:
+            transcribe_options.update(options)
         
-        temp_path = None
-        try:
-            # Create temp file with .webm extension so librosa/ffmpeg knows the format
-            with tempfile.NamedTemporaryFile(suffix='.webm', delete=False) as temp_file:
-                temp_path = temp_file.name
-                temp_file.write(audio_data)
+        # Segments are generated lazily, so the worker stays checked out while iterating
+        segments, info = model.transcribe(audio_array, **transcribe_options)
+        
+        # Process segments
+        segments_list = []
+        full_text = ""
+        
+        for segment in segments:
+            segment_dict = {
+                "start": round(segment.start, 2),
+                "end": round(segment.end, 2),
+                "text": segment.text.strip(),
+                "confidence": round(segment.avg_logprob, 3),
+                "words": []
+            }
             
-            # Use librosa to load from FILE PATH (allows ffmpeg usage)
-            audio_array, original_sr = librosa.load(
-                temp_path, 
-                sr=settings.SAMPLE_RATE,
-                mono=True,
-                dtype=np.float32
-            )
+            # Add word-level timestamps if available
+            if hasattr(segment, 'words') and segment.words:
+                for word in segment.words:
+                    segment_dict["words"].append({
+                        "start": round(word.start, 2),
+                        "end": round(word.end, 2),
+                        "word": word.word,
+                        "probability": round(word.probability, 3)
+                    })
+            
+            segments_list.append(segment_dict)
+            full_text += segment.text
+            
+            if progress_callback and info.duration:
+                progress_callback(segment.end / info.duration)
+        
+        info_dict = {
+            "language": info.language,
+            "language_probability": info.language_probability
+        }
+        return segments_list, full_text, info_dict
+    
+    def _transcribe_chunked(self, audio_array: np.ndarray, language: str = None,
+                            progress_callback: Optional[Callable[[float], None]] = None):
+        """
+        Long-audio mode: split at VAD silence boundaries, transcribe chunks in
+        parallel across free pool workers, then stitch one ordered timeline.
+        Falls back to a single pass if VAD finds fewer than two chunks.
+        """
+        sample_rate = settings.SAMPLE_RATE
+        try:
+            chunks = plan_chunks(audio_array, sample_rate, settings.LONG_AUDIO_CHUNK_S)
+        except Exception as e:
+            logger.warning(f"VAD chunking failed, using single pass: {e}")
+            chunks = []
+        
+        if len(chunks) < 2:
+            return self._transcribe_array(audio_array, language, progress_callback)
+        
+        total_samples = sum(end - start for start, end in chunks)
+        done_samples = 0
+        
+        def run_chunk(bounds, chunk_language):
+            start, end = bounds
+            segments_list, _, info = self._transcribe_array(audio_array[start:end], chunk_language)
+            return offset_segments(segments_list, start / sample_rate), info
+        
+        # Detect the language once on the first chunk so every chunk agrees
+        first_segments, info = run_chunk(chunks[0], language)
+        language = language or info["language"]
+        done_samples += chunks[0][1] - chunks[0][0]
+        if progress_callback:
+            progress_callback(done_samples / total_samples)
+        
+        futures = [
+            self._chunk_executor.submit(run_chunk, bounds, language)
+            for bounds in chunks[1:]
+        ]
+        chunk_segments = [first_segments]
+        for bounds, future in zip(chunks[1:], futures):
+            segments_list, _ = future.result()
+            chunk_segments.append(segments_list)
+            done_samples += bounds[1] - bounds[0]
+            if progress_callback:
+                progress_callback(done_samples / total_samples)
+        
+        segments_list, full_text = stitch_chunks(chunk_segments)
+        self.chunked_transcriptions += 1
+        logger.info(f"Long-audio mode: {len(chunks)} chunks across {self.pool.size} workers")
+        return segments_list, full_text, info
+    
+    def _process_audio_data(self, audio_source: Union[bytes, str]) -> np.ndarray:
+        """Convert audio bytes (or a file path) to a numpy array at the correct sample rate"""
+        try:
+            audio_array = decode_audio(audio_source, settings.SAMPLE_RATE)
             
             # Normalize audio
-            if audio_array.max() > 0:
-                audio_array = audio_array / audio_array.max() * 0.95
+            peak = audio_array.max() if audio_array.size else 0
+            if peak > 0:
+                audio_array = audio_array * np.float32(0.95 / peak)
             
             return audio_array
             
@@ -223,13 +432,6 @@ class ProductionWhisperService:
             logger.error(f"Audio processing error: {e}")
             # Return silence if processing fails
             return np.zeros(settings.SAMPLE_RATE * 1, dtype=np.float32)  # 1 second of silence
-        finally:
-            # Clean up temp file
-            if temp_path and os.path.exists(temp_path):
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
     
     def _mock_transcription(self, audio_size: int) -> Dict[str, Any]:
         """Mock transcription for testing/fallback"""
@@ -265,6 +467,33 @@ class ProductionWhisperService:
             "mock": True
         }
     
+    def transcribe_stream_window(self, audio_array: np.ndarray, language: str = None,
+                                 initial_prompt: Optional[str] = None):
+        """
+        Transcribe one live-stream buffer window (blocking)
+        
+        Greedy decoding and no conditioning on the window's own earlier text keep
+        latency low; committed text from before the window is passed as the prompt.
+        """
+        if not self.model_loaded or not WHISPER_AVAILABLE:
+            raise RuntimeError("Whisper model is not loaded")
+        return self._transcribe_array(audio_array, language, options=dict(
+            beam_size=settings.STREAM_BEAM_SIZE,
+            initial_prompt=initial_prompt,
+            condition_on_previous_text=False
+        ))
+    
+    def create_stream_session(self, language: str = None) -> StreamingSession:
+        """New rolling-buffer session for a live connection"""
+        return StreamingSession(
+            self.transcribe_stream_window,
+            sample_rate=settings.SAMPLE_RATE,
+            language=language,
+            min_chunk_s=settings.STREAM_MIN_CHUNK_S,
+            buffer_trim_s=settings.STREAM_BUFFER_TRIM_S,
+            max_buffer_s=settings.STREAM_MAX_BUFFER_S
+        )
+    
     async def transcribe_chunk(self, audio_chunk: bytes, chunk_id: int = 0) -> Dict[str, Any]:
         """Transcribe a streaming audio chunk"""
         result = await self.transcribe_audio(audio_chunk)
@@ -272,6 +501,15 @@ class ProductionWhisperService:
         result["timestamp"] = time.time()
         return result
     
+    def cache_signature(self) -> str:
+        """Settings that change transcription output, for result cache keys"""
+        if not WHISPER_AVAILABLE:
+            return "mock"
+        return (
+            f"faster-whisper:{settings.WHISPER_MODEL}:{settings.WHISPER_COMPUTE_TYPE}"
+            f":beam{settings.WHISPER_BEAM_SIZE}:vad{int(settings.WHISPER_VAD_FILTER)}"
+        )
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get transcription service statistics"""
         avg_rtf = (self.total_transcription_time / self.total_audio_duration 
@@ -279,14 +517,28 @@ class ProductionWhisperService:
         
         return {
             "model_loaded": self.model_loaded,
+            "load_status": self.load_status(),
+            "load_error": self.load_error,
             "whisper_available": WHISPER_AVAILABLE,
             "model": settings.WHISPER_MODEL if self.model_loaded else "none",
             "total_audio_hours": round(self.total_audio_duration / 3600, 2),
             "total_processing_time": round(self.total_transcription_time, 2),
             "average_real_time_factor": round(avg_rtf, 3),
             "device": settings.WHISPER_DEVICE,
-            "compute_type": settings.WHISPER_COMPUTE_TYPE
+            "compute_type": settings.WHISPER_COMPUTE_TYPE,
+            "num_workers": self.pool.size if self.pool else 0,
+            "cpu_threads": settings.WHISPER_CPU_THREADS,
+            "chunked_transcriptions": self.chunked_transcriptions,
+            "backend": "process" if self.process_backend else "thread",
+            "pool": self.pool.get_stats() if self.pool else None
         }
+    
+    def shutdown(self):
+        """Stop pool threads and, for the process backend, the worker processes"""
+        if self.pool:
+            self.pool.shutdown()
+        if self._chunk_executor:
+            self._chunk_executor.shutdown(wait=False, cancel_futures=True)
 
 
 # Global instance
@@ -0,0 +1,346 @@
+"""
+Real-time streaming transcription
+Keeps a rolling audio buffer per connection, re-transcribes it as audio
+arrives and commits words once two consecutive hypotheses agree on them
+(LocalAgreement-2). Clients get low-latency partial text plus stable finals.
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.services.audio_decode import FFMPEG_BINARY
+
+logger = logging.getLogger(__name__)
+
+STREAM_FORMATS = ("pcm_s16le", "pcm_f32le", "webm", "ogg")
+
+# Committed text fed back to Whisper as context for the next window
+PROMPT_CHARS = 200
+
+# (start, end, word) on the recording timeline
+Word = Tuple[float, float, str]
+
+
+class StreamDecoder:
+    """Turns incoming binary frames into mono float32 samples at the target rate"""
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        raise NotImplementedError
+
+    async def close(self) -> np.ndarray:
+        """Flush whatever is still buffered and release resources"""
+        return np.zeros(0, dtype=np.float32)
+
+
+class PCMStreamDecoder(StreamDecoder):
+    """Raw little-endian PCM frames; resampled linearly if the client rate differs"""
+
+    def __init__(self, format: str, input_rate: int, sample_rate: int):
+        self.dtype = np.int16 if format == "pcm_s16le" else np.float32
+        self.input_rate = input_rate
+        self.sample_rate = sample_rate
+        self._remainder = b""
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        data = self._remainder + data
+        item_size = np.dtype(self.dtype).itemsize
+        usable = len(data) - len(data) % item_size
+        # Frames are not guaranteed to end on a sample boundary
+        self._remainder = data[usable:]
+
+        samples = np.frombuffer(data[:usable], dtype=self.dtype)
+        if self.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+        if self.input_rate != self.sample_rate and samples.size:
+            n_out = int(round(samples.size * self.sample_rate / self.input_rate))
+            positions = np.linspace(0, samples.size - 1, n_out)
+            samples = np.interp(positions, np.arange(samples.size), samples).astype(np.float32)
+        return samples
+
+
+class FFmpegStreamDecoder(StreamDecoder):
+    """Containerised Opus (WebM/Ogg, as MediaRecorder produces) decoded by a long-lived ffmpeg"""
+
+    def __init__(self, format: str, sample_rate: int):
+        self.format = "matroska" if format == "webm" else format
+        self.sample_rate = sample_rate
+        self.process = None
+        self._reader: Optional[asyncio.Task] = None
+        self._decoded: List[bytes] = []
+        self._remainder = b""
+
+    async def _start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+            # Start decoding as soon as the header arrives instead of probing megabytes
+            "-probesize", "32768", "-analyzeduration", "0", "-fflags", "nobuffer",
+            "-f", self.format, "-i", "pipe:0",
+            "-f", "f32le", "-acodec", "pcm_f32le", "-ac", "1", "-ar", str(self.sample_rate),
+            "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        self._reader = asyncio.create_task(self._read_output())
+
+    async def _read_output(self):
+        while True:
+            chunk = await self.process.stdout.read(16384)
+            if not chunk:
+                return
+            self._decoded.append(chunk)
+
+    def _take(self) -> np.ndarray:
+        data = self._remainder + b"".join(self._decoded)
+        self._decoded = []
+        usable = len(data) - len(data) % 4
+        self._remainder = data[usable:]
+        return np.frombuffer(data[:usable], dtype=np.float32)
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        if self.process is None:
+            await self._start()
+        try:
+            self.process.stdin.write(data)
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise ValueError(f"ffmpeg could not decode the {self.format} stream")
+        # Let the reader pick up output produced for earlier frames
+        await asyncio.sleep(0)
+        return self._take()
+
+    async def close(self) -> np.ndarray:
+        if self.process is None:
+            return np.zeros(0, dtype=np.float32)
+        try:
+            self.process.stdin.close()
+            await asyncio.wait_for(self._reader, timeout=10)
+        except (asyncio.TimeoutError, BrokenPipeError, ConnectionResetError):
+            self._reader.cancel()
+        if self.process.returncode is None:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+            await self.process.wait()
+        return self._take()
+
+
+def create_decoder(format: str, input_rate: int, sample_rate: int) -> StreamDecoder:
+    """
+    Decoder for one of STREAM_FORMATS
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if format in ("pcm_s16le", "pcm_f32le"):
+        return PCMStreamDecoder(format, input_rate, sample_rate)
+    if format in ("webm", "ogg"):
+        return FFmpegStreamDecoder(format, sample_rate)
+    raise ValueError(f"Unsupported stream format '{format}', expected one of {', '.join(STREAM_FORMATS)}")
+
+
+def _normalise(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+class HypothesisBuffer:
+    """
+    LocalAgreement-2 commit policy
+
+    Each new hypothesis for the buffered audio is compared with the previous
+    one; the longest common word prefix is stable and gets committed, the
+    rest stays a partial until the next hypothesis confirms or replaces it.
+    """
+
+    def __init__(self):
+        self.committed_in_buffer: List[Word] = []
+        self.previous: List[Word] = []
+        self.new: List[Word] = []
+        self.last_committed_time = 0.0
+
+    def insert(self, words: List[Word]):
+        # Words that end before the commit point were already emitted
+        self.new = [w for w in words if w[0] > self.last_committed_time - 0.1]
+
+        # Whisper often repeats the tail of committed text at the start of the
+        # window; drop the longest repeated n-gram (up to 5 words)
+        if self.new and self.committed_in_buffer and abs(self.new[0][0] - self.last_committed_time) < 1:
+            tail = [_normalise(w[2]) for w in self.committed_in_buffer[-5:]]
+            head = [_normalise(w[2]) for w in self.new[:5]]
+            for n in range(min(len(tail), len(head)), 0, -1):
+                if tail[-n:] == head[:n]:
+                    self.new = self.new[n:]
+                    break
+
+    def flush(self) -> List[Word]:
+        """Commit the prefix the last two hypotheses agree on"""
+        committed = []
+        while self.new and self.previous and _normalise(self.new[0][2]) == _normalise(self.previous[0][2]):
+            word = self.new.pop(0)
+            self.previous.pop(0)
+            committed.append(word)
+            self.last_committed_time = word[1]
+        self.previous = self.new
+        self.new = []
+        self.committed_in_buffer.extend(committed)
+        return committed
+
+    def force(self, until: float) -> List[Word]:
+        """Commit every hypothesised word ending by `until`, agreed or not"""
+        committed = [w for w in self.previous if w[1] <= until]
+        self.previous = self.previous[len(committed):]
+        if committed:
+            self.last_committed_time = committed[-1][1]
+            self.committed_in_buffer.extend(committed)
+        return committed
+
+    def skip_to(self, time: float):
+        """Move the commit point to `time` without committing anything (audio with no words in it)"""
+        if time <= self.last_committed_time:
+            return
+        self.last_committed_time = time
+        self.previous = [w for w in self.previous if w[0] >= time]
+
+    def drop_before(self, time: float):
+        self.committed_in_buffer = [w for w in self.committed_in_buffer if w[1] > time]
+
+    def uncommitted(self) -> List[Word]:
+        return self.previous
+
+
+class StreamingSession:
+    """
+    Rolling-buffer transcription state for one live connection
+
+    `transcribe(audio, language, initial_prompt)` is a blocking callable that
+    returns (segments, text, info) with buffer-relative word timestamps; it
+    runs on a thread so the event loop keeps receiving audio meanwhile.
+    """
+
+    def __init__(self, transcribe: Callable[..., Tuple[List[Dict[str, Any]], str, Dict[str, Any]]],
+                 sample_rate: int = 16000, language: Optional[str] = None,
+                 min_chunk_s: float = 1.0, buffer_trim_s: float = 15.0, max_buffer_s: float = 30.0):
+        self.transcribe = transcribe
+        self.sample_rate = sample_rate
+        self.language = language
+        self.min_chunk_s = min_chunk_s
+        self.buffer_trim_s = buffer_trim_s
+        self.max_buffer_s = max_buffer_s
+
+        self.audio = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0  # Recording time of audio[0]
+        self.received_samples = 0
+        self.processed_samples = 0  # received_samples covered by the last completed pass
+        self.hypothesis = HypothesisBuffer()
+        self.committed: List[Word] = []
+        self.iterations = 0
+        self._audio_event = asyncio.Event()
+
+    @property
+    def duration(self) -> float:
+        return self.received_samples / self.sample_rate
+
+    @property
+    def buffer_duration(self) -> float:
+        return len(self.audio) / self.sample_rate
+
+    def append(self, samples: np.ndarray):
+        if samples.size == 0:
+            return
+        self.audio = np.concatenate([self.audio, samples.astype(np.float32, copy=False)])
+        self.received_samples += samples.size
+        self._audio_event.set()
+
+    async def wait_for_audio(self):
+        """Return once at least `min_chunk_s` of unprocessed audio is buffered"""
+        while self.received_samples - self.processed_samples < self.min_chunk_s * self.sample_rate:
+            self._audio_event.clear()
+            await self._audio_event.wait()
+
+    def _prompt(self) -> Optional[str]:
+        # Context from words that have already left the buffer
+        text = "".join(w[2] for w in self.committed if w[1] <= self.buffer_offset)
+        return text[-PROMPT_CHARS:] or None
+
+    def _run_window(self, audio: np.ndarray, offset: float) -> List[Word]:
+        segments, _, info = self.transcribe(audio, self.language, self._prompt())
+        if self.language is None and info.get("language"):
+            # Pin the detected language so later windows never flip
+            self.language = info["language"]
+        return [
+            (round(w["start"] + offset, 2), round(w["end"] + offset, 2), w["word"])
+            for segment in segments
+            for w in segment["words"]
+        ]
+
+    async def process(self) -> Dict[str, List[Word]]:
+        """
+        Transcribe the current buffer and advance the commit point
+
+        Returns:
+            {"committed": newly final words, "partial": current uncommitted words}
+        """
+        if self.audio.size == 0:
+            return {"committed": [], "partial": []}
+
+        audio, offset, received = self.audio, self.buffer_offset, self.received_samples
+        loop = asyncio.get_event_loop()
+        words = await loop.run_in_executor(None, self._run_window, audio, offset)
+        # Only advanced once the pass completes, so a cancelled pass is redone by finish()
+        self.processed_samples = received
+        self.iterations += 1
+
+        self.hypothesis.insert(words)
+        committed = self.hypothesis.flush()
+
+        buffer_end = offset + len(audio) / self.sample_rate
+        if not committed and buffer_end - self.buffer_offset > self.max_buffer_s:
+            # Hypotheses keep disagreeing; bound latency and compute anyway
+            committed = self.hypothesis.force(buffer_end - self.min_chunk_s)
+            if buffer_end - self.hypothesis.last_committed_time > self.max_buffer_s:
+                # Silence or no words at all: nothing to commit, so drop the audio regardless
+                self.hypothesis.skip_to(buffer_end - self.buffer_trim_s)
+
+        self.committed.extend(committed)
+        self._trim()
+        return {"committed": committed, "partial": self.hypothesis.uncommitted()}
+
+    def _trim(self):
+        """Drop committed audio once the buffer grows past `buffer_trim_s`"""
+        if self.buffer_duration <= self.buffer_trim_s:
+            return
+        cut_time = self.hypothesis.last_committed_time
+        cut = int((cut_time - self.buffer_offset) * self.sample_rate)
+        if cut <= 0:
+            return
+        self.audio = self.audio[cut:]
+        self.buffer_offset = cut_time
+        self.hypothesis.drop_before(cut_time)
+
+    async def finish(self) -> List[Word]:
+        """Run a last pass over the remaining audio and commit everything left"""
+        committed = []
+        if self.received_samples > self.processed_samples:
+            committed = (await self.process())["committed"]
+        remaining = self.hypothesis.force(float("inf"))
+        self.committed.extend(remaining)
+        return committed + remaining
+
+    def text(self) -> str:
+        return "".join(w[2] for w in self.committed).strip()
+
+
+def words_message(kind: str, words: List[Word]) -> Dict[str, Any]:
+    """Client message for a run of words ("partial" or "final")"""
+    return {
+        "type": kind,
+        "text": "".join(w[2] for w in words).strip(),
+        "start": words[0][0] if words else None,
+        "end": words[-1][1] if words else None,
+        "words": [{"start": s, "end": e, "word": w} for s, e, w in words]
+    }
@@ -0,0 +1,212 @@
+"""
+Incremental parsing of streamed summary JSON
+The model streams `{"summary": "...", "key_points": [...], "action_items": [...]}`
+a few characters at a time. The parser turns that into events as soon as
+their text is known: summary text deltas, and each list item once its
+closing quote arrives. Text before the opening brace and unknown keys are
+ignored.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+LIST_FIELDS = ("key_points", "action_items")
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# Scanner states
+_BEFORE = "before"            # Waiting for the opening brace
+_KEY = "key"                  # Expecting a key or the closing brace
+_KEY_STRING = "key_string"
+_COLON = "colon"
+_VALUE = "value"              # Expecting a value for the current key
+_STRING = "string"            # Inside a top-level string value
+_ARRAY = "array"              # Inside a top-level array, expecting an item or ']'
+_ITEM_STRING = "item_string"
+_SKIP = "skip"                # Inside a value we don't care about
+_AFTER_VALUE = "after_value"  # Expecting ',' or the closing brace
+_DONE = "done"
+
+
+class SummaryStreamParser:
+    """
+    Feed streamed text chunks; get summary events back
+
+    Events are dicts:
+        {"type": "summary", "delta": text}
+        {"type": "key_point" | "action_item", "index": i, "text": text}
+    """
+
+    def __init__(self):
+        self.state = _BEFORE
+        self.key = ""
+        self.fields: Dict[str, Any] = {"summary": "", "key_points": [], "action_items": []}
+        self.raw: List[str] = []
+        self._buffer = ""          # Current string being built
+        self._escape: Optional[str] = None  # None, "" after a backslash, or collected \u hex digits
+        self._return_state = _VALUE
+        self._skip_depth = 0
+        self._skip_in_string = False
+        self._skip_escape = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self.raw.append(chunk)
+        events: List[Dict[str, Any]] = []
+        summary_start = len(self.fields["summary"])
+        for char in chunk:
+            self._step(char, events)
+        if len(self.fields["summary"]) > summary_start:
+            events.insert(0, {"type": "summary", "delta": self.fields["summary"][summary_start:]})
+        return events
+
+    @property
+    def text(self) -> str:
+        return "".join(self.raw)
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """The complete object if the stream contained valid JSON, else whatever was parsed"""
+        text = self.text
+        start, end = text.find("{"), text.rfind("}") + 1
+        if start != -1 and end > start:
+            try:
+                return json.loads(text[start:end])
+            except json.JSONDecodeError:
+                pass
+        if self.state == _BEFORE:
+            return None
+        return dict(self.fields)
+
+    def _string_char(self, char: str) -> Optional[bool]:
+        """
+        Consume one character of a JSON string
+
+        Returns:
+            True when the closing quote was read, False for a decoded
+            character appended to the buffer, None mid-escape
+        """
+        if self._escape is not None:
+            if self._escape == "" and char != "u":
+                self._buffer += _ESCAPES.get(char, char)
+                self._escape = None
+                return False
+            if char == "u" and self._escape == "":
+                self._escape = "u"
+                return None
+            self._escape += char
+            if len(self._escape) == 5:
+                try:
+                    self._buffer += chr(int(self._escape[1:], 16))
+                except ValueError:
+                    pass
+                self._escape = None
+                return False
+            return None
+        if char == "\\":
+            self._escape = ""
+            return None
+        if char == '"':
+            return True
+        self._buffer += char
+        return False
+
+    def _step(self, char: str, events: List[Dict[str, Any]]):
+        state = self.state
+        if state == _BEFORE:
+            if char == "{":
+                self.state = _KEY
+        elif state == _KEY:
+            if char == '"':
+                self._buffer = ""
+                self.state = _KEY_STRING
+            elif char == "}":
+                self.state = _DONE
+        elif state == _KEY_STRING:
+            if self._string_char(char):
+                self.key = self._buffer
+                self.state = _COLON
+        elif state == _COLON:
+            if char == ":":
+                self.state = _VALUE
+        elif state == _VALUE:
+            if char.isspace():
+                return
+            if char == '"' and self.key == "summary":
+                self.fields["summary"] = ""
+                self._buffer = ""
+                self.state = _STRING
+            elif char == "[" and self.key in LIST_FIELDS:
+                self.fields[self.key] = []
+                self.state = _ARRAY
+            else:
+                self._return_state = _AFTER_VALUE
+                self._start_skip(char)
+        elif state == _STRING:
+            before = len(self._buffer)
+            closed = self._string_char(char)
+            if len(self._buffer) > before:
+                self.fields["summary"] += self._buffer[before:]
+            if closed:
+                self.state = _AFTER_VALUE
+        elif state == _ARRAY:
+            if char == '"':
+                self._buffer = ""
+                self.state = _ITEM_STRING
+            elif char == "]":
+                self.state = _AFTER_VALUE
+            elif not (char.isspace() or char == ","):
+                self._return_state = _ARRAY
+                self._start_skip(char)
+        elif state == _ITEM_STRING:
+            if self._string_char(char):
+                items = self.fields[self.key]
+                items.append(self._buffer)
+                events.append({
+                    "type": "key_point" if self.key == "key_points" else "action_item",
+                    "index": len(items) - 1,
+                    "text": self._buffer
+                })
+                self.state = _ARRAY
+        elif state == _SKIP:
+            self._skip_char(char)
+        elif state == _AFTER_VALUE:
+            if char == ",":
+                self.state = _KEY
+            elif char == "}":
+                self.state = _DONE
+
+    def _start_skip(self, char: str):
+        """Skip a value of a type we don't surface (numbers, objects, non-string items...)"""
+        self.state = _SKIP
+        self._skip_depth = 0
+        self._skip_in_string = False
+        self._skip_escape = False
+        self._skip_char(char)
+
+    def _skip_char(self, char: str):
+        if self._skip_in_string:
+            if self._skip_escape:
+                self._skip_escape = False
+            elif char == "\\":
+                self._skip_escape = True
+            elif char == '"':
+                self._skip_in_string = False
+                if self._skip_depth == 0:
+                    self.state = self._return_state
+            return
+        if char == '"':
+            self._skip_in_string = True
+        elif char in "[{":
+            self._skip_depth += 1
+        elif char in "]}":
+            if self._skip_depth == 0:
+                # Closing the container we were in: hand the character back
+                self.state = self._return_state
+                self._step(char, [])
+                return
+            self._skip_depth -= 1
+            if self._skip_depth == 0:
+                self.state = self._return_state
+        elif char == "," and self._skip_depth == 0:
+            # End of a scalar
+            self.state = self._return_state
+            self._step(char, [])
@@ -0,0 +1,334 @@
+"""
+Resumable chunked uploads
+Each session preallocates one spool file and records received chunks in a
+manifest, so a dropped connection only costs the chunks in flight. Clients ask
+which chunks are missing, re-send those, then finalize.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: manifests are only locked within one process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_OPEN = "open"
+UPLOAD_FINALIZING = "finalizing"
+UPLOAD_FINALIZED = "finalized"
+
+
+class UploadSessionError(Exception):
+    """Raised for invalid upload session operations; carries the HTTP status to report"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class UploadSessionStore:
+    """
+    Upload sessions on disk: `<root>/<id>/manifest.json` plus `<root>/<id>/audio`
+
+    Chunk `i` always covers bytes [i * chunk_size, min((i + 1) * chunk_size, total_size)),
+    and is written in place at that offset, so finalizing needs no concatenation.
+    Manifest updates hold a file lock on the session directory, so server
+    processes sharing `root_dir` see each other's changes.
+    """
+
+    def __init__(self, root_dir: str, max_size: int, max_chunk_size: int, ttl_seconds: float,
+                 finalize_timeout_s: float = 300):
+        self.root_dir = root_dir
+        self.max_size = max_size
+        self.max_chunk_size = max_chunk_size
+        self.ttl_seconds = ttl_seconds
+        self.finalize_timeout_s = finalize_timeout_s
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _dir(self, upload_id: str) -> str:
+        # Ids are generated here; reject anything that could escape root_dir
+        if not upload_id or os.path.basename(upload_id) != upload_id or upload_id.startswith("."):
+            raise UploadSessionError("Upload not found", 404)
+        return os.path.join(self.root_dir, upload_id)
+
+    def _audio_path(self, upload_id: str) -> str:
+        return os.path.join(self._dir(upload_id), "audio")
+
+    def _lock(self, upload_id: str) -> asyncio.Lock:
+        if upload_id not in self._locks:
+            self._locks[upload_id] = asyncio.Lock()
+        return self._locks[upload_id]
+
+    @asynccontextmanager
+    async def _locked(self, upload_id: str):
+        """Exclusive access to a session's manifest, within this process and across processes"""
+        async with self._lock(upload_id):
+            if fcntl is None:
+                yield
+                return
+            try:
+                fd = os.open(os.path.join(self._dir(upload_id), "lock"), os.O_RDWR | os.O_CREAT)
+            except FileNotFoundError:
+                raise UploadSessionError("Upload not found", 404)
+            try:
+                # Non-blocking attempts, so waiting never ties up a thread and can be cancelled
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(0.01)
+                yield
+            finally:
+                os.close(fd)  # Releases the lock
+
+    def _read_manifest(self, upload_id: str) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self._dir(upload_id), "manifest.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadSessionError("Upload not found", 404)
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        manifest["updated_at"] = time.time()
+        path = os.path.join(self._dir(manifest["id"]), "manifest.json")
+        # Write-then-rename so a crash never leaves a truncated manifest
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(path + ".tmp", path)
+
+    def create(self, total_size: int, chunk_size: int,
+               title: Optional[str], format: Optional[str]) -> Dict[str, Any]:
+        """Start a session and preallocate its spool file"""
+        if total_size <= 0:
+            raise UploadSessionError("total_size must be positive")
+        if total_size > self.max_size:
+            raise UploadSessionError(f"Upload exceeds {self.max_size} bytes", 413)
+        if not 0 < chunk_size <= self.max_chunk_size:
+            raise UploadSessionError(f"chunk_size must be between 1 and {self.max_chunk_size} bytes")
+
+        self.cleanup_expired()
+
+        upload_id = str(uuid.uuid4())
+        os.makedirs(self._dir(upload_id))
+        with open(self._audio_path(upload_id), "wb") as f:
+            # Sparse on most filesystems; chunks fill it in place
+            f.truncate(total_size)
+
+        now = time.time()
+        manifest = {
+            "id": upload_id,
+            "status": UPLOAD_OPEN,
+            "title": title,
+            "format": format,
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "total_chunks": -(-total_size // chunk_size),
+            "chunks": {},
+            "result": None,
+            "created_at": now,
+            "updated_at": now
+        }
+        self._write_manifest(manifest)
+        logger.info(f"📦 Upload session {upload_id}: {total_size} bytes in {manifest['total_chunks']} chunks")
+        return manifest
+
+    def get(self, upload_id: str) -> Dict[str, Any]:
+        return self._read_manifest(upload_id)
+
+    def chunk_bounds(self, manifest: Dict[str, Any], index: int):
+        if not 0 <= index < manifest["total_chunks"]:
+            raise UploadSessionError(f"Chunk index must be between 0 and {manifest['total_chunks'] - 1}")
+        start = index * manifest["chunk_size"]
+        return start, min(start + manifest["chunk_size"], manifest["total_size"])
+
+    async def write_chunk(self, upload_id: str, index: int, offset: Optional[int],
+                          body: AsyncIterator[bytes], expected_sha256: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Write chunk `index` from a streamed request body; re-sending a chunk overwrites it
+
+        Args:
+            offset: Byte offset the client believes the chunk starts at (checked if given)
+            expected_sha256: Optional hex digest the chunk must match
+
+        Returns:
+            The updated manifest
+        """
+        manifest = self._read_manifest(upload_id)
+        if manifest["status"] != UPLOAD_OPEN:
+            raise UploadSessionError("Upload already finalized", 409)
+        start, end = self.chunk_bounds(manifest, index)
+        if offset is not None and offset != start:
+            raise UploadSessionError(f"Chunk {index} starts at offset {start}, not {offset}")
+
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            fd = os.open(self._audio_path(upload_id), os.O_WRONLY)
+        except FileNotFoundError:
+            raise UploadSessionError("Upload already finalized", 409)
+        try:
+            async for data in body:
+                if start + written + len(data) > end:
+                    raise UploadSessionError(f"Chunk {index} must be exactly {end - start} bytes")
+                os.pwrite(fd, data, start + written)
+                written += len(data)
+                digest.update(data)
+
+            if written != end - start:
+                raise UploadSessionError(f"Chunk {index} must be exactly {end - start} bytes, got {written}")
+            chunk_sha256 = digest.hexdigest()
+            if expected_sha256 and expected_sha256.lower() != chunk_sha256:
+                raise UploadSessionError(f"Chunk {index} checksum mismatch")
+        except BaseException:
+            # A failed re-send may have overwritten a good copy; make the client send it again
+            async with self._locked(upload_id):
+                manifest = self._read_manifest(upload_id)
+                if manifest["chunks"].pop(str(index), None):
+                    self._write_manifest(manifest)
+            raise
+        finally:
+            os.close(fd)
+
+        # Chunks may arrive in parallel; serialise manifest updates per session
+        async with self._locked(upload_id):
+            manifest = self._read_manifest(upload_id)
+            manifest["chunks"][str(index)] = {"size": written, "sha256": chunk_sha256}
+            self._write_manifest(manifest)
+        return manifest
+
+    def progress(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """Received/missing chunk indices and byte counts for a status response"""
+        received = sorted(int(i) for i in manifest["chunks"])
+        received_set = set(received)
+        missing = [i for i in range(manifest["total_chunks"]) if i not in received_set]
+        # Bytes available from the start of the recording without gaps
+        contiguous = missing[0] * manifest["chunk_size"] if missing else manifest["total_size"]
+        return {
+            "upload_id": manifest["id"],
+            "status": manifest["status"],
+            "total_size": manifest["total_size"],
+            "chunk_size": manifest["chunk_size"],
+            "total_chunks": manifest["total_chunks"],
+            "received_chunks": received,
+            "missing_chunks": missing,
+            "received_bytes": sum(c["size"] for c in manifest["chunks"].values()),
+            "contiguous_bytes": min(contiguous, manifest["total_size"]),
+            "complete": not missing,
+            "result": manifest["result"]
+        }
+
+    async def finalize(self, upload_id: str, destination_dir: str) -> Dict[str, Any]:
+        """
+        Check every chunk arrived, hash the assembled file and move it into `destination_dir`
+
+        Returns:
+            The manifest with "sha256" and "audio_path" set and status "finalizing";
+            call mark_finalized once the file has been handed off, or restore_audio
+            if that failed. An already finalized session is returned unchanged.
+        """
+        async with self._locked(upload_id):
+            manifest = self._read_manifest(upload_id)
+            if manifest["status"] == UPLOAD_FINALIZED:
+                return manifest
+            if manifest["status"] == UPLOAD_FINALIZING:
+                if time.time() - manifest["updated_at"] < self.finalize_timeout_s:
+                    raise UploadSessionError("Upload is already being finalized", 409)
+                manifest = self._reopen(manifest)
+            progress = self.progress(manifest)
+            if progress["missing_chunks"]:
+                raise UploadSessionError(
+                    f"{len(progress['missing_chunks'])} chunks missing", 409
+                )
+
+            audio_path = self._audio_path(upload_id)
+            manifest["sha256"] = await asyncio.to_thread(_file_sha256, audio_path)
+            os.makedirs(destination_dir, exist_ok=True)
+            destination = os.path.join(destination_dir, f"{upload_id}.{manifest['format'] or 'webm'}")
+            os.replace(audio_path, destination)
+            manifest["audio_path"] = destination
+            manifest["status"] = UPLOAD_FINALIZING
+            self._write_manifest(manifest)
+            return manifest
+
+    def _reopen(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reopen a session whose finalize never reached mark_finalized or restore_audio
+        (the process died), so it can be finalized again
+
+        Should its job have been queued after all, re-finalizing queues a second
+        job for the same audio; the alternative is a session stuck for good.
+        """
+        upload_id, stuck_since = manifest["id"], manifest["updated_at"]
+        moved_path = manifest.get("audio_path")
+        if moved_path and os.path.exists(moved_path):
+            os.replace(moved_path, self._audio_path(upload_id))
+        else:
+            # Already transcribed and deleted, or lost: every chunk has to be sent again
+            with open(self._audio_path(upload_id), "wb") as f:
+                f.truncate(manifest["total_size"])
+            manifest["chunks"] = {}
+        manifest["status"] = UPLOAD_OPEN
+        self._write_manifest(manifest)
+        logger.warning(f"⚠️ Reopened upload {upload_id}, stuck finalizing for {time.time() - stuck_since:.0f}s")
+        return manifest
+
+    async def restore_audio(self, upload_id: str, moved_path: str):
+        """Undo finalize's move when the hand-off failed, so finalize can be retried"""
+        async with self._locked(upload_id):
+            os.replace(moved_path, self._audio_path(upload_id))
+            manifest = self._read_manifest(upload_id)
+            manifest["status"] = UPLOAD_OPEN
+            self._write_manifest(manifest)
+
+    async def mark_finalized(self, upload_id: str, result: Dict[str, Any]):
+        """Record what the finalized upload turned into, so a repeated finalize returns it"""
+        async with self._locked(upload_id):
+            manifest = self._read_manifest(upload_id)
+            manifest["status"] = UPLOAD_FINALIZED
+            manifest["result"] = result
+            self._write_manifest(manifest)
+
+    def delete(self, upload_id: str):
+        path = self._dir(upload_id)
+        if not os.path.isdir(path):
+            raise UploadSessionError("Upload not found", 404)
+        shutil.rmtree(path, ignore_errors=True)
+        self._locks.pop(upload_id, None)
+
+    def cleanup_expired(self) -> int:
+        """Remove sessions (and their partial audio) untouched for longer than the TTL"""
+        if not os.path.isdir(self.root_dir):
+            return 0
+        cutoff = time.time() - self.ttl_seconds
+        removed = 0
+        for upload_id in os.listdir(self.root_dir):
+            manifest_path = os.path.join(self.root_dir, upload_id, "manifest.json")
+            try:
+                if os.path.getmtime(manifest_path) < cutoff:
+                    shutil.rmtree(os.path.join(self.root_dir, upload_id), ignore_errors=True)
+                    self._locks.pop(upload_id, None)
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            logger.info(f"🧹 Removed {removed} expired upload sessions")
+        return removed
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1024 * 1024):
+            digest.update(block)
+    return digest.hexdigest()
@@ -14,6 +14,7 @@ import soundfile as sf
 from io import BytesIO
 
 from app.core.config import settings
+from app.services.model_pool import ModelPool, default_pool_size
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +24,8 @@ class WhisperService:
     
     def __init__(self):
         self.model: Optional[WhisperModel] = None
+        self.pool: Optional[ModelPool] = None
         self.ready = False
-        self.lock = asyncio.Lock()
     
     async def initialize(self):
         """Initialize the Whisper model"""
@@ -35,14 +36,21 @@ class WhisperService:
             # Models: tiny, base, small, medium, large-v2, large-v3
             # Device: cpu or cuda
             # Compute type: int8, float16, float32
+            # num_workers: concurrent transcriptions, each on its own CTranslate2 replica
+            pool_size = settings.WHISPER_NUM_WORKERS or default_pool_size(
+                settings.WHISPER_MODEL, settings.WHISPER_CPU_THREADS
+            )
             self.model = WhisperModel(
                 settings.WHISPER_MODEL,
                 device=settings.WHISPER_DEVICE,
-                compute_type=settings.WHISPER_COMPUTE_TYPE
+                compute_type=settings.WHISPER_COMPUTE_TYPE,
+                cpu_threads=settings.WHISPER_CPU_THREADS,
+                num_workers=pool_size
             )
+            self.pool = ModelPool([self.model] * pool_size, max_queue=settings.WHISPER_MAX_QUEUE)
             
             self.ready = True
-            logger.info("Whisper model loaded successfully")
+            logger.info(f"Whisper model loaded successfully ({pool_size} workers)")
             
         except Exception as e:
             logger.error(f"Failed to load Whisper model: {str(e)}")
@@ -63,14 +71,28 @@ class WhisperService:
         
         Returns:
             Dictionary with transcription results
+        
+        Raises:
+            PoolSaturatedError: If every worker is busy and the wait queue is full
         """
         if not self.is_ready():
             raise RuntimeError("Whisper model not initialized")
         
+        async with self.pool.admit():
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(
+                self.pool.executor,
+                self._transcribe_file_sync,
+                audio_path,
+                language
+            )
+    
+    def _transcribe_file_sync(self, audio_path: str, language: str) -> Dict[str, Any]:
+        """Run faster-whisper on one pool worker (called from the pool executor)"""
         try:
-            async with self.lock:
+            with self.pool.checkout() as worker:
                 # Transcribe with faster-whisper
-                segments, info = self.model.transcribe(
+                segments, info = worker.model.transcribe(
                     audio_path,
                     language=language,
                     beam_size=5,
@@ -168,8 +190,19 @@ class WhisperService:
         finally:
             os.unlink(tmp_path)
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Get model pool statistics"""
+        return {
+            "ready": self.is_ready(),
+            "model": settings.WHISPER_MODEL,
+            "pool": self.pool.get_stats() if self.pool else None
+        }
+    
     def cleanup(self):
         """Clean up resources"""
+        if self.pool:
+            self.pool.shutdown()
+        self.pool = None
         self.model = None
         self.ready = False
         logger.info("Whisper service cleaned up")
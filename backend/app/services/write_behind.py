@@ -0,0 +1,349 @@
+"""
+Write-behind persistence for transcription results
+A finished transcription is appended to a local SQLite journal (synced to
+disk before the request returns) and a background flusher writes journaled
+meetings to the database in batches, retrying with backoff while the
+database is slow or down. Entries leave the journal only after their batch
+has committed, so a restart resumes where the flusher stopped.
+
+Several server processes may share one journal file: each flush claims its
+rows first, so a meeting is written by one process at a time.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.db.types import compress, decompress
+
+logger = logging.getLogger(__name__)
+
+# Writer signature: (records) -> None, all records committed together or an exception
+BatchWriter = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+def _json_default(value):
+    # numpy scalars from the Whisper pipeline
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    # Transcript and segment JSON compress well; entries written uncompressed still decode
+    return compress(json.dumps(record, default=_json_default, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(stored) -> Dict[str, Any]:
+    return json.loads(decompress(stored))
+
+
+class MeetingJournal:
+    """
+    Durable local journal of meeting records waiting to be written to the database
+
+    Every append or update gives the entry a new revision; the flusher only
+    removes the revision it wrote, so a record changed mid-write is written
+    again rather than dropped. A process takes due entries by stamping them
+    with a claim; claims older than `claim_timeout_s` (their process died
+    mid-write) are taken over.
+    """
+
+    def __init__(self, db_path: str, claim_timeout_s: float = 300):
+        self.db_path = db_path
+        self.claim_timeout_s = claim_timeout_s
+        # Unique per process; each claim appends its own suffix so the claimed rows can be read back
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # An acknowledged transcription must survive power loss, not just a process crash
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pending_meetings (
+                rev INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT NOT NULL UNIQUE,
+                record BLOB NOT NULL,  -- JSON, zstd-compressed when enabled
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at REAL NOT NULL,
+                last_error TEXT,
+                created_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_pending_meetings_next_attempt "
+            "ON pending_meetings (next_attempt_at, rev)"
+        )
+        # Journals created before claims existed
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(pending_meetings)")}
+        for name, type_ in (("claimed_by", "TEXT"), ("claimed_at", "REAL")):
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE pending_meetings ADD COLUMN {name} {type_}")
+
+    def _put(self, record: Dict[str, Any], created_at: float):
+        # REPLACE deletes the old entry, so the record gets a fresh rev and is due now
+        self._conn.execute(
+            "INSERT OR REPLACE INTO pending_meetings (meeting_id, record, attempts, next_attempt_at, created_at) "
+            "VALUES (?, ?, 0, ?, ?)",
+            (record["id"], _encode(record), time.time(), created_at)
+        )
+
+    def _append_sync(self, record: Dict[str, Any]):
+        with self._lock:
+            self._put(record, time.time())
+
+    def _update_sync(self, meeting_id: str, changes: Dict[str, Any]) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record, created_at FROM pending_meetings WHERE meeting_id = ?", (meeting_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            self._put({**_decode(row["record"]), **changes}, row["created_at"])
+        return True
+
+    def _claim_due_sync(self, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        owner = f"{self.owner}:{uuid.uuid4().hex[:8]}"
+        now = time.time()
+        with self._lock:
+            # One statement, so processes racing for the same rows can't both claim them
+            self._conn.execute(
+                "UPDATE pending_meetings SET claimed_by = ?, claimed_at = ? WHERE rev IN ("
+                "SELECT rev FROM pending_meetings WHERE next_attempt_at <= ? "
+                "AND (claimed_by IS NULL OR claimed_at < ?) ORDER BY next_attempt_at, rev LIMIT ?)",
+                (owner, now, now, now - self.claim_timeout_s, limit)
+            )
+            rows = self._conn.execute(
+                "SELECT rev, record FROM pending_meetings WHERE claimed_by = ? ORDER BY next_attempt_at, rev",
+                (owner,)
+            ).fetchall()
+        return [(row["rev"], _decode(row["record"])) for row in rows]
+
+    def _release_sync(self):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pending_meetings SET claimed_by = NULL, claimed_at = NULL WHERE claimed_by LIKE ?",
+                (f"{self.owner}:%",)
+            )
+
+    def _remove_sync(self, revs: List[int]):
+        with self._lock:
+            self._conn.executemany("DELETE FROM pending_meetings WHERE rev = ?", [(rev,) for rev in revs])
+
+    def _defer_sync(self, rev: int, error: str, backoff_s: float, backoff_max_s: float) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT attempts FROM pending_meetings WHERE rev = ?", (rev,)).fetchone()
+            if row is None:
+                return 0
+            attempts = row["attempts"] + 1
+            delay = min(backoff_s * 2 ** (attempts - 1), backoff_max_s)
+            self._conn.execute(
+                "UPDATE pending_meetings SET attempts = ?, next_attempt_at = ?, last_error = ?, "
+                "claimed_by = NULL, claimed_at = NULL WHERE rev = ?",
+                (attempts, time.time() + delay, error[:500], rev)
+            )
+        return attempts
+
+    def _get_sync(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM pending_meetings WHERE meeting_id = ?", (meeting_id,)
+            ).fetchone()
+        return _decode(row["record"]) if row else None
+
+    def _stats_sync(self) -> Dict[str, Any]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS pending, MIN(created_at) AS oldest, MAX(attempts) AS max_attempts "
+                "FROM pending_meetings"
+            ).fetchone()
+        return {
+            "pending": row["pending"],
+            "oldest_pending_s": round(time.time() - row["oldest"], 1) if row["oldest"] else None,
+            "max_attempts": row["max_attempts"] or 0
+        }
+
+    async def append(self, record: Dict[str, Any]):
+        await asyncio.to_thread(self._append_sync, record)
+
+    async def update(self, meeting_id: str, changes: Dict[str, Any]) -> bool:
+        """Merge changes into a journaled record; False when it is no longer journaled"""
+        return await asyncio.to_thread(self._update_sync, meeting_id, changes)
+
+    async def claim_due(self, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Claim and return (rev, record) pairs whose next attempt is due, oldest first"""
+        return await asyncio.to_thread(self._claim_due_sync, limit)
+
+    async def release(self):
+        """Hand back this process's unfinished claims"""
+        await asyncio.to_thread(self._release_sync)
+
+    async def remove(self, revs: List[int]):
+        await asyncio.to_thread(self._remove_sync, revs)
+
+    async def defer(self, rev: int, error: str, backoff_s: float, backoff_max_s: float) -> int:
+        """Push an entry's next attempt back exponentially; returns its attempt count"""
+        return await asyncio.to_thread(self._defer_sync, rev, error, backoff_s, backoff_max_s)
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._get_sync, meeting_id)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return await asyncio.to_thread(self._stats_sync)
+
+
+class WriteBehindQueue:
+    """
+    Background flusher draining a MeetingJournal into the database
+
+    Records journaled while a batch is being written are picked up together
+    by the next batch, so batches grow with load. A failed batch is retried
+    one record at a time, so a record the database rejects only delays
+    itself; failed records come back after exponential backoff and stay in
+    the journal until they are written.
+    """
+
+    def __init__(self, journal: MeetingJournal, batch_size: int, flush_interval_s: float,
+                 backoff_s: float, backoff_max_s: float):
+        self.journal = journal
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_s
+        self.backoff_s = backoff_s
+        self.backoff_max_s = backoff_max_s
+        self.writer: Optional[BatchWriter] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.stats = {"written": 0, "batches": 0, "failed_attempts": 0, "last_error": None}
+
+    async def start(self, writer: BatchWriter):
+        """Start the flusher; anything journaled before a restart is written first"""
+        if self._task:
+            return
+        self.writer = writer
+        pending = (await self.journal.get_stats())["pending"]
+        if pending:
+            logger.info(f"Resuming write-behind of {pending} journaled meetings")
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._flusher(), name="meeting-write-behind")
+        logger.info(f"✅ Started meeting write-behind flusher (batches of {self.batch_size})")
+
+    async def stop(self, drain_timeout_s: float = 0.0):
+        """Try to write what is due for up to `drain_timeout_s`, then stop; the journal keeps the rest"""
+        if not self._task:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if drain_timeout_s > 0:
+            try:
+                await asyncio.wait_for(self._drain(), timeout=drain_timeout_s)
+            except asyncio.TimeoutError:
+                logger.warning("⚠️ Write-behind drain timed out; remaining meetings stay journaled")
+        # A batch cut off above would otherwise wait out the claim timeout
+        await self.journal.release()
+        stats = await self.journal.get_stats()
+        if stats["pending"]:
+            logger.info(f"{stats['pending']} meetings left in the write-behind journal for the next start")
+
+    async def submit(self, record: Dict[str, Any]):
+        """Journal a meeting record durably and schedule its database write"""
+        await self.journal.append(record)
+        self._wakeup.set()
+
+    async def get(self, meeting_id: str) -> Optional[Dict[str, Any]]:
+        """A meeting record still waiting in the journal, if any"""
+        return await self.journal.get(meeting_id)
+
+    async def update(self, meeting_id: str, changes: Dict[str, Any]) -> bool:
+        """Change a meeting that is still journaled; False once it has been written"""
+        if not await self.journal.update(meeting_id, changes):
+            return False
+        self._wakeup.set()
+        return True
+
+    async def flush(self) -> int:
+        """Write one batch of due records now; returns the number written"""
+        async with self._flush_lock:
+            entries = await self.journal.claim_due(self.batch_size)
+            if not entries:
+                return 0
+            try:
+                await self.writer([record for _, record in entries])
+                written = entries
+            except Exception as e:
+                if len(entries) == 1:
+                    await self._failed(*entries[0], e)
+                    return 0
+                logger.warning(f"⚠️ Write-behind batch of {len(entries)} failed, retrying one by one: {e}")
+                written = []
+                for rev, record in entries:
+                    try:
+                        await self.writer([record])
+                        written.append((rev, record))
+                    except Exception as record_error:
+                        await self._failed(rev, record, record_error)
+
+            if written:
+                await self.journal.remove([rev for rev, _ in written])
+                self.stats["written"] += len(written)
+                self.stats["batches"] += 1
+            return len(written)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, **await self.journal.get_stats(), "running": self._task is not None}
+
+    async def _failed(self, rev: int, record: Dict[str, Any], error: Exception):
+        attempts = await self.journal.defer(rev, str(error), self.backoff_s, self.backoff_max_s)
+        self.stats["failed_attempts"] += 1
+        self.stats["last_error"] = str(error)[:200]
+        logger.error(f"💥 Writing meeting {record['id']} failed (attempt {attempts}), will retry: {error}")
+
+    async def _drain(self):
+        while await self.flush():
+            pass
+
+    async def _flusher(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                written = await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Journal read/remove failed; the records are still journaled
+                logger.error(f"💥 Write-behind flush failed: {e}")
+                written = 0
+            if written:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+
+# Global instance, built by init_write_behind() at startup; None while disabled
+meeting_write_behind: Optional[WriteBehindQueue] = None
+
+
+def init_write_behind() -> Optional[WriteBehindQueue]:
+    """Open the journal (once per process) when write-behind is enabled"""
+    global meeting_write_behind
+    if settings.WRITE_BEHIND_ENABLED and meeting_write_behind is None:
+        meeting_write_behind = WriteBehindQueue(
+            MeetingJournal(settings.WRITE_BEHIND_JOURNAL_PATH, settings.WRITE_BEHIND_CLAIM_TIMEOUT_S),
+            batch_size=settings.WRITE_BEHIND_BATCH_SIZE,
+            flush_interval_s=settings.WRITE_BEHIND_FLUSH_INTERVAL_S,
+            backoff_s=settings.WRITE_BEHIND_RETRY_BACKOFF_S,
+            backoff_max_s=settings.WRITE_BEHIND_RETRY_BACKOFF_MAX_S
+        )
+    return meeting_write_behind
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event loop stalls from blocking vs async database sessions
+
+Seeds a throwaway SQLite database with meetings and runs N concurrent
+"GET /api/meetings/{id}"-style reads inside one event loop, the way FastAPI
+runs `async def` handlers:
+
+    sync    SessionLocal().query(...) called directly in the coroutine
+            (what the handlers did before the async engine)
+    async   AsyncSessionLocal (aiosqlite) awaited in the coroutine
+
+A ticker task sleeps 1ms in a loop alongside the reads and records how late
+each wake-up is; that lateness is what every other request on the loop
+(WebSocket frames, uploads) waits while the database is being read.
+
+Usage (from backend/):
+    python benchmarks/bench_async_db.py
+    python benchmarks/bench_async_db.py --meetings 500 --requests 200 --transcript-kb 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+TICK_S = 0.001
+
+
+async def ticker(lags: list, stop: asyncio.Event):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_S)
+        lags.append(time.perf_counter() - start - TICK_S)
+
+
+async def run(read, ids, concurrency: int):
+    lags, stop = [], asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(meeting_id):
+        async with semaphore:
+            await read(meeting_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in ids))
+    wall = time.perf_counter() - start
+    stop.set()
+    await tick
+    lags.sort()
+    return wall, lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--transcript-kb", type=int, default=100, help="Transcript size per meeting")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_async_db_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'meetings.db')}"
+
+    from app.db.database import AsyncSessionLocal, Base, SessionLocal, async_engine, engine
+    from app.db.models import Meeting
+
+    Base.metadata.create_all(bind=engine)
+    transcript = ("we reviewed the budget and the release plan " * (args.transcript_kb * 1024 // 44))
+    ids = [str(uuid.uuid4()) for _ in range(args.meetings)]
+    with engine.begin() as conn:
+        conn.execute(Meeting.__table__.insert(), [{"id": i, "title": "Bench", "transcript": transcript} for i in ids])
+    requested = [ids[n % len(ids)] for n in range(args.requests)]
+
+    async def read_sync(meeting_id):
+        db = SessionLocal()
+        try:
+            return db.query(Meeting).filter(Meeting.id == meeting_id).first().transcript
+        finally:
+            db.close()
+
+    async def read_async(meeting_id):
+        async with AsyncSessionLocal() as db:
+            return (await db.get(Meeting, meeting_id)).transcript
+
+    async def bench():
+        results = {}
+        for name, read in (("sync", read_sync), ("async", read_async)):
+            await run(read, requested[:args.concurrency], args.concurrency)  # warm the pools
+            results[name] = await run(read, requested, args.concurrency)
+        await async_engine.dispose()
+        return results
+
+    results = asyncio.run(bench())
+    print(f"{args.requests} reads of {args.transcript_kb}KB transcripts, {args.concurrency} concurrent, SQLite\n")
+    print(f"{'session':<7} {'wall s':>7} {'ticks':>6} {'lag p50 ms':>10} {'lag p99 ms':>10} {'lag max ms':>10}")
+    for name, (wall, lags) in results.items():
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))] if lags else 0.0
+        print(f"{name:<7} {wall:>7.2f} {len(lags):>6} {statistics.median(lags) * 1000 if lags else 0:>10.2f} "
+              f"{p99 * 1000:>10.2f} {(lags[-1] if lags else 0) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark: temp-file decode path vs in-memory ffmpeg pipe decode
+
+Compares the pre-pipe production path (write upload to .webm temp file ->
+librosa.load -> write resampled .wav temp file -> faster-whisper re-reads the
+.wav) against app.services.audio_decode.decode_audio (bytes -> ffmpeg stdin ->
+float32 NumPy buffer). Each run happens in a fresh subprocess so peak RSS is
+measured per path rather than accumulated.
+
+Usage (from backend/):
+    python benchmarks/bench_audio_decode.py                  # synthetic 10 min clip
+    python benchmarks/bench_audio_decode.py --seconds 3600
+    python benchmarks/bench_audio_decode.py --input meeting.webm --runs 5
+"""
+
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SAMPLE_RATE = 16000
+
+
+def make_clip(seconds: int, path: str):
+    """Encode a synthetic speech-band clip to Opus/WebM, like the desktop recorder produces"""
+    from app.services.audio_decode import FFMPEG_BINARY
+
+    subprocess.run(
+        [
+            FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", f"anoisesrc=d={seconds}:c=pink:r=48000:a=0.3",
+            "-af", "lowpass=f=3400,highpass=f=300",
+            "-c:a", "libopus", "-b:a", "32k", path
+        ],
+        check=True
+    )
+
+
+def run_temp_file_path(audio_bytes: bytes):
+    """The original _process_audio_data + _transcribe_sync disk round trips"""
+    import librosa
+    import numpy as np
+    import soundfile as sf
+
+    with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as webm_file:
+        webm_file.write(audio_bytes)
+    try:
+        audio_array, _ = librosa.load(webm_file.name, sr=SAMPLE_RATE, mono=True, dtype=np.float32)
+        if audio_array.max() > 0:
+            audio_array = audio_array / audio_array.max() * 0.95
+    finally:
+        os.unlink(webm_file.name)
+
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as wav_file:
+        wav_path = wav_file.name
+    try:
+        sf.write(wav_path, audio_array, SAMPLE_RATE)
+        try:
+            # faster-whisper decodes the path again before inference
+            from faster_whisper.audio import decode_audio as whisper_decode
+            audio_array = whisper_decode(wav_path, sampling_rate=SAMPLE_RATE)
+        except ImportError:
+            audio_array, _ = sf.read(wav_path, dtype="float32")
+    finally:
+        os.unlink(wav_path)
+    return audio_array
+
+
+def run_pipe_path(audio_bytes: bytes):
+    """The in-memory path used by ProductionWhisperService"""
+    import numpy as np
+    from app.services.audio_decode import decode_audio
+
+    audio_array = decode_audio(audio_bytes, SAMPLE_RATE)
+    peak = audio_array.max() if audio_array.size else 0
+    if peak > 0:
+        audio_array = audio_array * np.float32(0.95 / peak)
+    return audio_array
+
+
+def child(mode: str, input_path: str):
+    """Run one decode in this process and print timing + peak RSS as JSON"""
+    with open(input_path, "rb") as f:
+        audio_bytes = f.read()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    audio_array = run_temp_file_path(audio_bytes) if mode == "tempfile" else run_pipe_path(audio_bytes)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        "seconds": elapsed,
+        "samples": int(len(audio_array)),
+        "peak_rss_mb": rss_after / 1024,
+        "rss_growth_mb": (rss_after - rss_before) / 1024
+    }))
+
+
+def measure(mode: str, input_path: str, runs: int):
+    results = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", mode, "--input", input_path],
+            check=True, capture_output=True, text=True
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        "median_s": statistics.median(r["seconds"] for r in results),
+        "peak_rss_mb": max(r["peak_rss_mb"] for r in results),
+        "rss_growth_mb": max(r["rss_growth_mb"] for r in results),
+        "samples": results[0]["samples"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="Encoded audio file to decode (default: synthetic clip)")
+    parser.add_argument("--seconds", type=int, default=600, help="Length of the synthetic clip")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--child", choices=["tempfile", "pipe"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.input)
+        return
+
+    input_path = args.input
+    cleanup = None
+    if not input_path:
+        input_path = cleanup = tempfile.NamedTemporaryFile(suffix=".webm", delete=False).name
+        make_clip(args.seconds, input_path)
+
+    try:
+        size_mb = os.path.getsize(input_path) / 1e6
+        print(f"Input: {input_path} ({size_mb:.1f} MB), {args.runs} runs per path\n")
+        print(f"{'path':<10} {'median s':>10} {'peak RSS MB':>12} {'RSS growth MB':>14} {'audio s':>9}")
+        for mode in ("tempfile", "pipe"):
+            try:
+                r = measure(mode, input_path, args.runs)
+            except subprocess.CalledProcessError as e:
+                print(f"{mode:<10} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+                continue
+            print(f"{mode:<10} {r['median_s']:>10.3f} {r['peak_rss_mb']:>12.1f} "
+                  f"{r['rss_growth_mb']:>14.1f} {r['samples'] / SAMPLE_RATE:>9.1f}")
+    finally:
+        if cleanup:
+            os.unlink(cleanup)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: summary backends against one another, and backend selection
+
+Two stub servers from benchmarks/stub_openai_server.py stand in for a hosted
+provider (network overhead, fast GPU decode, 32k context, 4 parallel calls)
+and a local CPU model server (little overhead, slow prefill and decode, 4k
+context, one slot). Each synthetic transcript is summarized by every backend
+on its own, with the backend's estimate (learned from earlier calls) next to
+the measured time, then by AIService's planner:
+
+    auto            no latency budget: SUMMARY_BACKENDS preference order
+    budget <N>s     the first backend expected to finish within N seconds
+    hosted outage   the hosted stub answers 503: failover to the next backend
+
+Usage (from backend/):
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --minutes 5 30 --budget 3 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_openai_server import start_stub  # noqa: E402
+from bench_summarize import make_segments  # noqa: E402
+
+HOSTED = {"context_tokens": 32768, "overhead_s": 0.5, "prefill_s_per_token": 0.00005, "decode_s_per_token": 0.005}
+LOCAL = {"context_tokens": 4096, "overhead_s": 0.05, "prefill_s_per_token": 0.0005, "decode_s_per_token": 0.02}
+
+
+def make_service(hosted_url: str, local_url: str):
+    from app.services.ai_service import AIService
+    from app.services.llm_backends import ExtractiveBackend, LLMBackend
+
+    service = AIService()
+    service.cache = None
+    service.backends = {
+        "hosted": LLMBackend("hosted", hosted_url, "stub", "hosted-model", max_concurrency=4, batch_size=10,
+                             window_tokens=6000, overhead_s=0.5, tokens_per_s=2000,
+                             max_retries=0, breaker_threshold=2),
+        "local": LLMBackend("local", local_url, "", "local-model", max_concurrency=1, batch_size=5,
+                            window_tokens=3000, overhead_s=0.05, tokens_per_s=500,
+                            requires_key=False, max_retries=0),
+        "extractive": ExtractiveBackend()
+    }
+    return service
+
+
+async def summarize(service, transcript: str, segments, budget=None, only=None):
+    from app.services.ai_service import estimate_tokens
+
+    backends = service.backends
+    if only:
+        service.backends = {only: backends[only]}
+    try:
+        planned = service.plan(transcript, budget)
+        first = planned[0].name if planned else "-"
+        estimate = planned[0].estimate_s(estimate_tokens(transcript)) if planned else 0.0
+        start = time.perf_counter()
+        result = await service.summarize_transcript(transcript, segments, latency_budget_s=budget)
+        return first, result.get("engine", "-"), estimate, time.perf_counter() - start
+    finally:
+        service.backends = backends
+
+
+async def run(minutes, budgets):
+    hosted, hosted_state, hosted_url = start_stub(**HOSTED)
+    local, _, local_url = start_stub(**LOCAL)
+    service = make_service(hosted_url, local_url)
+    rows = []
+    try:
+        for m in minutes:
+            segments = make_segments(m)
+            transcript = " ".join(s["text"] for s in segments)
+            for name in ("hosted", "local", "extractive"):
+                rows.append((m, name, *await summarize(service, transcript, segments, only=name)))
+            rows.append((m, "auto", *await summarize(service, transcript, segments)))
+            for budget in budgets:
+                rows.append((m, f"budget {budget:g}s", *await summarize(service, transcript, segments, budget)))
+
+        # Provider outage: the breaker opens after two failed calls and the planner skips it
+        hosted_state.fail_rate = 1.0
+        segments = make_segments(minutes[0])
+        transcript = " ".join(s["text"] for s in segments)
+        for attempt in (1, 2, 3):
+            rows.append((minutes[0], f"hosted outage #{attempt}", *await summarize(service, transcript, segments)))
+    finally:
+        await service.close()
+        hosted.shutdown()
+        local.shutdown()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[5, 15, 60])
+    parser.add_argument("--budget", type=float, nargs="+", default=[2.0, 0.5])
+    args = parser.parse_args()
+
+    print(f"{'minutes':>7} {'run':<18} {'planned':<11} {'est s':>7} {'engine':<11} {'wall s':>7}")
+    for minutes, run_name, first, engine, estimate, wall in asyncio.run(run(args.minutes, args.budget)):
+        print(f"{minutes:>7} {run_name:<18} {first:<11} {estimate:>7.2f} {engine:<11} {wall:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark: compressed transcript storage and compressed API responses
+
+Synthetic meeting transcripts (Zipf-distributed words from a 3,000 word
+vocabulary, ~150 words a minute) of 15 minutes to 3 hours:
+
+    storage   raw UTF-8 vs zstd levels 1/3/9: stored bytes, compress and
+              decompress time per transcript
+    database  SQLite file size for --meetings meetings with the transcript
+              column as plain Text vs CompressedText (app/db/types.py)
+    http      GET /api/meetings/{id} JSON body as identity, gzip and brotli
+              (as ResponseCompressionMiddleware sends it): bytes and time
+
+Usage (from backend/):
+    python benchmarks/bench_compression.py
+    python benchmarks/bench_compression.py --meetings 500 --minutes 60
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+WORDS_PER_MINUTE = 150
+
+
+def make_transcript(minutes: int, rng: random.Random, vocabulary: list, weights: list) -> str:
+    words = rng.choices(vocabulary, weights=weights, k=minutes * WORDS_PER_MINUTE)
+    sentences, i = [], 0
+    while i < len(words):
+        n = rng.randint(6, 22)
+        sentence = " ".join(words[i:i + n])
+        sentences.append(sentence[:1].upper() + sentence[1:] + rng.choice([".", ".", ".", "?"]))
+        i += n
+    return " ".join(sentences)
+
+
+def timed(fn, *args, repeat: int = 5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=200, help="Meetings in the database size comparison")
+    parser.add_argument("--minutes", type=int, default=60, help="Meeting length for the database and HTTP runs")
+    args = parser.parse_args()
+
+    import zstandard
+    from app.core.compression import brotli, compress_body
+
+    rng = random.Random(7)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+                  for _ in range(3000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+    print("Storage, one transcript:\n")
+    print(f"{'minutes':>7} {'raw KB':>8} {'level':>5} {'stored KB':>9} {'ratio':>6} {'compress ms':>11} {'decompress ms':>13}")
+    for minutes in (15, 60, 180):
+        raw = make_transcript(minutes, rng, vocabulary, weights).encode("utf-8")
+        for level in (1, 3, 9):
+            compressed, compress_s = timed(zstandard.ZstdCompressor(level=level).compress, raw)
+            _, decompress_s = timed(zstandard.ZstdDecompressor().decompress, compressed)
+            print(f"{minutes:>7} {len(raw) / 1024:>8.1f} {level:>5} {len(compressed) / 1024:>9.1f} "
+                  f"{len(raw) / len(compressed):>6.2f} {compress_s * 1000:>11.2f} {decompress_s * 1000:>13.3f}")
+
+    transcripts = [make_transcript(args.minutes, rng, vocabulary, weights) for _ in range(args.meetings)]
+    workdir = tempfile.mkdtemp(prefix="bench_compression_")
+    from sqlalchemy import Column, MetaData, String, Table, Text, create_engine
+    from app.db.types import CompressedText
+
+    print(f"\nDatabase, {args.meetings} meetings of {args.minutes} minutes (SQLite):\n")
+    print(f"{'column':<15} {'file MB':>8} {'insert s':>9} {'read all s':>10}")
+    for name, column_type in (("Text", Text), ("CompressedText", CompressedText)):
+        path = os.path.join(workdir, f"{name}.db")
+        engine = create_engine(f"sqlite:///{path}")
+        table = Table("meetings", MetaData(), Column("id", String, primary_key=True), Column("transcript", column_type))
+        table.metadata.create_all(engine)
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            conn.execute(table.insert(), [{"id": str(i), "transcript": t} for i, t in enumerate(transcripts)])
+        insert_s = time.perf_counter() - start
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            assert conn.execute(table.select()).all()[0].transcript == transcripts[0]
+        read_s = time.perf_counter() - start
+        engine.dispose()
+        print(f"{name:<15} {os.path.getsize(path) / 1024 ** 2:>8.2f} {insert_s:>9.2f} {read_s:>10.2f}")
+
+    body = json.dumps({"id": "m", "title": "Weekly sync", "transcript": transcripts[0], "summary": "",
+                       "key_points": [], "action_items": []}).encode("utf-8")
+    print(f"\nHTTP, GET /api/meetings/{{id}} for a {args.minutes} minute meeting:\n")
+    print(f"{'encoding':<9} {'bytes':>9} {'ms':>7}")
+    print(f"{'identity':<9} {len(body):>9} {0:>7.2f}")
+    for encoding in (["gzip", "br"] if brotli else ["gzip"]):
+        encoded, seconds = timed(compress_body, body, encoding, 6, 4)
+        print(f"{encoding:<9} {len(encoded):>9} {seconds * 1000:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark: on-box extractive summarizer latency
+
+Times app.services.extractive_summary.ExtractiveSummarizer over synthetic
+transcripts (same generator as bench_summarize.py) and reports the median
+time per summary, sentences scored, distinct words, whether the full
+TextRank graph or the centroid shortcut was used, and peak memory allocated
+during one summary. --vocabulary swaps the generator's small word list for
+that many synthetic words drawn Zipf-style, like real speech.
+
+Usage (from backend/):
+    python benchmarks/bench_extractive.py
+    python benchmarks/bench_extractive.py --minutes 60 240 480 --runs 10
+    python benchmarks/bench_extractive.py --minutes 1320 --vocabulary 20000
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_summarize import make_segments  # noqa: E402
+
+
+def with_vocabulary(segments, size: int, seed: int = 0):
+    """Same segment lengths, words drawn from `size` synthetic words with Zipf frequencies"""
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(size)]
+    weights = [1.0 / (rank + 1) for rank in range(size)]
+    return [{**s, "text": " ".join(rng.choices(words, weights, k=len(s["text"].split()))) + "."}
+            for s in segments]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[15, 60, 120, 240])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--vocabulary", type=int, default=0, help="Distinct synthetic words (0 = generator's list)")
+    args = parser.parse_args()
+
+    from app.services.extractive_summary import (
+        ExtractiveSummarizer, MAX_TEXTRANK_SENTENCES, split_sentences
+    )
+    summarizer = ExtractiveSummarizer()
+
+    print(f"{'minutes':>7} {'sentences':>9} {'words':>6} {'ranking':<9} {'median s':>8} {'max s':>6} {'peak MB':>7}")
+    for minutes in args.minutes:
+        segments = make_segments(minutes)
+        if args.vocabulary:
+            segments = with_vocabulary(segments, args.vocabulary)
+        transcript = " ".join(s["text"] for s in segments)
+        sentences = len(split_sentences(transcript, segments))
+        words = len(set(transcript.lower().replace(".", "").split()))
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            summarizer.summarize(transcript, segments)
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()  # NumPy reports its buffers to tracemalloc
+        summarizer.summarize(transcript, segments)
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+        ranking = "textrank" if sentences <= MAX_TEXTRANK_SENTENCES else "centroid"
+        print(f"{minutes:>7} {sentences:>9} {words:>6} {ranking:<9} {statistics.median(timings):>8.3f} "
+              f"{max(timings):>6.3f} {peak_mb:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: highlight descriptions one call at a time vs batched
+
+Describes N synthetic highlight excerpts through AIService against
+benchmarks/stub_openai_server.py:
+
+    sequential  one generate_highlight_description call after another, as the
+                single-highlight endpoint is used when a client loops over clips
+    fan-out     the same single calls issued concurrently (LLM client limit applies)
+    batched     generate_highlight_descriptions: numbered excerpts packed into
+                HIGHLIGHT_BATCH_SIZE batch prompts
+
+Reports wall time, LLM requests and prompt tokens sent (the provider's rate
+limit counts requests, so fewer calls also means less quota per meeting).
+
+Usage (from backend/):
+    python benchmarks/bench_highlights.py
+    python benchmarks/bench_highlights.py --highlights 5 20 50 --batch-size 20
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_openai_server import start_stub  # noqa: E402
+from bench_summarize import make_segments  # noqa: E402
+
+MODES = ("sequential", "fan-out", "batched")
+
+
+def make_excerpts(count: int):
+    """~30-second excerpts, one per highlight"""
+    segments = make_segments(count)
+    excerpts = []
+    for minute in range(count):
+        words = [s["text"] for s in segments if minute * 60 <= s["start"] < minute * 60 + 30]
+        excerpts.append(" ".join(words))
+    return excerpts
+
+
+async def run(mode: str, excerpts, base_url: str, concurrency: int, batch_size: int):
+    from app.services.ai_service import AIService
+    from app.services.llm_backends import LLMBackend
+
+    service = AIService()
+    await service.close()
+    service.backends = {"stub": LLMBackend(
+        "stub", base_url, "stub", "stub-model", max_concurrency=concurrency, batch_size=batch_size,
+        window_tokens=6000, overhead_s=0.2, tokens_per_s=100, max_retries=0
+    )}
+    service.cache = None
+
+    start = time.perf_counter()
+    if mode == "sequential":
+        descriptions = [await service.generate_highlight_description(e) for e in excerpts]
+    elif mode == "fan-out":
+        descriptions = await asyncio.gather(*[service.generate_highlight_description(e) for e in excerpts])
+    else:
+        descriptions = await service.generate_highlight_descriptions(excerpts)
+    elapsed = time.perf_counter() - start
+    await service.close()
+    return elapsed, descriptions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--highlights", type=int, nargs="+", default=[5, 20, 50])
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--decode", type=float, default=0.01, help="Stub seconds per output token")
+    args = parser.parse_args()
+
+    print(f"Stub decode {args.decode}s/token; concurrency {args.concurrency}, batch size {args.batch_size}\n")
+    print(f"{'highlights':>10} {'mode':<11} {'wall s':>7} {'calls':>6} {'prompt tok':>10} {'described':>9}")
+    for count in args.highlights:
+        excerpts = make_excerpts(count)
+        for mode in MODES:
+            server, state, base_url = start_stub(context_tokens=0, decode_s_per_token=args.decode)
+            try:
+                elapsed, descriptions = asyncio.run(run(mode, excerpts, base_url, args.concurrency, args.batch_size))
+            finally:
+                server.shutdown()
+            stats = state.stats()
+            described = sum(1 for d in descriptions if d != "Highlight from meeting")
+            print(f"{count:>10} {mode:<11} {elapsed:>7.2f} {stats['requests']:>6} "
+                  f"{stats['prompt_tokens']:>10} {described:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark: API import time and time-to-bind
+
+Import mode runs `python -X importtime -c "import app.main"` in a fresh
+subprocess and reports the total plus the packages that cost the most (self
+time of every module, summed per top-level package). Startup mode launches uvicorn and times how long until
+/api/health/live and /api/health/ready first answer 200; before the model load
+moved to a background thread, both waited for Whisper.
+
+Pass --app-dir to measure another checkout, e.g. a `git worktree` of the
+previous commit, for a before/after comparison.
+
+Usage (from backend/):
+    python benchmarks/bench_import_time.py
+    python benchmarks/bench_import_time.py --runs 5 --top 15
+    python benchmarks/bench_import_time.py --startup --port 8765
+    python benchmarks/bench_import_time.py --app-dir /tmp/before/backend
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _env(app_dir: str, environment: str):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = app_dir
+    env["ENVIRONMENT"] = environment
+    return env
+
+
+def measure_import(app_dir: str, environment: str):
+    """One cold `import app.main`; returns (wall seconds, {top-level package: self us})"""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=app_dir, env=_env(app_dir, environment), capture_output=True, text=True
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    packages = defaultdict(int)
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, _, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(own)
+    return elapsed, packages
+
+
+def measure_startup(app_dir: str, environment: str, port: int, timeout: float):
+    """Seconds from launching uvicorn until live and ready first return 200 (None if never)"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir, env=_env(app_dir, environment),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    start = time.perf_counter()
+    times = {"live": None, "ready": None}
+    try:
+        while time.perf_counter() - start < timeout and None in times.values():
+            for name, path in (("live", "/api/health/live"), ("ready", "/api/health/ready")):
+                if times[name] is not None:
+                    continue
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                        if response.status == 200:
+                            times[name] = time.perf_counter() - start
+                except (urllib.error.URLError, ConnectionError, OSError):
+                    pass
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            time.sleep(0.05)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app-dir", default=BACKEND_DIR, help="backend/ directory to measure")
+    parser.add_argument("--environment", default="production", help="ENVIRONMENT for the child process")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Most expensive packages to list")
+    parser.add_argument("--startup", action="store_true", help="Also time uvicorn until live/ready")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Give up waiting for ready after this")
+    args = parser.parse_args()
+
+    app_dir = os.path.abspath(args.app_dir)
+    print(f"App: {app_dir} (ENVIRONMENT={args.environment}), {args.runs} runs\n")
+
+    walls = []
+    totals = defaultdict(list)
+    for _ in range(args.runs):
+        elapsed, packages = measure_import(app_dir, args.environment)
+        walls.append(elapsed)
+        for name, us in packages.items():
+            totals[name].append(us)
+
+    print(f"import app.main: median {statistics.median(walls):.3f}s (min {min(walls):.3f}s)\n")
+    print(f"{'package':<28} {'median ms':>10}")
+    ranked = sorted(totals.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, values in ranked[:args.top]:
+        print(f"{name:<28} {statistics.median(values) / 1000:>10.1f}")
+
+    if args.startup:
+        print()
+        try:
+            times = measure_startup(app_dir, args.environment, args.port, args.timeout)
+        except RuntimeError as e:
+            print(f"startup failed: {e}")
+            return
+        for name in ("live", "ready"):
+            value = times[name]
+            print(f"{name + ':':<7} {f'{value:.2f}s' if value is not None else 'not reached'}")
+
+
+if __name__ == "__main__":
+    main()
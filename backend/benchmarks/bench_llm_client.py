@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM client resilience features against a faulty provider
+
+Sends chat completions at a steady arrival rate through app.services.llm_client.LLMClient
+against benchmarks/stub_openai_server.py with injected faults, comparing a
+"plain" client (no retries, rate limiting, breaker or hedging, like the
+original AIService) with the "resilient" configuration:
+
+    flaky         20% of requests fail with 503
+    rate-limited  provider allows 3 requests/s and answers 429 beyond that
+    outage        provider hangs on every request (client timeout 1s)
+    slow-tail     10% of primary-model requests take 3s longer; a secondary
+                  model without the tail is available for hedging
+
+Usage (from backend/):
+    python benchmarks/bench_llm_client.py
+    python benchmarks/bench_llm_client.py --requests 100 --interval 0.05 --scenario flaky slow-tail
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_openai_server import start_stub  # noqa: E402
+
+SCENARIOS = {
+    "flaky": {
+        "stub": {"fail_rate": 0.2},
+        "resilient": {"max_retries": 3, "backoff_s": 0.05}
+    },
+    "rate-limited": {
+        "stub": {"rate_limit_per_s": 3},
+        "resilient": {"rate_per_s": 3, "rate_burst": 1, "max_retries": 3, "backoff_s": 0.2}
+    },
+    "outage": {
+        "stub": {"tail_rate": 1.0, "tail_s": 30},
+        "plain": {"timeout_s": 1},
+        "resilient": {"timeout_s": 1, "max_retries": 1, "backoff_s": 0.05,
+                      "breaker_threshold": 3, "breaker_reset_s": 60}
+    },
+    "slow-tail": {
+        "stub": {"tail_rate": 0.1, "tail_s": 3, "tail_models": {"primary"}},
+        "resilient": {"hedge_model": "secondary", "hedge_delay_s": 0.5}
+    }
+}
+
+
+async def run_load(base_url: str, requests: int, interval: float, concurrency: int, options):
+    from app.services.llm_client import LLMClient, LLMError
+
+    defaults = {"max_retries": 0, "breaker_threshold": 0, "rate_per_s": 0}
+    client = LLMClient(base_url, "stub", "primary", max_concurrency=concurrency, **{**defaults, **options})
+    latencies = []
+    errors = 0
+
+    async def one(i: int):
+        nonlocal errors
+        await asyncio.sleep(i * interval)
+        sent = time.perf_counter()
+        try:
+            await client.chat(f"Summarize this meeting excerpt in one concise sentence:\n\nexcerpt {i}", 100)
+        except LLMError:
+            errors += 1
+        latencies.append(time.perf_counter() - sent)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    wall = time.perf_counter() - start
+    stats = client.get_stats()
+    await client.close()
+    latencies.sort()
+    return {
+        "wall_s": wall,
+        "ok": requests - errors,
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "stats": stats
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between request arrivals")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests per run, one every {args.interval}s, concurrency {args.concurrency}\n")
+    print(f"{'scenario':<13} {'client':<10} {'ok':>5} {'wall s':>7} {'p50 s':>6} {'p95 s':>6} "
+          f"{'sent':>5} {'retries':>7} {'429s':>5} {'fast-fail':>9} {'hedges':>6}")
+    for name in args.scenario:
+        scenario = SCENARIOS[name]
+        for client_name in ("plain", "resilient"):
+            server, state, base_url = start_stub(
+                context_tokens=0, decode_s_per_token=0.002, seed=1, **scenario["stub"]
+            )
+            try:
+                r = asyncio.run(run_load(base_url, args.requests, args.interval, args.concurrency, scenario.get(client_name, {})))
+            finally:
+                server.shutdown()
+            s = r["stats"]
+            print(f"{name:<13} {client_name:<10} {r['ok']:>5} {r['wall_s']:>7.2f} {r['p50_s']:>6.2f} "
+                  f"{r['p95_s']:>6.2f} {s['requests']:>5} {s['retries']:>7} {s['rate_limited']:>5} "
+                  f"{s['short_circuited']:>9} {s['hedges']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark: meeting list pages, OFFSET vs keyset cursor
+
+Seeds a throwaway SQLite database with N meetings (synthetic transcripts) and
+times fetching one page of the list projection used by GET /api/meetings at
+increasing depths:
+
+    offset  ORDER BY created_at DESC, id DESC OFFSET <depth> LIMIT <page>
+    keyset  app.db.pagination.keyset_page with the cursor of the row at <depth>
+
+OFFSET reads and discards every earlier row; the keyset page seeks into
+ix_meetings_created_at_id, so its cost should not depend on depth.
+
+Usage (from backend/):
+    python benchmarks/bench_meeting_list.py
+    python benchmarks/bench_meeting_list.py --meetings 50000 --page 100 --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_summarize import make_segments  # noqa: E402
+
+
+def seed(engine, meetings_table, count: int, transcript_words: int):
+    """`count` meetings, several per second so created_at ties are common"""
+    words = " ".join(s["text"] for s in make_segments(max(1, transcript_words // 150))).split()
+    transcript = " ".join(words[:transcript_words])
+    start = datetime(2025, 1, 1)
+    rows = [{
+        "id": str(uuid.uuid4()),
+        "title": f"Meeting {i}",
+        "transcript": transcript,
+        "transcript_preview": transcript[:200],
+        "summary": transcript[:500],
+        "duration": 1800,
+        "language": "en",
+        "confidence": 0.9,
+        "audio_format": "webm",
+        "created_at": start + timedelta(seconds=i // 4)
+    } for i in range(count)]
+    with engine.begin() as conn:
+        for i in range(0, count, 5000):
+            conn.execute(meetings_table.insert(), rows[i:i + 5000])
+
+
+def timed(fn, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=20000)
+    parser.add_argument("--transcript-words", type=int, default=300)
+    parser.add_argument("--page", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_meeting_list_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'meetings.db')}"
+
+    from sqlalchemy import func
+    from app.db.database import Base, SessionLocal, engine
+    from app.db.models import Meeting
+    from app.db.pagination import encode_cursor, keyset_page
+
+    Base.metadata.create_all(bind=engine)
+    seed(engine, Meeting.__table__, args.meetings, args.transcript_words)
+    db = SessionLocal()
+
+    def list_query():
+        return db.query(
+            Meeting.id, Meeting.title, Meeting.duration, Meeting.language,
+            Meeting.confidence, Meeting.audio_format, Meeting.created_at,
+            func.substr(Meeting.transcript_preview, 1, 200).label("transcript_preview"),
+            func.substr(Meeting.summary, 1, 200).label("summary_preview")
+        )
+
+    depths = sorted({0, args.meetings // 100, args.meetings // 10, args.meetings // 2,
+                     max(args.meetings - args.page - 1, 0)})
+    print(f"{args.meetings} meetings, page size {args.page}, median of {args.runs} runs\n")
+    print(f"{'depth':>7} {'offset ms':>10} {'keyset ms':>10}")
+    for depth in depths:
+        def offset_page():
+            return list_query().order_by(Meeting.created_at.desc(), Meeting.id.desc()).offset(depth).limit(args.page).all()
+
+        cursor = None
+        if depth:
+            previous = db.query(Meeting.created_at, Meeting.id).order_by(
+                Meeting.created_at.desc(), Meeting.id.desc()
+            ).offset(depth - 1).limit(1).one()
+            cursor = encode_cursor(previous.created_at, previous.id)
+
+        def cursor_page():
+            return keyset_page(list_query(), Meeting.created_at, Meeting.id, cursor, args.page)[0]
+
+        assert [r.id for r in offset_page()] == [r.id for r in cursor_page()]
+        print(f"{depth:>7} {timed(offset_page, args.runs):>10.2f} {timed(cursor_page, args.runs):>10.2f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: meeting search, full-text index vs scanning transcripts
+
+Seeds a throwaway SQLite database with N meetings through the same path as
+transcription (_store_meeting: meeting row, segments, search index). Each
+meeting is a random sample of synthetic segments plus one codename that only
+it mentions, so queries range from common to single-meeting. Times:
+
+    like    SELECT id ... WHERE transcript LIKE '%term%' for every match (what
+            filtering all meetings amounts to without an index), no ranking
+    fts     app.db.search: top 20 meetings ranked, with snippets plus the best
+            3 matching segments and their timestamps
+
+Usage (from backend/):
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --meetings 2000 --minutes 30 --runs 10
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_summarize import make_segments  # noqa: E402
+
+QUERIES = ("budget", "export flow", "legal contract", "codename00042", "codename0004")
+
+
+def timed(fn, runs: int):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=2000)
+    parser.add_argument("--minutes", type=int, default=30, help="Length of each synthetic meeting")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_search_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'meetings.db')}"
+    os.environ["TRANSCRIPTION_CACHE_ENABLED"] = "false"
+
+    import logging
+    from sqlalchemy import text
+    from app.db.database import Base, SessionLocal, engine
+    from app.db.search import search_index
+    from app.api.transcription import _store_meeting
+
+    logging.getLogger().setLevel(logging.WARNING)
+    Base.metadata.create_all(bind=engine)
+    search_index.setup()
+
+    pool = make_segments(args.minutes * 4)
+    per_meeting = len(pool) // 4
+    rng = random.Random(0)
+
+    async def seed():
+        for i in range(args.meetings):
+            picked = sorted(rng.sample(range(len(pool)), per_meeting))
+            segments = [{**pool[j], "text": pool[j]["text"]} for j in picked]
+            segments[len(segments) // 2]["text"] += f" Next up is project codename{i:05d}."
+            transcript = " ".join(s["text"] for s in segments)
+            await _store_meeting(str(uuid.uuid4()), f"Meeting {i}", transcript, "", args.minutes * 60, 0.9, "webm",
+                                 segments=segments)
+
+    start = time.perf_counter()
+    asyncio.run(seed())
+    seeded = time.perf_counter() - start
+    print(f"{args.meetings} meetings x {args.minutes} min ({per_meeting} segments each), "
+          f"stored and indexed in {seeded:.1f}s ({seeded / args.meetings * 1000:.1f}ms per meeting)\n")
+
+    db = SessionLocal()
+    print(f"{'query':<18} {'like ms':>8} {'like rows':>9} {'fts ms':>8} {'results':>8} {'segments':>8}")
+    for query in QUERIES:
+        def like():
+            clauses = " AND ".join(f"transcript LIKE :t{i}" for i in range(len(query.split())))
+            params = {f"t{i}": f"%{term}%" for i, term in enumerate(query.split())}
+            return db.execute(text(f"SELECT id FROM meetings WHERE {clauses}"), params).all()
+
+        like_ms, matched = timed(like, args.runs)
+        fts_ms, results = timed(lambda: search_index.search(db, query, 20, 3), args.runs)
+        hits = sum(len(r["segments"]) for r in results)
+        print(f"{query:<18} {like_ms:>8.2f} {len(matched):>9} {fts_ms:>8.2f} {len(results):>8} {hits:>8}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: transcript time-range lookups
+
+Seeds a throwaway SQLite database with --meetings synthetic meetings
+(5-15 second segments, packed timeline on) and answers random "segments
+overlapping [t0, t0 + window]" queries, as the /transcript endpoint and
+highlight creation ask them:
+
+    db          SELECT ... WHERE meeting_id = ? AND start_time < t1 AND
+                end_time > t0 ORDER BY start_time, with only the meeting_id
+                index
+    db+index    the same query with the (meeting_id, start_time) index
+    cold        load_timeline plus building a SegmentIntervalIndex, then the
+                lookup (first request for a meeting)
+    cached      SegmentIntervalIndex.overlapping on an already built index
+
+Usage (from backend/):
+    python benchmarks/bench_segment_index.py
+    python benchmarks/bench_segment_index.py --meetings 500 --minutes 180 --queries 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_summarize import make_segments  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=200)
+    parser.add_argument("--minutes", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 30, 300])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_segment_index_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'meetings.db')}"
+
+    from sqlalchemy import text
+    from app.db.database import Base, SessionLocal, engine
+    from app.db.models import Meeting, MeetingSegment
+    from app.db.segment_index import SegmentIntervalIndex
+    from app.db.segment_store import load_timeline, store_segments
+
+    Base.metadata.create_all(bind=engine)
+    meeting_ids = []
+    db = SessionLocal()
+    for i in range(args.meetings):
+        meeting_id = str(uuid.uuid4())
+        db.add(Meeting(id=meeting_id, title="Bench"))
+        db.flush()
+        store_segments(db, meeting_id, make_segments(args.minutes, seed=i))
+        meeting_ids.append(meeting_id)
+    db.commit()
+    db.execute(text("ANALYZE"))
+    db.close()
+    segment_count = SessionLocal().query(MeetingSegment).count()
+
+    select_segments = "SELECT start_time, end_time, text FROM meeting_segments WHERE meeting_id = :m AND "
+    range_query = text(select_segments + "start_time < :t1 AND end_time > :t0 ORDER BY start_time")
+    point_query = text(select_segments + "start_time <= :t0 AND end_time > :t0 ORDER BY start_time")
+    rng = random.Random(3)
+    duration = args.minutes * 60
+
+    def db_lookups(queries):
+        db = SessionLocal()
+        start = time.perf_counter()
+        hits = sum(len(db.execute(point_query if t1 is None else range_query, {"m": m, "t0": t0, "t1": t1}).all())
+                   for m, t0, t1 in queries)
+        elapsed = time.perf_counter() - start
+        db.close()
+        return elapsed, hits
+
+    def cold_lookups(queries):
+        db = SessionLocal()
+        start = time.perf_counter()
+        hits = sum(len(SegmentIntervalIndex(load_timeline(db, m)).overlapping(t0, t1)) for m, t0, t1 in queries)
+        elapsed = time.perf_counter() - start
+        db.close()
+        return elapsed, hits
+
+    db = SessionLocal()
+    indexes = {m: SegmentIntervalIndex(load_timeline(db, m)) for m in meeting_ids}
+    db.close()
+
+    def cached_lookups(queries):
+        start = time.perf_counter()
+        hits = sum(len(indexes[m].overlapping(t0, t1)) for m, t0, t1 in queries)
+        return time.perf_counter() - start, hits
+
+    print(f"{args.meetings} meetings x {args.minutes} minutes, {segment_count} segments, "
+          f"{args.queries} queries per cell, SQLite\n")
+    print(f"{'window s':>8} {'hits/query':>10} {'db us':>8} {'db+index us':>11} {'cold us':>9} {'cached us':>9}")
+    for window in args.windows:
+        queries = []
+        for _ in range(args.queries):
+            t0 = rng.uniform(0, duration - window)
+            queries.append((rng.choice(meeting_ids), t0, t0 + window if window else None))
+
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX IF EXISTS ix_meeting_segments_meeting_id_start_time"))
+        plain_s, hits = db_lookups(queries)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE INDEX ix_meeting_segments_meeting_id_start_time "
+                              "ON meeting_segments (meeting_id, start_time)"))
+            conn.execute(text("ANALYZE"))
+        indexed_s, indexed_hits = db_lookups(queries)
+        cold_s, cold_hits = cold_lookups(queries[:max(1, args.queries // 10)])
+        cached_s, cached_hits = cached_lookups(queries)
+        assert hits == indexed_hits == cached_hits, (hits, indexed_hits, cached_hits)
+
+        per_query = 1e6 / args.queries
+        print(f"{window:>8g} {hits / args.queries:>10.1f} {plain_s * per_query:>8.1f} {indexed_s * per_query:>11.1f} "
+              f"{cold_s * 1e6 / max(1, args.queries // 10):>9.1f} {cached_s * per_query:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: storing and loading a meeting's transcript segments
+
+Seeds a throwaway SQLite database and, for synthetic 30 minute to 3 hour
+meetings with word-level timestamps (Whisper's shape), times:
+
+    orm        one MeetingSegment ORM object per segment, then commit (the old
+               upload path; words are dropped)
+    bulk       app.db.segment_store.store_segments with the packed timeline
+               off: one executemany into meeting_segments
+    timeline   store_segments with the packed timeline on: the executemany plus
+               one meeting_timelines row holding every segment and word
+
+and loading the timeline back:
+
+    rows       SELECT the meeting's meeting_segments rows (no words)
+    packed     load_timeline: one primary-key read, segments and words
+
+Usage (from backend/):
+    python benchmarks/bench_segment_store.py
+    python benchmarks/bench_segment_store.py --minutes 60 240 --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_summarize import make_segments  # noqa: E402
+
+
+def with_words(segments):
+    """Spread each segment's words evenly over it, like Whisper word timestamps"""
+    for segment in segments:
+        words = segment["text"].split()
+        step = (segment["end"] - segment["start"]) / len(words)
+        segment["words"] = [{
+            "start": round(segment["start"] + i * step, 2),
+            "end": round(segment["start"] + (i + 1) * step, 2),
+            "word": " " + word,
+            "probability": 0.9
+        } for i, word in enumerate(words)]
+    return segments
+
+
+def median_ms(timings):
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[30, 60, 180])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_segment_store_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'meetings.db')}"
+
+    from app.core.config import settings
+    from app.db.database import Base, SessionLocal, engine
+    from app.db.models import Meeting, MeetingSegment, MeetingTimeline
+    from app.db.segment_store import load_timeline, segment_rows, store_segments
+
+    Base.metadata.create_all(bind=engine)
+
+    def new_meeting(db):
+        meeting_id = str(uuid.uuid4())
+        db.add(Meeting(id=meeting_id, title="Bench"))
+        db.flush()
+        return meeting_id
+
+    def write_orm(db, segments):
+        meeting_id = new_meeting(db)
+        for row in segment_rows(meeting_id, segments):
+            db.add(MeetingSegment(**row))
+        db.commit()
+        return meeting_id
+
+    def write_store(timeline: bool):
+        def write(db, segments):
+            settings.SEGMENT_TIMELINE_ENABLED = timeline
+            meeting_id = new_meeting(db)
+            store_segments(db, meeting_id, segments)
+            db.commit()
+            return meeting_id
+        return write
+
+    writers = {"orm": write_orm, "bulk": write_store(False), "timeline": write_store(True)}
+
+    print(f"median of {args.runs} runs, SQLite\n")
+    print(f"{'minutes':>7} {'segments':>8} {'words':>6} {'orm ms':>8} {'bulk ms':>8} {'timeline ms':>11} "
+          f"{'rows read ms':>12} {'packed read ms':>14} {'packed KB':>9} {'JSON KB':>7}")
+    for minutes in args.minutes:
+        segments = with_words(make_segments(minutes))
+        words = sum(len(s["words"]) for s in segments)
+        writes = {}
+        stored = {}
+        for name, write in writers.items():
+            timings = []
+            for _ in range(args.runs):
+                db = SessionLocal()
+                start = time.perf_counter()
+                stored[name] = write(db, segments)
+                timings.append(time.perf_counter() - start)
+                db.close()
+            writes[name] = median_ms(timings)
+
+        rows_read, packed_read = [], []
+        for _ in range(args.runs):
+            db = SessionLocal()
+            start = time.perf_counter()
+            db.query(MeetingSegment).filter(
+                MeetingSegment.meeting_id == stored["bulk"]
+            ).order_by(MeetingSegment.seq).all()
+            rows_read.append(time.perf_counter() - start)
+            db.close()
+
+            db = SessionLocal()
+            start = time.perf_counter()
+            loaded = load_timeline(db, stored["timeline"])
+            packed_read.append(time.perf_counter() - start)
+            db.close()
+        assert sum(len(s["words"]) for s in loaded) == words
+
+        db = SessionLocal()
+        timeline = db.get(MeetingTimeline, stored["timeline"])
+        packed_kb = sum(len(getattr(timeline, c)) for c in (
+            "segment_starts", "segment_ends", "segment_word_counts", "word_starts",
+            "word_ends", "word_probabilities", "text")) / 1024
+        db.close()
+        json_kb = len(json.dumps(segments).encode()) / 1024
+
+        print(f"{minutes:>7} {len(segments):>8} {words:>6} {writes['orm']:>8.2f} {writes['bulk']:>8.2f} "
+              f"{writes['timeline']:>11.2f} {median_ms(rows_read):>12.2f} {median_ms(packed_read):>14.2f} "
+              f"{packed_kb:>9.1f} {json_kb:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
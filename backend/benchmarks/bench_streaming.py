@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark: live transcription buffer growth
+
+Feeds a recording through app.services.streaming.StreamingSession in 1s
+chunks, one pass per chunk, with a stub transcriber standing in for Whisper.
+The stub reports the recording's words that fall inside the buffer (none
+during silence), so passes agree the way a stable model's do. Because
+inference time is roughly proportional to window length, the cost of a
+session is measured as the seconds of audio transcribed over all passes.
+
+    speech    words every 0.4s for the whole recording
+    silence   no words at all
+    mixed     speech for the first quarter, then silence
+
+Each scenario runs with the no-word skip in process() (current) and with it
+disabled (how sessions behaved before), reporting the final buffer length,
+audio transcribed, and the largest window one pass had to transcribe.
+
+Usage (from backend/):
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --seconds 600
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+SAMPLE_RATE = 16000
+
+
+def recording_words(seconds: int, speech_until: float):
+    """(start, end, word) for a steady speaker, 0.4s per word"""
+    words, t = [], 0.0
+    while t + 0.3 < min(seconds, speech_until):
+        words.append((t, t + 0.3, f" w{len(words)}"))
+        t += 0.4
+    return words
+
+
+async def run(seconds: int, speech_until: float, skip: bool):
+    from app.services.streaming import HypothesisBuffer, StreamingSession
+
+    words = recording_words(seconds, speech_until)
+    stats = {"transcribed_s": 0.0, "max_window_s": 0.0}
+    session = None
+
+    def transcribe(audio, language, prompt):
+        window = len(audio) / SAMPLE_RATE
+        stats["transcribed_s"] += window
+        stats["max_window_s"] = max(stats["max_window_s"], window)
+        start, end = session.buffer_offset, session.buffer_offset + window
+        inside = [{"start": w[0] - start, "end": w[1] - start, "word": w[2]}
+                  for w in words if w[0] >= start and w[1] <= end]
+        return [{"words": inside}] if inside else [], "", {"language": "en"}
+
+    original_skip = HypothesisBuffer.skip_to
+    if not skip:
+        HypothesisBuffer.skip_to = lambda self, time: None
+    try:
+        session = StreamingSession(transcribe, sample_rate=SAMPLE_RATE)
+        for _ in range(seconds):
+            session.append(np.zeros(SAMPLE_RATE, dtype=np.float32))
+            await session.process()
+        await session.finish()
+    finally:
+        HypothesisBuffer.skip_to = original_skip
+    assert len(session.committed) == len(words), (len(session.committed), len(words))
+    return session, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=120, help="Recording length")
+    args = parser.parse_args()
+
+    scenarios = {"speech": args.seconds, "silence": 0, "mixed": args.seconds / 4}
+    print(f"{args.seconds}s recording, 1s chunks, buffer_trim_s=15, max_buffer_s=30\n")
+    print(f"{'scenario':<8} {'no-word skip':<12} {'final buffer s':>14} {'buffer offset s':>15} "
+          f"{'transcribed s':>13} {'largest window s':>16}")
+    for name, speech_until in scenarios.items():
+        for skip in (False, True):
+            session, stats = asyncio.run(run(args.seconds, speech_until, skip))
+            print(f"{name:<8} {'on' if skip else 'off':<12} {session.buffer_duration:>14.1f} "
+                  f"{session.buffer_offset:>15.1f} {stats['transcribed_s']:>13.0f} {stats['max_window_s']:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
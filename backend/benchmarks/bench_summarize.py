@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-call vs map-reduce summarization of long transcripts
+
+Generates a synthetic meeting transcript (segments at ~150 words per minute)
+and summarizes it through AIService against the stub OpenAI-compatible server
+in benchmarks/stub_openai_server.py. "single" forces one prompt with the whole
+transcript, as before map-reduce; "map-reduce" uses SUMMARY_WINDOW_TOKENS
+windows. "stream" is map-reduce with the final completion streamed
+(AIService.stream_summary, as served by the SSE endpoint). Reports wall time,
+time until the first summary text, LLM calls, peak concurrent calls and
+whether the provider rejected the prompt.
+
+Usage (from backend/):
+    python benchmarks/bench_summarize.py
+    python benchmarks/bench_summarize.py --minutes 30 60 120 --context-tokens 32768
+    python benchmarks/bench_summarize.py --window-tokens 3000 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stub_openai_server import start_stub  # noqa: E402
+
+VOCABULARY = (
+    "we need to ship the release by friday the api latency is still too high "
+    "let us review the budget marketing wants a demo next week who owns the "
+    "migration plan the customer reported a bug in the export flow action item "
+    "for sarah follow up with legal on the contract decision we will hire two "
+    "engineers the dashboard needs better charts"
+).split()
+
+
+def make_segments(minutes: int, seed: int = 0):
+    """~150 words per minute in 5-15 second segments"""
+    rng = random.Random(seed)
+    segments = []
+    t = 0.0
+    while t < minutes * 60:
+        length = rng.uniform(5, 15)
+        words = [rng.choice(VOCABULARY) for _ in range(int(length * 2.5))]
+        segments.append({"start": round(t, 2), "end": round(t + length, 2), "text": " ".join(words) + "."})
+        t += length
+    return segments
+
+
+async def run(mode: str, segments, base_url: str, window_tokens: int, concurrency: int):
+    from app.services.ai_service import AIService
+    from app.services.llm_backends import LLMBackend
+
+    service = AIService()
+    await service.close()
+    service.backends = {"stub": LLMBackend(
+        "stub", base_url, "stub", "stub-model", max_concurrency=concurrency, batch_size=10,
+        window_tokens=window_tokens if mode != "single" else 10 ** 9,
+        overhead_s=0.2, tokens_per_s=100, max_retries=0
+    )}
+    service.cache = None
+    transcript = " ".join(s["text"] for s in segments)
+
+    start = time.perf_counter()
+    first = None
+    if mode == "stream":
+        result = {"summary": "Could not generate AI summary"}
+        async for event in service.stream_summary(transcript, segments):
+            if first is None and event["type"] in ("summary", "done"):
+                first = time.perf_counter() - start
+            if event["type"] == "done":
+                result = event["result"]
+    else:
+        result = await service.summarize_transcript(transcript, segments)
+    elapsed = time.perf_counter() - start
+    await service.close()
+    return elapsed, first if first is not None else elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[15, 60, 120])
+    parser.add_argument("--context-tokens", type=int, default=8192, help="Stub provider context limit")
+    parser.add_argument("--window-tokens", type=int, default=6000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--decode", type=float, default=0.01, help="Stub seconds per output token")
+    args = parser.parse_args()
+
+    print(f"Stub: context {args.context_tokens} tokens, decode {args.decode}s/token; "
+          f"window {args.window_tokens} tokens, concurrency {args.concurrency}\n")
+    print(f"{'minutes':>7} {'~tokens':>8} {'mode':<11} {'wall s':>7} {'first s':>8} {'calls':>6} {'peak':>5} {'result':<10}")
+    for minutes in args.minutes:
+        segments = make_segments(minutes)
+        tokens = sum(len(s["text"]) for s in segments) // 4
+        for mode in ("single", "map-reduce", "stream"):
+            server, state, base_url = start_stub(context_tokens=args.context_tokens, decode_s_per_token=args.decode)
+            try:
+                elapsed, first, result = asyncio.run(run(mode, segments, base_url, args.window_tokens, args.concurrency))
+            finally:
+                server.shutdown()
+            stats = state.stats()
+            # Rejected prompts fall back to the extractive engine
+            outcome = "ok" if result.get("engine") == "stub" else "rejected"
+            print(f"{minutes:>7} {tokens:>8} {mode:<11} {elapsed:>7.2f} {first:>8.2f} {stats['requests']:>6} "
+                  f"{stats['peak_in_flight']:>5} {outcome:<10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Benchmark: storing transcription results in the request vs write-behind
+
+Stores N transcribed meetings (with segments and word timestamps) through
+the same `_store_meeting` the transcription endpoints call, C at a time, on
+a throwaway SQLite database where every statement is delayed by
+--statement-ms to stand in for a remote or busy database:
+
+    direct        meeting, segments and search entries committed in the request
+    write-behind  meeting journaled locally; the background flusher writes batches
+
+Reports per-request latency, time until every meeting is in the database,
+and database transactions used. Then checks durability: with the database
+failing, meetings are journaled, the service is stopped without draining,
+and a restarted flusher must write all of them.
+
+Usage (from backend/):
+    python benchmarks/bench_write_behind.py
+    python benchmarks/bench_write_behind.py --meetings 200 --concurrency 20 --statement-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def make_segments(count: int):
+    segments = []
+    for i in range(count):
+        words = [{"start": i * 5 + w * 0.4, "end": i * 5 + w * 0.4 + 0.3, "word": f" word{w}", "probability": 0.9}
+                 for w in range(12)]
+        segments.append({"start": i * 5.0, "end": i * 5.0 + 4.8,
+                         "text": " ".join(w["word"].strip() for w in words), "words": words})
+    return segments
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meetings", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--segments", type=int, default=120, help="Segments per meeting (12 words each)")
+    parser.add_argument("--statement-ms", type=float, default=10, help="Added latency per database statement")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_write_behind_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'meetings.db')}"
+    os.environ["WRITE_BEHIND_JOURNAL_PATH"] = os.path.join(workdir, "journal.db")
+    os.environ["WRITE_BEHIND_RETRY_BACKOFF_S"] = "0.05"
+    os.environ["TRANSCRIPTION_CACHE_ENABLED"] = "false"
+
+    from sqlalchemy import event, func, select
+    from app.api import transcription
+    from app.db.database import AsyncSessionLocal, Base, async_engine, engine
+    from app.db.models import Meeting
+    from app.db.search import search_index
+    from app.services import write_behind
+
+    Base.metadata.create_all(bind=engine)
+    meeting_write_behind = write_behind.init_write_behind()
+    search_index.setup()
+    transcript = "we reviewed the budget and the release plan " * 400
+    segments = make_segments(args.segments)
+    counters = {"commits": 0}
+
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def slow_statement(*_):
+        time.sleep(args.statement_ms / 1000)  # Runs on the driver's thread, like network latency
+
+    @event.listens_for(async_engine.sync_engine, "commit")
+    def count_commit(*_):
+        counters["commits"] += 1
+
+    async def stored_count():
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(select(func.count(Meeting.id)))).scalar()
+
+    async def store_all(ids):
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies = []
+
+        async def one(meeting_id):
+            async with semaphore:
+                start = time.perf_counter()
+                await transcription._store_meeting(meeting_id, "Bench", transcript, "summary", 600, 0.9,
+                                                   "webm", segments)
+                latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*(one(i) for i in ids))
+        return latencies
+
+    async def run(mode):
+        write_behind.meeting_write_behind = meeting_write_behind if mode == "write-behind" else None
+        before_rows, before_commits = await stored_count(), counters["commits"]
+        start = time.perf_counter()
+        latencies = await store_all([str(uuid.uuid4()) for _ in range(args.meetings)])
+        while await stored_count() - before_rows < args.meetings:
+            await asyncio.sleep(0.01)
+        durable = time.perf_counter() - start
+        return latencies, durable, counters["commits"] - before_commits
+
+    async def durability():
+        journal = meeting_write_behind.journal
+        write_behind.meeting_write_behind = meeting_write_behind
+        before = await stored_count()
+
+        async def database_down(records):
+            raise RuntimeError("database unavailable")
+
+        await meeting_write_behind.start(database_down)
+        ids = [str(uuid.uuid4()) for _ in range(args.meetings)]
+        await store_all(ids)
+        await asyncio.sleep(0.2)
+        await meeting_write_behind.stop()  # No drain: simulates a crash while the database is down
+        pending = (await journal.get_stats())["pending"]
+
+        start = time.perf_counter()
+        await meeting_write_behind.start(transcription.write_meetings)
+        while (await journal.get_stats())["pending"]:
+            await asyncio.sleep(0.01)
+        recovered = time.perf_counter() - start
+        await meeting_write_behind.stop()
+        lost = args.meetings - (await stored_count() - before)
+        return pending, recovered, lost
+
+    async def bench():
+        results = {"direct": await run("direct")}
+        await meeting_write_behind.start(transcription.write_meetings)
+        results["write-behind"] = await run("write-behind")
+        await meeting_write_behind.stop()
+        recovery = await durability()
+        await async_engine.dispose()
+        return results, recovery
+
+    results, (pending, recovered, lost) = asyncio.run(bench())
+    print(f"{args.meetings} meetings x {args.segments} segments, {args.concurrency} concurrent, "
+          f"SQLite +{args.statement_ms:g}ms per statement\n")
+    print(f"{'mode':<13} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'all stored s':>12} {'commits':>8}")
+    for mode, (latencies, durable, commits) in results.items():
+        print(f"{mode:<13} {statistics.median(latencies) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+              f"{max(latencies) * 1000:>8.1f} {durable:>12.2f} {commits:>8}")
+    print(f"\nDatabase down: {pending}/{args.meetings} meetings journaled at shutdown, "
+          f"written {recovered:.2f}s after restart, {lost} lost")
+
+
+if __name__ == "__main__":
+    main()
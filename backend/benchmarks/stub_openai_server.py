@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Stub OpenAI-compatible chat completions server
+
+Stands in for OpenRouter in benchmarks and local testing. Latency follows a
+simple model (fixed overhead + prompt prefill + per-output-token decode), a
+context limit rejects oversized prompts with 400 like real providers do, and
+replies are deterministic summary JSON built from the prompt (or one sentence
+per numbered excerpt for batched highlight descriptions). `stream: true`
+requests get server-sent-event chunks, the first after the overhead + prefill
+delay and the rest paced at the decode rate.
+
+Fault injection for client benchmarks: a fraction of requests can fail with a
+given status, a per-second rate limit answers 429 with Retry-After, and a
+fraction of requests to selected models can take a long tail delay.
+
+Usage (from backend/):
+    python benchmarks/stub_openai_server.py --port 8099 --context-tokens 8192
+    OPENROUTER_API_KEY=stub OPENROUTER_BASE_URL=http://127.0.0.1:8099/v1 uvicorn app.main:app
+
+GET /stats returns request counts and the peak number of concurrent requests.
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Set
+
+CHARS_PER_TOKEN = 4
+
+
+class StubState:
+    def __init__(self, context_tokens: int, overhead_s: float, prefill_s_per_token: float,
+                 decode_s_per_token: float, output_tokens: int, fail_rate: float = 0.0,
+                 fail_status: int = 503, rate_limit_per_s: int = 0, tail_rate: float = 0.0,
+                 tail_s: float = 0.0, tail_models: Optional[Set[str]] = None, seed: int = 0):
+        self.context_tokens = context_tokens
+        self.overhead_s = overhead_s
+        self.prefill_s_per_token = prefill_s_per_token
+        self.decode_s_per_token = decode_s_per_token
+        self.output_tokens = output_tokens
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.rate_limit_per_s = rate_limit_per_s
+        self.tail_rate = tail_rate
+        self.tail_s = tail_s
+        self.tail_models = tail_models
+        self.random = random.Random(seed)
+        self.window_start = 0.0
+        self.window_count = 0
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rejected = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self.prompt_tokens = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "rate_limited": self.rate_limited,
+                "prompt_tokens": self.prompt_tokens,
+                "peak_in_flight": self.peak_in_flight
+            }
+
+
+def reply_for(prompt: str) -> str:
+    """Summary-shaped JSON echoing a little of the prompt so combined results are traceable"""
+    excerpts = re.findall(r"^\[(\d+)\] (.*)$", prompt, re.M)
+    if excerpts:
+        # Batched highlight descriptions: one sentence per numbered excerpt
+        return json.dumps({number: "Excerpt about " + " ".join(text.split()[:6]) for number, text in excerpts})
+    match = re.search(r"(?:Transcript|Transcript part|Part summaries):\n(.*)\n\nResponse:", prompt, re.S)
+    body = match.group(1) if match else prompt
+    words = re.findall(r"[A-Za-z0-9']+", body)
+    parts = re.findall(r"Part (\d+):", prompt)
+    summary = f"Summary of {len(words)} words" + (f" from {len(parts)} parts" if parts else "")
+    return json.dumps({
+        "summary": summary + ": " + " ".join(words[:12]),
+        "key_points": [" ".join(words[i:i + 6]) for i in range(0, min(len(words), 18), 6)],
+        "action_items": [f"Follow up on {words[-1]}"] if words else []
+    })
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/stats"):
+                self._send_json(200, state.stats())
+            else:
+                self._send_json(404, {"error": {"message": "not found"}})
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "not found"}})
+                return
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            prompt = "\n".join(m["content"] for m in request.get("messages", []))
+            prompt_tokens = len(prompt) // CHARS_PER_TOKEN + 1
+            content = reply_for(prompt)
+            output_tokens = min(
+                request.get("max_tokens") or state.output_tokens, state.output_tokens,
+                -(-len(content) // CHARS_PER_TOKEN)
+            )
+
+            with state.lock:
+                state.requests += 1
+                now = time.monotonic()
+                if now - state.window_start >= 1.0:
+                    state.window_start, state.window_count = now, 0
+                state.window_count += 1
+                if state.rate_limit_per_s and state.window_count > state.rate_limit_per_s:
+                    state.rate_limited += 1
+                    fault = (429, 1.0 - (now - state.window_start))
+                elif state.random.random() < state.fail_rate:
+                    state.failed += 1
+                    fault = (state.fail_status, None)
+                else:
+                    fault = None
+                tail = (state.tail_s if state.random.random() < state.tail_rate and
+                        (state.tail_models is None or request.get("model") in state.tail_models) else 0.0)
+
+            if fault:
+                status, retry_after = fault
+                self._send_json(status, {"error": {"message": f"stub fault {status}"}},
+                                {"Retry-After": f"{retry_after:.2f}"} if retry_after else None)
+                return
+
+            with state.lock:
+                state.prompt_tokens += prompt_tokens
+                if state.context_tokens and prompt_tokens + output_tokens > state.context_tokens:
+                    state.rejected += 1
+                    rejected = True
+                else:
+                    rejected = False
+                    state.in_flight += 1
+                    state.peak_in_flight = max(state.peak_in_flight, state.in_flight)
+
+            if rejected:
+                self._send_json(400, {"error": {
+                    "message": f"This model's maximum context length is {state.context_tokens} tokens, "
+                               f"requested {prompt_tokens + output_tokens}",
+                    "code": "context_length_exceeded"
+                }})
+                return
+
+            try:
+                if request.get("stream"):
+                    self._stream(request, content, prompt_tokens, output_tokens)
+                    return
+                time.sleep(state.overhead_s + tail + prompt_tokens * state.prefill_s_per_token
+                           + output_tokens * state.decode_s_per_token)
+                self._send_json(200, {
+                    "id": f"stub-{state.requests}",
+                    "object": "chat.completion",
+                    "model": request.get("model"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content[:output_tokens * CHARS_PER_TOKEN]},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": output_tokens}
+                })
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def _stream(self, request, content: str, prompt_tokens: int, output_tokens: int):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            time.sleep(state.overhead_s + prompt_tokens * state.prefill_s_per_token)
+            pieces = [content[i:i + CHARS_PER_TOKEN] for i in range(0, len(content), CHARS_PER_TOKEN)]
+            pieces = pieces[:output_tokens]
+            for piece in pieces:
+                chunk = {
+                    "id": f"stub-{state.requests}",
+                    "object": "chat.completion.chunk",
+                    "model": request.get("model"),
+                    "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+                time.sleep(state.decode_s_per_token)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients that timed out and hung up are expected under fault injection
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def start_stub(port: int = 0, context_tokens: int = 8192, overhead_s: float = 0.2,
+               prefill_s_per_token: float = 0.0001, decode_s_per_token: float = 0.01,
+               output_tokens: int = 200, **faults):
+    """
+    Serve on a background thread; returns (server, state, base_url)
+
+    `faults` are StubState's fail_rate, fail_status, rate_limit_per_s,
+    tail_rate, tail_s, tail_models and seed.
+    """
+    state = StubState(context_tokens, overhead_s, prefill_s_per_token, decode_s_per_token, output_tokens, **faults)
+    server = StubServer(("127.0.0.1", port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--context-tokens", type=int, default=8192, help="0 = unlimited")
+    parser.add_argument("--overhead", type=float, default=0.2, help="Seconds per request")
+    parser.add_argument("--prefill", type=float, default=0.0001, help="Seconds per prompt token")
+    parser.add_argument("--decode", type=float, default=0.01, help="Seconds per output token")
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests per second before 429s, 0 = off")
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="Fraction of requests with a tail delay")
+    parser.add_argument("--tail", type=float, default=0.0, help="Tail delay in seconds")
+    args = parser.parse_args()
+
+    server, _, base_url = start_stub(
+        args.port, args.context_tokens, args.overhead, args.prefill, args.decode, args.output_tokens,
+        fail_rate=args.fail_rate, fail_status=args.fail_status, rate_limit_per_s=args.rate_limit,
+        tail_rate=args.tail_rate, tail_s=args.tail
+    )
+    print(f"Stub OpenAI-compatible server at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
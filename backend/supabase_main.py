@@ -4,7 +4,7 @@ MeetNote Backend with Supabase Integration
 Real Whisper transcription + Supabase database
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
@@ -16,9 +16,12 @@ import asyncio
 import tempfile
 import subprocess
 import base64
+import uuid
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+from app.db.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
 # Load environment variables
 load_dotenv()
 
@@ -262,24 +265,67 @@ async def get_audio_duration(audio_path: str) -> int:
     except:
         return 10  # Default fallback
 
+# Metadata columns for the meeting list; transcript and summary bodies stay out of it
+MEETING_LIST_COLUMNS = "id,title,duration,language,confidence,audio_format,created_at"
+
+def meeting_page(table: str, columns: str, cursor: Optional[str], limit: int):
+    """
+    One newest-first keyset page over (created_at, id) and the next cursor
+    
+    Continues strictly after the cursor's row, so deep pages use the
+    idx_meetings_created_at_id index range instead of an OFFSET scan.
+    """
+    query = supabase.table(table).select(columns)
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        try:
+            row_id = str(uuid.UUID(str(row_id)))
+        except ValueError:
+            raise InvalidCursorError("Invalid cursor: bad meeting id")
+        stamp = created_at.isoformat()
+        query = query.or_(f'created_at.lt."{stamp}",and(created_at.eq."{stamp}",id.lt.{row_id})')
+    
+    rows = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1).execute().data
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
 @app.get("/api/meetings")
-async def get_meetings():
-    """Get all meetings from Supabase"""
+async def get_meetings(limit: int = Query(100, ge=1, le=500), cursor: Optional[str] = None):
+    """
+    Get meetings from Supabase, newest first, one keyset page at a time
+    
+    Reads the meeting_list view (supabase_schema.sql), which adds 200-character
+    transcript and summary previews; full records come from
+    GET /api/meetings/{id}. Databases created before the view existed get
+    metadata columns only. Pass `next_cursor` back as `cursor` for the next page.
+    """
     
     if not supabase:
-        return {"meetings": [], "total": 0, "error": "Database not connected"}
+        return {"meetings": [], "total": 0, "next_cursor": None, "error": "Database not connected"}
     
     try:
-        result = supabase.table("meetings").select("*").order("created_at", desc=True).execute()
-        meetings = result.data
+        try:
+            meetings, next_cursor = meeting_page(
+                "meeting_list", f"{MEETING_LIST_COLUMNS},transcript_preview,summary_preview", cursor, limit
+            )
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ meeting_list view unavailable ({e}), listing without previews")
+            meetings, next_cursor = meeting_page("meetings", MEETING_LIST_COLUMNS, cursor, limit)
         
         return {
             "meetings": meetings,
-            "total": len(meetings)
+            "total": len(meetings),
+            "next_cursor": next_cursor
         }
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to fetch meetings: {e}")
-        return {"meetings": [], "total": 0, "error": str(e)}
+        return {"meetings": [], "total": 0, "next_cursor": None, "error": str(e)}
 
 @app.get("/api/meetings/{meeting_id}")
 async def get_meeting(meeting_id: str):
@@ -295,6 +341,8 @@ async def get_meeting(meeting_id: str):
             raise HTTPException(status_code=404, detail="Meeting not found")
         
         return result.data[0]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to fetch meeting {meeting_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
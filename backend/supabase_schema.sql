@@ -26,8 +26,17 @@ CREATE TABLE IF NOT EXISTS users (
 
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_meetings_created_at ON meetings(created_at DESC);
+-- Keyset pagination: newest first by (created_at, id)
+CREATE INDEX IF NOT EXISTS idx_meetings_created_at_id ON meetings(created_at DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_meetings_title ON meetings(title);
 
+-- Lightweight meeting list: metadata plus short previews instead of full text
+CREATE OR REPLACE VIEW meeting_list AS
+SELECT id, title, duration, language, confidence, audio_format, created_at,
+       LEFT(transcript, 200) AS transcript_preview,
+       LEFT(summary, 200) AS summary_preview
+FROM meetings;
+
 -- Enable Row Level Security (RLS)
 ALTER TABLE meetings ENABLE ROW LEVEL SECURITY;
 ALTER TABLE users ENABLE ROW LEVEL SECURITY;
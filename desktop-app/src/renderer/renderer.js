@@ -944,8 +944,8 @@ async function loadRecordedMeetings() {
             title: meeting.title,
             timestamp: new Date(meeting.created_at).getTime(),
             duration: meeting.duration || 0,
-            summary: meeting.summary || 'No summary available',
-            transcript: meeting.transcript || 'No transcript available',
+            summary: meeting.summary_preview || 'No summary available',
+            transcript: meeting.transcript_preview || 'No transcript available',
             organizer: 'You',
             participants: 1,
             confidence: meeting.confidence || 0
@@ -1009,20 +1009,18 @@ async function showMeetingDetail(meetingId) {
         // Switch to meeting detail view first
         switchView('meetingDetail');
         
-        // Fetch meeting details from backend
-        const response = await fetch(`${backendUrl}/api/meetings`);
-        if (!response.ok) {
-            throw new Error(`Backend error: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        const backendMeeting = data.meetings.find(m => m.id === meetingId);
-        
-        if (!backendMeeting) {
+        // Fetch the full meeting (the list only carries previews)
+        const response = await fetch(`${backendUrl}/api/meetings/${encodeURIComponent(meetingId)}`);
+        if (response.status === 404) {
             console.error('❌ Meeting not found:', meetingId);
             showToast('Meeting not found', 'error');
             return;
         }
+        if (!response.ok) {
+            throw new Error(`Backend error: ${response.status}`);
+        }
+        
+        const backendMeeting = await response.json();
         
         console.log('✅ Found meeting:', backendMeeting.title);
         